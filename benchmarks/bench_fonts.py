@@ -0,0 +1,95 @@
+"""Per-document cost of the bundled Unicode fonts in pdf_export.
+
+Compares adding the four faces to every document with FPDF.add_font (the
+TTFs are parsed again each time) against attaching them from the
+process-wide font registry, and reports the full render time and PDF size
+for the registry, per-document parsing and the Helvetica core font.
+
+    python benchmarks/bench_fonts.py [--repeat 10] [markdown file]
+"""
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from fpdf import FPDF
+
+from resume_rocket_fuel import font_registry
+from resume_rocket_fuel.cv_document import parse_markdown
+from resume_rocket_fuel.pdf_export import SimplePDF, render_pdf
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output" / "final_cv.md"
+
+
+def parse_per_document(pdf: FPDF, faces) -> None:
+    for style, face in faces.items():
+        pdf.add_font("cv", style, str(face.path))
+
+
+def attach_from_registry(pdf: FPDF, faces) -> None:
+    for style, face in faces.items():
+        face.attach(pdf, "cv", style)
+
+
+class PerDocumentFontsPDF(SimplePDF):
+    """SimplePDF as it would be if every document parsed its own fonts."""
+
+    def set_font(self, family=None, style='', size=0):
+        faces = getattr(self, '_faces', None)
+        if faces and family == 'cv' and 'cv' not in self.fonts:
+            self._faces = None
+            parse_per_document(self, faces)
+        FPDF.set_font(self, family, style, size)
+
+
+class HelveticaPDF(SimplePDF):
+    def __init__(self):
+        registry = font_registry._registry
+        font_registry._registry = font_registry.FontRegistry(font_dir=Path("/nonexistent"))
+        try:
+            super().__init__()
+        finally:
+            font_registry._registry = registry
+
+
+def median_ms(function, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("markdown", nargs="?", type=Path, default=SAMPLE)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    start = time.perf_counter()
+    faces = font_registry.get_font_registry().load()
+    if not faces:
+        print("No valid bundled font family; nothing to compare")
+        return
+    print(f"Font family: {font_registry.get_font_registry().family()[0]}, "
+          f"parsed once in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"Add four faces, parsing per document: {median_ms(lambda: parse_per_document(FPDF(), faces), args.repeat):8.1f} ms")
+    print(f"Add four faces from the registry:     {median_ms(lambda: attach_from_registry(FPDF(), faces), args.repeat):8.1f} ms")
+
+    document = parse_markdown(args.markdown.read_text(encoding="utf-8"))
+    print(f"\n{'full render':<34}{'median':>10}{'size':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, factory in (("registry (subset, Unicode)", SimplePDF),
+                              ("per-document font parsing", PerDocumentFontsPDF),
+                              ("Helvetica core font (ASCII)", HelveticaPDF)):
+            pdf_path = Path(tmp) / "cv.pdf"
+            elapsed = median_ms(lambda: render_pdf(document, factory()).output(str(pdf_path)), args.repeat)
+            print(f"{name:<34}{elapsed:>7.0f} ms{pdf_path.stat().st_size / 1024:>7.0f} KB")
+
+
+if __name__ == "__main__":
+    main()
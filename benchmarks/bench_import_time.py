@@ -0,0 +1,106 @@
+"""Cold-start import time of the entry points, measured with ``-X importtime``.
+
+Each module is imported in a fresh interpreter. The script reports the total
+import time, the slowest top-level packages, and fails if any heavy dependency
+(crewAI, pdfkit, markdown, PyPDF2, fpdf) is loaded at import time or if an
+entry point exceeds its time budget.
+
+    python benchmarks/bench_import_time.py [--repeat 3] [--top 8] [--budget-scale 1.0]
+"""
+import argparse
+import os
+import re
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+SRC_DIR = Path(__file__).resolve().parents[1] / "src"
+
+# Modules that must only load when a pipeline actually runs
+HEAVY_MODULES = ("crewai", "pdfkit", "markdown", "PyPDF2", "fpdf", "litellm", "chromadb")
+
+# Entry point -> import time budget in milliseconds (generous, to catch regressions
+# such as an eager crewAI import rather than noise)
+ENTRY_POINTS = {
+    "resume_rocket_fuel.pipeline": 250,
+    "resume_rocket_fuel.worker": 150,
+    "resume_rocket_fuel.main": 100,
+}
+# The UI necessarily loads streamlit, so only the heavy-module check applies
+UI_ENTRY_POINT = "resume_rocket_fuel.frontend_streamlit"
+
+_LINE = re.compile(r"import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)")
+
+
+def measure(module: str) -> Tuple[float, List[Tuple[str, int]]]:
+    """Import ``module`` in a fresh interpreter; return total ms and (module, self us) rows."""
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR) + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True, text=True, env=env,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    rows = []
+    total_us = 0
+    for line in result.stderr.splitlines():
+        match = _LINE.match(line)
+        if match:
+            self_us, cumulative, indent, name = match.groups()
+            rows.append((name, int(self_us)))
+            # Nesting is shown by two extra spaces per level; only count outermost imports
+            if len(indent) == 1:
+                total_us += int(cumulative)
+    return total_us / 1000, rows
+
+
+def heavy_imports(rows: List[Tuple[str, int]]) -> List[str]:
+    return sorted({name.split(".")[0] for name, _ in rows if name.split(".")[0] in HEAVY_MODULES})
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=8, help="Show the N slowest top-level imports")
+    parser.add_argument("--budget-scale", type=float, default=1.0,
+                        help="Multiply the time budgets, e.g. on slow CI machines")
+    args = parser.parse_args()
+
+    failures = []
+    for module in list(ENTRY_POINTS) + [UI_ENTRY_POINT]:
+        try:
+            samples = [measure(module) for _ in range(args.repeat)]
+        except RuntimeError as e:
+            print(f"{module}: skipped ({str(e).splitlines()[-1]})")
+            continue
+        total_ms = statistics.median(total for total, _ in samples)
+        rows = samples[-1][1]
+        print(f"\n{module}: {total_ms:.1f} ms")
+
+        # Self time summed per top-level package shows who the time is actually spent in
+        by_package: Dict[str, int] = defaultdict(int)
+        for name, self_us in rows:
+            by_package[name.split(".")[0]] += self_us
+        for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"  {package:<28}{self_us / 1000:>8.1f} ms")
+
+        heavy = heavy_imports(rows)
+        if heavy:
+            failures.append(f"{module} eagerly imports {', '.join(heavy)}")
+        budget = ENTRY_POINTS.get(module)
+        if budget is not None and total_ms > budget * args.budget_scale:
+            failures.append(f"{module} took {total_ms:.1f} ms, budget {budget * args.budget_scale:.0f} ms")
+
+    if failures:
+        print("\nCold start regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll entry points within budget.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Latency of local CV/JD ingestion against the upload_materials LLM output it replaces.
+
+Extracts and normalizes the sample PDFs, then times parsing them into the
+sectioned document written to materials.json and upload_materials.md.
+
+    python benchmarks/bench_ingestion.py [--cv cv.pdf] [--jd jd.pdf] [--repeat 50]
+"""
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from resume_rocket_fuel.ingestion import ingest_materials
+from resume_rocket_fuel.pdf_text import extract_pdf_text
+from resume_rocket_fuel.prompt_compaction import _count_tokens, normalize_text
+
+SAMPLES = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cv", type=Path, default=SAMPLES / "cv.pdf")
+    parser.add_argument("--jd", type=Path, default=SAMPLES / "jd.pdf")
+    parser.add_argument("--llm-output", type=Path, default=SAMPLES / "upload_materials.md",
+                        help="upload_materials.md produced by the LLM task, for comparison")
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    cv_text = normalize_text(extract_pdf_text(args.cv))
+    jd_text = normalize_text(extract_pdf_text(args.jd))
+
+    timings = []
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        materials = ingest_materials(cv_text, jd_text, "Example Corp")
+        markdown = materials.to_markdown()
+        timings.append(time.perf_counter() - start)
+
+    print(materials.summary())
+    print(f"Local ingestion: median {statistics.median(timings) * 1000:.1f} ms, "
+          f"max {max(timings) * 1000:.1f} ms over {args.repeat} runs, "
+          f"{len(markdown)} chars ({_count_tokens(markdown)} tokens) of Markdown")
+    if args.llm_output.exists():
+        llm_text = args.llm_output.read_text(encoding="utf-8")
+        print(f"LLM upload_materials output avoided: {len(llm_text)} chars ({_count_tokens(llm_text)} completion tokens) "
+              f"plus its prompt of {_count_tokens(cv_text) + _count_tokens(jd_text)} tokens")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""Benchmark SimplePDF line breaking on long, multi-page CVs.
+
+Compares the original loop (get_string_width for every word and for the
+space after it) with the cached-metrics greedy breaker and the
+minimum-raggedness (Knuth-Plass style) breaker, then times the whole
+Markdown-to-PDF conversion in both modes.
+
+    python benchmarks/bench_linebreak.py [--repeat 5] [--copies 1 10 40] [markdown file]
+"""
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from resume_rocket_fuel.linebreak import GREEDY, OPTIMAL, get_metrics_cache
+from resume_rocket_fuel.cv_document import parse_inline, inline_text
+from resume_rocket_fuel.pdf_export import SimplePDF, convert_markdown_to_pdf
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output" / "final_cv.md"
+
+
+def legacy_line_breaks(pdf: SimplePDF, text: str, width: float):
+    words = text.split()
+    lines = []
+    current_line = []
+    current_width = 0
+    for word in words:
+        word_width = pdf.get_string_width(word)
+        if current_width + word_width <= width:
+            current_line.append(word)
+            current_width += word_width + pdf.get_string_width(' ')
+        else:
+            if current_line:
+                lines.append(' '.join(current_line))
+            current_line = [word]
+            current_width = word_width + pdf.get_string_width(' ')
+    if current_line:
+        lines.append(' '.join(current_line))
+    return lines
+
+
+def raggedness(pdf: SimplePDF, lines, width: float) -> float:
+    """Sum of squared trailing space over all but the last line of each paragraph."""
+    return sum((width - pdf.get_string_width(line)) ** 2 for line in lines[:-1])
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("markdown", nargs="?", type=Path, default=SAMPLE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 10, 40])
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    text = args.markdown.read_text(encoding="utf-8")
+    pdf = SimplePDF()
+    paragraphs = [pdf.fit_text(inline_text(parse_inline(line.strip()))) for line in text.splitlines() if line.strip()]
+    width = pdf.effective_width - 5
+
+    print("Line breaking only (per paragraph, 9pt body font):")
+    print(f"{'copies':>7}{'words':>8}{'legacy':>12}{'cached':>12}{'optimal':>12}{'ragged greedy':>16}{'ragged optimal':>16}")
+    for copies in args.copies:
+        document = paragraphs * copies
+        words = sum(len(paragraph.split()) for paragraph in document)
+
+        def run(breaker):
+            return [breaker(paragraph) for paragraph in document]
+
+        def cached(mode):
+            pdf.line_breaking = mode
+            return lambda paragraph: pdf.calculate_line_breaks(paragraph, width)
+
+        legacy = time_call(lambda: run(lambda paragraph: legacy_line_breaks(pdf, paragraph, width)), args.repeat)
+        get_metrics_cache().clear()
+        greedy = time_call(lambda: run(cached(GREEDY)), args.repeat)
+        optimal = time_call(lambda: run(cached(OPTIMAL)), args.repeat)
+        assert run(cached(GREEDY)) == run(lambda paragraph: legacy_line_breaks(pdf, paragraph, width))
+        ragged_greedy = sum(raggedness(pdf, lines, width) for lines in run(cached(GREEDY)))
+        ragged_optimal = sum(raggedness(pdf, lines, width) for lines in run(cached(OPTIMAL)))
+        print(f"{copies:>7}{words:>8}{legacy * 1000:>9.1f} ms{greedy * 1000:>9.1f} ms{optimal * 1000:>9.1f} ms"
+              f"{ragged_greedy:>16.0f}{ragged_optimal:>16.0f}")
+
+    print("\nFull Markdown -> PDF conversion:")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            md_path = Path(tmp) / f"cv_{copies}.md"
+            md_path.write_text(text * copies, encoding="utf-8")
+            pdf_path = Path(tmp) / f"cv_{copies}.pdf"
+            row = f"{copies:>7} copies"
+            for mode in (GREEDY, OPTIMAL):
+                elapsed = time_call(lambda: convert_markdown_to_pdf(md_path, pdf_path, line_breaking=mode), args.repeat)
+                row += f"{mode:>10}{elapsed * 1000:>9.1f} ms"
+            print(row)
+
+
+if __name__ == "__main__":
+    main()
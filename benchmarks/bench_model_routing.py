@@ -0,0 +1,109 @@
+"""End-to-end pipeline latency with every task on its agent's model, then with model routing.
+
+Runs pipeline_run on the offline fake LLM, with each model timed as its tier's
+``fake_llm`` entry in config/models.yaml (sped up by --time-scale), once with
+every task pinned to its agent's model and once routed by the task's
+``model_tier``. Reports each task's model and duration, and the whole run, as
+traced by tracing.py.
+
+    python benchmarks/bench_model_routing.py [--repeat 1] [--time-scale 5]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import statistics
+import tempfile
+from collections import defaultdict
+from pathlib import Path
+
+# Before any crewAI import: fake LLMs, no telemetry, and no state shared with earlier runs
+os.environ.update({
+    "RRF_FAKE_LLM": "1",
+    "OTEL_SDK_DISABLED": "true",
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "RRF_COMPANY_PROFILE_TTL_HOURS": "0",
+    "RRF_LLM_CACHE": "0",
+    "RRF_MODEL_LATENCY_FILE": "off",
+    "RRF_MODEL_ROUTING": "on",
+})
+for name in ("RRF_FAKE_LLM_LATENCY_S", "RRF_FAKE_LLM_TOKENS_PER_S"):
+    # These would override the per-tier timings
+    os.environ.pop(name, None)
+
+SAMPLES = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output"
+
+
+def read_run(spans_path: Path, offset: int):
+    """Duration of the last traced run, and each task's duration and models, from spans written after ``offset``."""
+    with open(spans_path, encoding="utf-8") as f:
+        f.seek(offset)
+        spans = [json.loads(line) for line in f if line.strip()]
+    run = next(s for s in reversed(spans) if s["kind"] == "run")
+    spans = [s for s in spans if s["trace_id"] == run["trace_id"]]
+    by_id = {s["span_id"]: s for s in spans}
+    tasks = {s["name"]: {"duration_s": s["duration_s"], "models": set()} for s in spans if s["kind"] == "task"}
+    for s in spans:
+        parent = by_id.get(s["parent_id"])
+        if s["kind"] == "llm" and parent is not None and parent["name"] in tasks:
+            tasks[parent["name"]]["models"].add(s["attributes"]["model"].split("/", 1)[-1])
+    return run["duration_s"], tasks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--time-scale", type=float, default=5.0,
+                        help="Run the fake models this many times faster than models.yaml describes")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["RRF_TRACE_DIR"] = str(Path(tmp) / "trace")
+        os.environ["RRF_WORKSPACE_ROOT"] = str(Path(tmp) / "runs")
+        logging.disable(logging.CRITICAL)
+        from resume_rocket_fuel.pipeline import pipeline_run
+        from resume_rocket_fuel.routing import get_model_router
+        from resume_rocket_fuel.tracing import get_tracer
+        from resume_rocket_fuel.workspace import Workspace
+
+        router = get_model_router()
+        for tier in router.tiers:
+            tier.fake_llm = {"latency_s": tier.fake_llm.get("latency_s", 0) / args.time_scale,
+                             "tokens_per_s": tier.fake_llm.get("tokens_per_s", 0) * args.time_scale}
+        routed_config = router.tasks_config
+        spans_path = get_tracer().spans_path
+
+        results = {}
+        for label, tasks_config in (("pinned", {}), ("routed", routed_config)):
+            router.tasks_config = tasks_config
+            runs, tasks = [], defaultdict(lambda: {"durations": [], "models": set()})
+            for _ in range(args.repeat):
+                offset = spans_path.stat().st_size if spans_path.exists() else 0
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    if not pipeline_run(SAMPLES / "cv.pdf", SAMPLES / "jd.pdf", "Acme", "PDF",
+                                        workspace=Workspace(Path(tempfile.mkdtemp(dir=tmp)))):
+                        raise RuntimeError("pipeline_run failed")
+                duration, run_tasks = read_run(spans_path, offset)
+                runs.append(duration)
+                for name, task in run_tasks.items():
+                    tasks[name]["durations"].append(task["duration_s"])
+                    tasks[name]["models"] |= task["models"]
+            results[label] = (statistics.median(runs), tasks)
+
+    print(f"{'task':<34}{'pinned':>32}{'routed':>32}")
+    pinned, routed = results["pinned"][1], results["routed"][1]
+    for name in pinned:
+        cells = []
+        for tasks in (pinned, routed):
+            task = tasks.get(name)
+            cells.append(f"{statistics.median(task['durations']):6.1f} s {','.join(sorted(task['models'])):>22}"
+                         if task else f"{'-':>32}")
+        print(f"{name:<34}{cells[0]:>32}{cells[1]:>32}")
+    before, after = results["pinned"][0], results["routed"][0]
+    print(f"{'pipeline_run':<34}{before:>6.1f} s{'':>24}{after:>6.1f} s"
+          f"\n\nRouting cut the end-to-end latency by {(1 - after / before) * 100:.0f}%.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""Per-document PDF rendering latency and output size for each backend.
+
+Renders the sample CV (and optional N-fold copies of it) with every installed
+backend: wkhtmltopdf (on the warm process pool), weasyprint (in-process) and
+fpdf2 (in-process, from the parsed document). wkhtmltopdf is also measured
+with one process per document via pdfkit, with and without the legacy options
+and their 1000 ms JavaScript delay. --bulk N times a bulk export of N
+documents through render_pdfs against one pdfkit process per document.
+
+    python benchmarks/bench_pdf_backends.py [--repeat 5] [--copies 1 5] [--bulk 20] [markdown file]
+"""
+import argparse
+import logging
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from resume_rocket_fuel.cv_document import parse_markdown, write_html
+from resume_rocket_fuel.pdf_backends import BACKENDS, WKHTMLTOPDF, WKHTMLTOPDF_OPTIONS, is_available, render_pdfs
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output" / "final_cv.md"
+
+LEGACY_WKHTMLTOPDF_OPTIONS = dict(
+    WKHTMLTOPDF_OPTIONS, **{'debug-javascript': None, 'javascript-delay': '1000', 'no-stop-slow-scripts': None}
+)
+LEGACY_WKHTMLTOPDF_OPTIONS.pop('disable-javascript')
+
+
+def legacy_wkhtmltopdf(document, html_path: Path, pdf_path: Path) -> None:
+    import pdfkit
+
+    pdfkit.from_file(str(html_path), str(pdf_path), options=LEGACY_WKHTMLTOPDF_OPTIONS)
+
+
+def spawned_wkhtmltopdf(document, html_path: Path, pdf_path: Path) -> None:
+    import pdfkit
+
+    pdfkit.from_file(str(html_path), str(pdf_path), options=WKHTMLTOPDF_OPTIONS)
+
+
+def bulk_export(renderers, document, html_path: Path, out_dir: Path, count: int) -> None:
+    jobs = [(document, html_path, out_dir / f"bulk_{index}.pdf") for index in range(count)]
+    print(f"\nBulk export of {count} documents")
+    for name in renderers:
+        start = time.perf_counter()
+        if name == "wkhtmltopdf (spawn per document)":
+            for job in jobs:
+                spawned_wkhtmltopdf(*job)
+        elif name in BACKENDS:
+            failures = [error for _, error in render_pdfs(jobs, backend=name) if error]
+            if failures:
+                print(f"{name}: {len(failures)} failures, first: {failures[0]}")
+        else:
+            continue
+        elapsed = time.perf_counter() - start
+        print(f"{name:<34}{elapsed:>8.2f} s{elapsed / count * 1000:>9.0f} ms/doc")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("markdown", nargs="?", type=Path, default=SAMPLE)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--bulk", type=int, default=0, help="documents in the bulk export run")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    renderers = {}
+    for name, render in BACKENDS.items():
+        if is_available(name):
+            renderers[name] = render
+            if name == WKHTMLTOPDF:
+                renderers["wkhtmltopdf (spawn per document)"] = spawned_wkhtmltopdf
+                renderers["wkhtmltopdf (legacy options)"] = legacy_wkhtmltopdf
+        else:
+            print(f"{name}: not installed, skipped")
+
+    text = args.markdown.read_text(encoding="utf-8")
+    print(f"\n{'backend':<34}{'copies':>7}{'first':>11}{'median':>11}{'size':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for copies in args.copies:
+            document = parse_markdown(text * copies)
+            html_path = Path(tmp) / f"cv_{copies}.html"
+            write_html(document, html_path)
+            for name, render in renderers.items():
+                pdf_path = Path(tmp) / f"cv_{copies}_{name.split()[0]}_{len(name)}.pdf"
+                timings = []
+                for _ in range(args.repeat + 1):
+                    start = time.perf_counter()
+                    render(document, html_path, pdf_path)
+                    timings.append(time.perf_counter() - start)
+                size_kb = pdf_path.stat().st_size / 1024
+                print(f"{name:<34}{copies:>7}{timings[0] * 1000:>8.0f} ms{statistics.median(timings[1:]) * 1000:>8.0f} ms"
+                      f"{size_kb:>7.0f} KB")
+        if args.bulk:
+            document = parse_markdown(text)
+            html_path = Path(tmp) / "bulk.html"
+            write_html(document, html_path)
+            bulk_export(renderers, document, html_path, Path(tmp), args.bulk)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Micro-benchmark for PDF text extraction on the sample PDFs in output/.
+
+Compares the original page loop with repeated ``text +=`` against the
+streaming extractor, serially and fanned out to the process pool.
+
+    python benchmarks/bench_pdf_extract.py [--repeat 5] [pdf ...]
+"""
+import argparse
+import statistics
+import time
+from pathlib import Path
+
+import PyPDF2
+
+from resume_rocket_fuel.pdf_text import _get_pool, extract_pdf_text, iter_pdf_pages
+
+SAMPLE_DIR = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output"
+
+
+def legacy_extract(pdf_path: Path) -> str:
+    text = ""
+    with open(pdf_path, 'rb') as f:
+        pdf_reader = PyPDF2.PdfReader(f)
+        for page in pdf_reader.pages:
+            text += page.extract_text() or ""
+    return text
+
+
+def first_page(pdf_path: Path) -> str:
+    return next(iter_pdf_pages(pdf_path), "")
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("pdfs", nargs="*", type=Path)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pdfs = args.pdfs or [SAMPLE_DIR / "cv.pdf", SAMPLE_DIR / "jd.pdf", SAMPLE_DIR / "final_cv.pdf"]
+    # Start the pool outside the timed region; a long-lived process reuses it
+    _get_pool().submit(int).result()
+
+    variants = {
+        "legacy (+=)": legacy_extract,
+        "streaming": lambda path: extract_pdf_text(path, parallel=False),
+        "process pool": lambda path: extract_pdf_text(path, parallel=True),
+        "first page only": first_page,
+    }
+    print(f"{'document':<18}{'pages':>6}  " + "".join(f"{name:>18}" for name in variants))
+    for pdf in pdfs:
+        pages = len(PyPDF2.PdfReader(str(pdf)).pages)
+        row = f"{pdf.name:<18}{pages:>6}  "
+        for fn in variants.values():
+            row += f"{time_call(lambda: fn(pdf), args.repeat) * 1000:>15.1f} ms"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,160 @@
+"""Per-stage pipeline latency on the offline fake LLM, checked against stored baselines.
+
+Times PDF extraction, building the crew (ResumeRocketFuel() and its crew),
+a full crew.kickoff, the scheduled pipeline_run, Markdown to HTML, HTML to
+PDF with the configured backend, and the direct Markdown to PDF export. Every
+agent uses the fake LLM (see fake_llm.py), so nothing touches the network
+and the crew stages measure the framework's own overhead unless --latency or
+--tokens-per-second simulate a provider. Medians are compared with
+benchmarks/baselines/pipeline_stages.json; a stage regresses when it is more
+than --tolerance times its baseline and --min-delta-ms slower. Baselines only
+hold for the machine they were recorded on, so re-record them with
+--update-baseline after changing hardware.
+
+    python benchmarks/bench_pipeline_stages.py [--repeat 5] [--stage kickoff] [--update-baseline]
+"""
+import argparse
+import contextlib
+import json
+import logging
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, Dict
+
+# Before any crewAI import: fake LLMs, no telemetry, and no state shared with earlier runs
+os.environ.update({
+    "RRF_FAKE_LLM": "1",
+    "OTEL_SDK_DISABLED": "true",
+    "CREWAI_DISABLE_TELEMETRY": "true",
+    "RRF_COMPANY_PROFILE_TTL_HOURS": "0",
+    "RRF_LLM_CACHE": "0",
+    "RRF_MODEL_LATENCY_FILE": "off",
+})
+os.environ.pop("RRF_TRACE_DIR", None)
+
+SAMPLES = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output"
+BASELINE = Path(__file__).resolve().parent / "baselines" / "pipeline_stages.json"
+
+
+def build_stages(tmp: Path) -> Dict[str, Callable[[], object]]:
+    from resume_rocket_fuel.crew import ResumeRocketFuel
+    from resume_rocket_fuel.cv_document import load_document
+    from resume_rocket_fuel.pdf_export import convert_markdown_to_pdf
+    from resume_rocket_fuel.pipeline import convert_html_to_pdf, extract_text_from_pdf, generate_html_from_md, pipeline_run
+    from resume_rocket_fuel.scheduler import task_placeholders
+    from resume_rocket_fuel.workspace import Workspace
+
+    markdown = SAMPLES / "final_cv.md"
+    html = tmp / "final_cv.html"
+    generate_html_from_md(markdown, html)
+    document = load_document(markdown)
+
+    def kickoff():
+        rocket_fuel = ResumeRocketFuel()
+        # Outside the scheduler every placeholder, including upstream outputs, must be given up front
+        inputs = {name: "" for config in rocket_fuel.tasks_config.values() for name in task_placeholders(config)}
+        inputs.update(CANDIDATE_CV=extract_text_from_pdf(SAMPLES / "cv.pdf"),
+                      JOB_DESCRIPTION=extract_text_from_pdf(SAMPLES / "jd.pdf"),
+                      COMPANY_NAME="Acme", OUTPUT_DIR=str(tmp / "kickoff"))
+        return rocket_fuel.crew().kickoff(inputs=inputs)
+
+    def run_pipeline():
+        if not pipeline_run(SAMPLES / "cv.pdf", SAMPLES / "jd.pdf", "Acme", "PDF",
+                            workspace=Workspace(Path(tempfile.mkdtemp(dir=tmp)))):
+            raise RuntimeError("pipeline_run failed")
+
+    return {
+        "extract_text_from_pdf": lambda: extract_text_from_pdf(SAMPLES / "cv.pdf"),
+        "crew_construction": lambda: ResumeRocketFuel().crew(),
+        "kickoff": kickoff,
+        "pipeline_run": run_pipeline,
+        "generate_html_from_md": lambda: generate_html_from_md(markdown, tmp / "out.html"),
+        "convert_html_to_pdf": lambda: convert_html_to_pdf(html, tmp / "out.pdf", document=document),
+        "convert_markdown_to_pdf": lambda: convert_markdown_to_pdf(markdown, tmp / "direct.pdf"),
+    }
+
+
+def environment(args) -> dict:
+    """What the timings depend on besides the code; baselines only compare within one environment."""
+    from resume_rocket_fuel.pdf_backends import resolve_backend
+
+    return {
+        "machine": f"{platform.system()} {platform.machine()} {os.cpu_count()} CPUs",
+        "python": platform.python_version(),
+        "pdf_backend": resolve_backend(),
+        "llm_latency_s": args.latency,
+        "llm_tokens_per_s": args.tokens_per_second,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--stage", action="append", help="Only run these stages (repeatable)")
+    parser.add_argument("--latency", type=float, default=0.0, help="Fake LLM latency to the first token, seconds")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="Fake LLM token rate (0 = instant)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE)
+    parser.add_argument("--tolerance", type=float, default=1.5, help="Allowed ratio to the baseline median")
+    parser.add_argument("--min-delta-ms", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    parser.add_argument("--update-baseline", action="store_true", help="Record this run as the new baseline")
+    args = parser.parse_args()
+    os.environ["RRF_FAKE_LLM_LATENCY_S"] = str(args.latency)
+    os.environ["RRF_FAKE_LLM_TOKENS_PER_S"] = str(args.tokens_per_second)
+    logging.disable(logging.CRITICAL)
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["RRF_WORKSPACE_ROOT"] = str(Path(tmp) / "runs")
+        stages = build_stages(Path(tmp))
+        unknown = set(args.stage or ()) - set(stages)
+        if unknown:
+            parser.error(f"Unknown stages: {', '.join(sorted(unknown))}; choose from {', '.join(stages)}")
+        print(f"{'stage':<26}{'first':>11}{'median':>11}{'baseline':>11}")
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8")) if args.baseline.exists() else {}
+        env = environment(args)
+        comparable = baseline.get("environment") == env
+        failures = []
+        for name, stage in stages.items():
+            if args.stage and name not in args.stage:
+                continue
+            timings = []
+            for _ in range(args.repeat + 1):
+                # The crew's agents are verbose; keep their console output out of the table
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                    start = time.perf_counter()
+                    stage()
+                timings.append((time.perf_counter() - start) * 1000)
+            median = statistics.median(timings[1:])
+            results[name] = {"first_ms": round(timings[0], 2), "median_ms": round(median, 2)}
+            expected = baseline.get("stages", {}).get(name, {}).get("median_ms")
+            shown = f"{expected:>8.1f} ms" if expected is not None else f"{'-':>11}"
+            print(f"{name:<26}{timings[0]:>8.1f} ms{median:>8.1f} ms{shown}")
+            if comparable and expected is not None and median > expected * args.tolerance \
+                    and median - expected > args.min_delta_ms:
+                failures.append(f"{name}: {median:.1f} ms against a baseline of {expected:.1f} ms")
+
+    if args.update_baseline:
+        recorded = baseline.get("stages", {}) if comparable else {}
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps({"environment": env, "stages": {**recorded, **results}}, indent=2) + "\n",
+                                 encoding="utf-8")
+        print(f"\nBaseline written to {args.baseline}")
+        return
+    if not comparable:
+        print(f"\nNo baseline for this environment ({args.baseline}); run with --update-baseline to record one.")
+        return
+    if failures:
+        print("\nStage regressions:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nAll stages within baseline.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""LLM calls against a rate-limited stub provider, with and without the rate limiter.
+
+Starts benchmarks/stub_llm_server.py and fires a burst of batch-lane calls,
+followed shortly by interactive-lane calls, through CachingLLM. Without the
+limiter (RRF_RATE_LIMITS=off) only the provider SDK's own retries stand
+between the burst and the 429s. With it, calls are admitted within the
+stub's quota, 429s back off together, and interactive calls overtake the
+queued batch calls. Reports failures, 429s and per-lane latency.
+
+    python benchmarks/bench_rate_limits.py [--batch-calls 32] [--interactive-calls 8] [--rpm 30] [--concurrency 4]
+"""
+import argparse
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+os.environ.setdefault("OTEL_SDK_DISABLED", "true")
+
+from stub_llm_server import StubServer  # noqa: E402
+
+PROMPT = [{"role": "user", "content": "Summarise the candidate's experience. " * 50}]
+
+
+def run(args, limited: bool) -> None:
+    from resume_rocket_fuel import rate_limit
+    from resume_rocket_fuel.llm import CachingLLM
+    from resume_rocket_fuel.rate_limit import BATCH, INTERACTIVE, priority_lane
+
+    os.environ["RRF_RATE_LIMITS"] = "on" if limited else "off"
+    os.environ["RRF_RATE_LIMIT_OPENAI"] = f"rpm={args.rpm},tpm={args.tpm},concurrency={args.concurrency}"
+    rate_limit._default_limiter = None
+    server = StubServer(rpm=args.rpm, tpm=args.tpm, concurrency=args.concurrency, latency=args.latency).start()
+    llm = CachingLLM(model="openai/stub", base_url=server.url, api_key="sk-stub")
+    latencies = {INTERACTIVE: [], BATCH: []}
+    failures = {INTERACTIVE: 0, BATCH: 0}
+    lock = threading.Lock()
+
+    def call(lane: str) -> None:
+        start = time.perf_counter()
+        try:
+            with priority_lane(lane):
+                llm.call(PROMPT)
+            with lock:
+                latencies[lane].append(time.perf_counter() - start)
+        except Exception:
+            with lock:
+                failures[lane] += 1
+
+    threads = [threading.Thread(target=call, args=(BATCH,)) for _ in range(args.batch_calls)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    # The interactive calls arrive while the batch burst is queued
+    time.sleep(0.5)
+    interactive = [threading.Thread(target=call, args=(INTERACTIVE,)) for _ in range(args.interactive_calls)]
+    for thread in interactive:
+        thread.start()
+    for thread in threads + interactive:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.stop()
+
+    print(f"\n{'rate limiter' if limited else 'no rate limiter (SDK retries only)'}: {elapsed:.1f} s, "
+          f"{server.quota.rejected} responses were 429s")
+    for lane in (INTERACTIVE, BATCH):
+        samples = sorted(latencies[lane])
+        if samples:
+            p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))]
+            print(f"  {lane:<12} {len(samples):>3} ok {failures[lane]:>3} failed   "
+                  f"p50 {statistics.median(samples):6.2f} s   p95 {p95:6.2f} s")
+        else:
+            print(f"  {lane:<12}   0 ok {failures[lane]:>3} failed")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-calls", type=int, default=32)
+    parser.add_argument("--interactive-calls", type=int, default=8)
+    parser.add_argument("--rpm", type=int, default=30, help="Stub quota: requests per minute")
+    parser.add_argument("--tpm", type=int, default=200_000, help="Stub quota: tokens per minute")
+    parser.add_argument("--concurrency", type=int, default=4, help="Stub quota: requests in flight")
+    parser.add_argument("--latency", type=float, default=0.3, help="Stub response time, seconds")
+    parser.add_argument("--skip-unlimited", action="store_true", help="Only run with the rate limiter")
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    if not args.skip_unlimited:
+        run(args, limited=False)
+    run(args, limited=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Micro-benchmark for pdf_export.sanitize_text on final_cv.md-sized documents.
+
+Compares the original chain of ``str.replace`` passes (applied twice per line,
+as the converter used to) with the single-pass translation table (applied once
+per line), on the sample CV, a typographically "smart" copy of it, and both
+repeated 10x.
+
+    python benchmarks/bench_sanitize.py [--repeat 20] [markdown file]
+"""
+import argparse
+import logging
+import statistics
+import time
+from pathlib import Path
+
+from resume_rocket_fuel.pdf_export import ASCII_REPLACEMENTS, sanitize_text
+
+SAMPLE = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output" / "final_cv.md"
+
+
+def legacy_sanitize(text: str) -> str:
+    for old, new in ASCII_REPLACEMENTS.items():
+        text = text.replace(old, new)
+    return text
+
+
+def smarten(text: str) -> str:
+    """Typical LLM output: curly quotes, dashes and bullets instead of ASCII."""
+    return (text.replace(" - ", " — ").replace("'", "’").replace("- ", "• ")
+            .replace("...", "…") + "\nJosé Müller © 2024 ≤ 10°\n")
+
+
+def legacy_per_line(lines):
+    # convert_markdown_to_pdf sanitized each line, then safe_write/write_text did it again
+    return [legacy_sanitize(legacy_sanitize(line)) for line in lines]
+
+
+def single_pass_per_line(lines):
+    return [sanitize_text(line) for line in lines]
+
+
+def time_call(fn, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("markdown", nargs="?", type=Path, default=SAMPLE)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    text = args.markdown.read_text(encoding="utf-8")
+    documents = {
+        "sample": text,
+        "sample smart": smarten(text),
+        "10x": text * 10,
+        "10x smart": smarten(text) * 10,
+    }
+    print(f"{'document':<14}{'chars':>9}{'legacy':>14}{'single pass':>14}{'speedup':>9}")
+    for name, document in documents.items():
+        lines = document.splitlines()
+        # Both agree wherever the old replacements were enough to reach ASCII
+        for line in lines:
+            expected = legacy_sanitize(line)
+            assert not expected.isascii() or sanitize_text(line) == expected, line
+        legacy = time_call(lambda: legacy_per_line(lines), args.repeat)
+        single = time_call(lambda: single_pass_per_line(lines), args.repeat)
+        print(f"{name:<14}{len(document):>9}{legacy * 1000:>11.2f} ms{single * 1000:>11.2f} ms{legacy / single:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
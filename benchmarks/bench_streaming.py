@@ -0,0 +1,60 @@
+"""Time to first content with streamed CV previews, against waiting for the whole answer.
+
+Replays the sample final CV as an LLM token stream at a given rate through
+OutputStream and SectionPreview, and reports when each section became
+visible, plus the rendering overhead the preview adds per chunk.
+
+    python benchmarks/bench_streaming.py [--cv final_cv.md] [--tokens-per-second 40]
+"""
+import argparse
+import logging
+import tempfile
+import time
+from pathlib import Path
+
+from resume_rocket_fuel.streaming import OutputStream, SectionPreview
+
+SAMPLES = Path(__file__).resolve().parents[1] / "src" / "resume_rocket_fuel" / "output"
+# Typical characters per streamed token
+CHUNK_CHARS = 4
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--cv", type=Path, default=SAMPLES / "final_cv.md")
+    parser.add_argument("--tokens-per-second", type=float, default=40.0)
+    args = parser.parse_args()
+    logging.disable(logging.CRITICAL)
+
+    answer = "Thought: I now can give a great answer\nFinal Answer: " + args.cv.read_text(encoding="utf-8")
+    chunks = [answer[i:i + CHUNK_CHARS] for i in range(0, len(answer), CHUNK_CHARS)]
+    ready = []
+
+    with tempfile.TemporaryDirectory() as directory:
+        preview = SectionPreview(Path(directory) / "preview.html")
+        position = {"chunk": 0}
+
+        def listener(text, done):
+            message = preview("qa_review_final_cv", text, done)
+            if message:
+                ready.append((position["chunk"] / args.tokens_per_second, message))
+
+        stream = OutputStream(listener)
+        start = time.perf_counter()
+        for index, chunk in enumerate(chunks, 1):
+            position["chunk"] = index
+            stream.feed(chunk)
+        stream.finish()
+        overhead = time.perf_counter() - start
+
+    total = len(chunks) / args.tokens_per_second
+    print(f"{len(chunks)} chunks at {args.tokens_per_second:.0f} tokens/s: full answer after {total:.1f}s")
+    for seconds, message in ready:
+        print(f"  {seconds:6.1f}s  {message}")
+    if ready:
+        print(f"First section visible after {ready[0][0]:.1f}s ({100 * ready[0][0] / total:.0f}% of the wait)")
+    print(f"Preview overhead: {overhead * 1000:.1f} ms in total, {overhead * 1e6 / len(chunks):.0f} µs per chunk")
+
+
+if __name__ == "__main__":
+    main()
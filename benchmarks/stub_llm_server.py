@@ -0,0 +1,158 @@
+"""Local OpenAI-compatible chat completions server with a provider-style quota.
+
+Answers POST /v1/chat/completions (streamed or not) after a fixed latency and
+rejects requests beyond its requests/minute, tokens/minute or concurrency
+quota with a 429 and a Retry-After header, like a real provider. Point an
+LLM at it with ``model="openai/stub"`` and ``base_url=<url>``.
+
+    python benchmarks/stub_llm_server.py [--port 8765] [--rpm 60] [--tpm 40000] [--concurrency 4] [--latency 0.2]
+"""
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+ANSWER = "Thought: I now can give a great answer\nFinal Answer: " + "This is a stubbed answer. " * 40
+CHARS_PER_TOKEN = 4
+
+
+class Quota:
+    """Request and token buckets refilled continuously up to a minute's worth, plus in-flight requests."""
+
+    def __init__(self, rpm: int, tpm: int, concurrency: int):
+        self.rpm, self.tpm, self.concurrency = rpm, tpm, concurrency
+        self.requests, self.tokens = float(rpm), float(tpm)
+        self.updated = time.monotonic()
+        self.active = 0
+        self.accepted = 0
+        self.rejected = 0
+        self.lock = threading.Lock()
+
+    def admit(self, tokens: int) -> Optional[float]:
+        """Count the request and return None, or the Retry-After seconds if it is over quota."""
+        with self.lock:
+            now = time.monotonic()
+            elapsed, self.updated = now - self.updated, now
+            self.requests = min(self.rpm, self.requests + elapsed * self.rpm / 60)
+            self.tokens = min(self.tpm, self.tokens + elapsed * self.tpm / 60)
+            waits = []
+            if self.concurrency and self.active >= self.concurrency:
+                waits.append(1.0)
+            if self.rpm and self.requests < 1:
+                waits.append((1 - self.requests) * 60 / self.rpm)
+            if self.tpm and self.tokens < min(tokens, self.tpm):
+                waits.append((min(tokens, self.tpm) - self.tokens) * 60 / self.tpm)
+            if waits:
+                self.rejected += 1
+                return max(waits)
+            self.requests -= 1
+            self.tokens -= tokens
+            self.active += 1
+            self.accepted += 1
+            return None
+
+    def done(self) -> None:
+        with self.lock:
+            self.active -= 1
+
+
+class StubServer:
+    """The stub server, run on a background thread."""
+
+    def __init__(self, port: int = 0, rpm: int = 60, tpm: int = 40_000, concurrency: int = 4, latency: float = 0.2):
+        self.quota = Quota(rpm, tpm, concurrency)
+        self.latency = latency
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}/v1"
+
+    def start(self) -> "StubServer":
+        self.thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _json(self, status: int, body: dict, headers: Optional[dict] = None) -> None:
+                data = json.dumps(body).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for key, value in (headers or {}).items():
+                    self.send_header(key, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self):
+                request = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                prompt = sum(len(str(message.get("content", ""))) for message in request.get("messages", []))
+                tokens = (prompt + len(ANSWER)) // CHARS_PER_TOKEN
+                retry_after = server.quota.admit(tokens)
+                if retry_after is not None:
+                    self._json(429, {"error": {"message": "Rate limit reached", "type": "rate_limit_error",
+                                               "code": "rate_limit_exceeded"}},
+                               {"Retry-After": f"{retry_after:.2f}"})
+                    return
+                try:
+                    time.sleep(server.latency)
+                    if request.get("stream"):
+                        self._stream(request)
+                    else:
+                        self._json(200, {
+                            "id": "chatcmpl-stub", "object": "chat.completion", "created": int(time.time()),
+                            "model": request.get("model", "stub"),
+                            "choices": [{"index": 0, "finish_reason": "stop",
+                                         "message": {"role": "assistant", "content": ANSWER}}],
+                            "usage": {"prompt_tokens": prompt // CHARS_PER_TOKEN,
+                                      "completion_tokens": len(ANSWER) // CHARS_PER_TOKEN,
+                                      "total_tokens": tokens},
+                        })
+                finally:
+                    server.quota.done()
+
+            def _stream(self, request: dict) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.end_headers()
+                for start in range(0, len(ANSWER), 16):
+                    chunk = {"id": "chatcmpl-stub", "object": "chat.completion.chunk", "created": int(time.time()),
+                             "model": request.get("model", "stub"),
+                             "choices": [{"index": 0, "delta": {"content": ANSWER[start:start + 16]},
+                                          "finish_reason": None}]}
+                    self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+                self.wfile.write(b"data: [DONE]\n\n")
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--rpm", type=int, default=60)
+    parser.add_argument("--tpm", type=int, default=40_000)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+    server = StubServer(args.port, args.rpm, args.tpm, args.concurrency, args.latency).start()
+    print(f"Stub LLM server on {server.url}")
+    try:
+        server.thread.join()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
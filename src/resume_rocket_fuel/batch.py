@@ -0,0 +1,180 @@
+import csv
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import List, Optional, Set
+
+from resume_rocket_fuel.rate_limit import BATCH, priority_lane, share_rate_limits
+from resume_rocket_fuel.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.jsonl"
+
+
+@dataclass
+class BatchJob:
+    job_id: str
+    cv_pdf: str
+    jd_pdf: str
+    company: str
+    format: str = "PDF"
+
+
+def _job_id(index: int, cv_pdf: str, jd_pdf: str, company: str, output_format: str) -> str:
+    digest = hashlib.sha1(f"{cv_pdf}|{jd_pdf}|{company}|{output_format}".encode("utf-8")).hexdigest()[:10]
+    return f"{index:04d}-{digest}"
+
+
+def read_manifest_rows(manifest_path: Path) -> List[dict]:
+    """Rows of a JSONL (one object per line) or CSV (with a header row) manifest."""
+    manifest_path = Path(manifest_path)
+    if manifest_path.suffix.lower() == ".csv":
+        with open(manifest_path, "r", encoding="utf-8", newline="") as f:
+            return list(csv.DictReader(f))
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def load_manifest(manifest_path: Path) -> List[BatchJob]:
+    """Read (cv_pdf, jd_pdf, company, format) jobs from a JSONL or CSV manifest.
+
+    Relative PDF paths are resolved against the manifest's directory. Jobs
+    without an explicit ``id`` get one derived from their position and inputs,
+    so re-reading an unchanged manifest yields the same job IDs.
+    """
+    manifest_path = Path(manifest_path)
+    rows = read_manifest_rows(manifest_path)
+
+    jobs = []
+    seen = set()
+    for index, row in enumerate(rows):
+        missing = [field for field in ("cv_pdf", "jd_pdf", "company") if not row.get(field)]
+        if missing:
+            raise ValueError(f"Manifest row {index + 1} is missing {', '.join(missing)}")
+        cv_pdf = str((manifest_path.parent / row["cv_pdf"]).resolve())
+        jd_pdf = str((manifest_path.parent / row["jd_pdf"]).resolve())
+        output_format = (row.get("format") or "PDF").upper()
+        job_id = row.get("id") or _job_id(index, cv_pdf, jd_pdf, row["company"], output_format)
+        if job_id in seen:
+            raise ValueError(f"Duplicate job id in manifest: {job_id}")
+        seen.add(job_id)
+        jobs.append(BatchJob(job_id, cv_pdf, jd_pdf, row["company"], output_format))
+    return jobs
+
+
+def completed_job_ids(results_path: Path) -> Set[str]:
+    """IDs of jobs that already succeeded according to a results file."""
+    done = set()
+    if results_path.exists():
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written line from an interrupted run
+                    continue
+                if record.get("status") == "succeeded":
+                    done.add(record["job_id"])
+    return done
+
+
+def run_job(job: BatchJob, job_dir: str, resume: bool = False) -> dict:
+    """Run one job in its own workspace at ``job_dir`` and collect its outputs.
+
+    With ``resume``, tasks checkpointed by an earlier attempt are not run again.
+    """
+    from resume_rocket_fuel.pipeline import pipeline_run
+
+    record = {**asdict(job), "job_dir": job_dir, "pid": os.getpid(), "started": time.time()}
+    workspace = Workspace(Path(job_dir)).create()
+    start = time.perf_counter()
+    try:
+        with priority_lane(BATCH):
+            success = pipeline_run(Path(job.cv_pdf), Path(job.jd_pdf), job.company, job.format,
+                                   workspace=workspace, resume=resume)
+        record["status"] = "succeeded" if success else "failed"
+    except Exception as e:
+        logger.error(f"Job {job.job_id} failed: {str(e)}")
+        record["status"] = "failed"
+        record["error"] = f"{type(e).__name__}: {str(e)}"
+        record["traceback"] = traceback.format_exc()
+    record["duration_s"] = round(time.perf_counter() - start, 3)
+    record["outputs"] = [
+        str(path) for path in (workspace.final_md, workspace.final_html, workspace.final_pdf) if path.exists()
+    ]
+    return record
+
+
+def run_batch(manifest_path: Path, out_dir: Path, workers: int = 2, executor: str = "process",
+              resume: bool = True, limit: Optional[int] = None) -> List[dict]:
+    """Run every job of a manifest through pipeline_run on a worker pool.
+
+    One JSON line per finished job is appended to ``out_dir/results.jsonl``.
+    With ``resume`` set, jobs that already succeeded there are skipped, so an
+    interrupted batch can be restarted with the same command, and failed jobs
+    continue from their task checkpoints.
+    """
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out_dir / RESULTS_FILE
+
+    jobs = load_manifest(manifest_path)
+    if resume:
+        done = completed_job_ids(results_path)
+        if done:
+            logger.info(f"Resuming batch: skipping {len(done)} completed jobs")
+        jobs = [job for job in jobs if job.job_id not in done]
+    else:
+        results_path.unlink(missing_ok=True)
+    if limit is not None:
+        jobs = jobs[:limit]
+    if not jobs:
+        logger.info("Nothing to do: all jobs in the manifest have completed")
+        return []
+
+    pool_class = ProcessPoolExecutor if executor == "process" else ThreadPoolExecutor
+    # Worker processes each get an equal share of the provider quotas (see rate_limit.py)
+    pool_options = {"initializer": share_rate_limits, "initargs": (workers,)} if executor == "process" else {}
+
+    logger.info(f"Running {len(jobs)} jobs with {workers} {executor} workers")
+    results = []
+    write_lock = threading.Lock()
+    batch_start = time.perf_counter()
+    with pool_class(max_workers=workers, **pool_options) as pool:
+        futures = {}
+        for job in jobs:
+            job_dir = out_dir / "jobs" / job.job_id
+            # Don't let a half-finished previous attempt leak stale outputs, but keep its checkpoints
+            if resume:
+                Workspace(job_dir).clear(keep=(Workspace(job_dir).checkpoints.name,))
+            else:
+                shutil.rmtree(job_dir, ignore_errors=True)
+            futures[pool.submit(run_job, job, str(job_dir), resume)] = job
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                record = future.result()
+            except Exception as e:
+                record = {**asdict(job), "status": "failed", "error": f"{type(e).__name__}: {str(e)}"}
+            with write_lock, open(results_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            results.append(record)
+            logger.info(
+                f"[{len(results)}/{len(jobs)}] {job.job_id} {record['status']} "
+                f"in {record.get('duration_s', 0):.1f}s"
+            )
+
+    succeeded = sum(1 for record in results if record["status"] == "succeeded")
+    logger.info(
+        f"Batch finished: {succeeded}/{len(results)} succeeded in {time.perf_counter() - batch_start:.1f}s"
+    )
+    return results
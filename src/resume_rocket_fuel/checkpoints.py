@@ -0,0 +1,102 @@
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional, Set
+
+from resume_rocket_fuel.workspace import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+# Bump when the fingerprint recipe changes so old checkpoints are not reused
+FINGERPRINT_VERSION = 1
+
+_UNSAFE = re.compile(r"[^\w.-]")
+
+
+@dataclass
+class RestoredOutput:
+    """Stands in for a crewAI TaskOutput restored from a checkpoint."""
+    raw: str
+
+
+def task_fingerprint(name: str, task_config: dict, task_inputs: Dict[str, Any], variables: Iterable[str],
+                     model: Optional[str] = None) -> str:
+    """Hash of everything that determines a task's prompt: its config, agent, model and input values."""
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "task": name,
+        "description": task_config.get("description", ""),
+        "expected_output": task_config.get("expected_output", ""),
+        # CrewBase replaces the agent's name in the loaded config with the Agent itself
+        "agent": agent if isinstance(agent := task_config.get("agent"), (str, type(None))) else agent.role,
+        "model": model,
+        "inputs": {variable: str(task_inputs.get(variable, "")) for variable in sorted(variables)},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class CheckpointStore:
+    """Per-run store of task outputs, each saved with the fingerprint of the inputs that produced it.
+
+    A checkpoint is only restored while its fingerprint still matches, so a
+    task reruns when anything it depends on changed, including the output of
+    an upstream task that had to run again. With ``restore`` off, outputs are
+    recorded but never read back (a fresh run that can be resumed later).
+    """
+
+    def __init__(self, directory: Path, restore: bool = True):
+        self.directory = Path(directory)
+        self.restore = restore
+
+    def _path(self, task_name: str) -> Path:
+        return self.directory / f"{_UNSAFE.sub('_', task_name)}.json"
+
+    def get(self, task_name: str, fingerprint: str) -> Optional[str]:
+        if not self.restore:
+            return None
+        path = self._path(task_name)
+        try:
+            record = json.loads(path.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable checkpoint {path}: {str(e)}")
+            return None
+        if record.get("fingerprint") != fingerprint:
+            logger.info(f"Checkpoint of {task_name} is out of date, the task will run again")
+            return None
+        return record.get("output")
+
+    def put(self, task_name: str, fingerprint: str, output: str, duration_s: Optional[float] = None) -> None:
+        record = {
+            "task": task_name,
+            "fingerprint": fingerprint,
+            "created": time.time(),
+            "duration_s": duration_s,
+            "output": output,
+        }
+        try:
+            write_text_atomic(self._path(task_name), json.dumps(record, ensure_ascii=False))
+        except OSError as e:
+            # Checkpoints only save time on a retry; never fail the task over one
+            logger.warning(f"Could not write checkpoint for {task_name}: {str(e)}")
+
+    def invalidate(self, task_names: Set[str]) -> None:
+        for task_name in task_names:
+            self._path(task_name).unlink(missing_ok=True)
+
+    def tasks(self) -> Set[str]:
+        """Names of the tasks with a checkpoint."""
+        if not self.directory.exists():
+            return set()
+        names = set()
+        for path in self.directory.glob("*.json"):
+            try:
+                names.add(json.loads(path.read_text(encoding="utf-8"))["task"])
+            except (OSError, ValueError, KeyError):
+                continue
+        return names
@@ -0,0 +1,162 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import tempfile
+import threading
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_STORE_DIR = Path.home() / ".cache" / "resume_rocket_fuel" / "company_profiles"
+DEFAULT_TTL_HOURS = 7 * 24
+# Entries older than this fraction of the TTL are served but refreshed in the background
+REFRESH_FRACTION = 0.75
+
+# Legal-form suffixes that do not distinguish one employer from another
+_COMPANY_SUFFIXES = {
+    "inc", "incorporated", "llc", "ltd", "limited", "plc", "corp", "corporation",
+    "co", "company", "gmbh", "ag", "sa", "bv", "nv", "pte", "pty", "llp", "group",
+}
+
+
+def normalize_company_name(company_name: str) -> str:
+    """Normalise a company name so "KPMG LLP" and " kpmg " share one entry."""
+    words = re.sub(r"[^\w\s]", " ", company_name.casefold().replace("&", " and ")).split()
+    while len(words) > 1 and words[-1] in _COMPANY_SUFFIXES:
+        words.pop()
+    return " ".join(words)
+
+
+@dataclass
+class CompanyProfile:
+    company_name: str
+    report: str
+    created: float
+    ttl_seconds: float
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.created
+
+    @property
+    def is_fresh(self) -> bool:
+        return self.age < self.ttl_seconds
+
+    @property
+    def needs_refresh(self) -> bool:
+        return self.age >= self.ttl_seconds * REFRESH_FRACTION
+
+
+class CompanyProfileStore:
+    """Shared on-disk store of company profile reports with a TTL."""
+
+    def __init__(self, store_dir: Optional[Path] = None, ttl_hours: float = DEFAULT_TTL_HOURS):
+        self.store_dir = Path(store_dir or DEFAULT_STORE_DIR)
+        self.ttl_seconds = ttl_hours * 3600
+        self._refreshing = set()
+        self._lock = threading.Lock()
+
+    def _path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:32]
+        return self.store_dir / f"{digest}.json"
+
+    def get(self, company_name: str) -> Optional[CompanyProfile]:
+        """Return the stored profile for a company if it has not expired."""
+        key = normalize_company_name(company_name)
+        if not key:
+            return None
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable company profile for {company_name}: {str(e)}")
+            return None
+
+        profile = CompanyProfile(
+            company_name=entry.get("company_name", company_name),
+            report=entry.get("report", ""),
+            created=entry.get("created", 0),
+            ttl_seconds=self.ttl_seconds,
+        )
+        if not profile.report.strip() or not profile.is_fresh:
+            return None
+        return profile
+
+    def put(self, company_name: str, report: str) -> None:
+        key = normalize_company_name(company_name)
+        if not key or not report or not report.strip():
+            return
+        path = self._path(key)
+        entry = {"company_name": company_name, "key": key, "report": report, "created": time.time()}
+        try:
+            self.store_dir.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.store_dir, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f, ensure_ascii=False)
+            os.replace(tmp_name, path)
+            logger.info(f"Stored company profile for {company_name} ({len(report)} chars)")
+        except Exception as e:
+            logger.error(f"Failed to store company profile for {company_name}: {str(e)}")
+
+    def invalidate(self, company_name: str) -> None:
+        self._path(normalize_company_name(company_name)).unlink(missing_ok=True)
+
+    def refresh_in_background(self, company_name: str, research: Callable[[], str]) -> bool:
+        """Regenerate a profile on a daemon thread; at most one refresh per company."""
+        key = normalize_company_name(company_name)
+        with self._lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+
+        def refresh():
+            try:
+                logger.info(f"🔄 Refreshing company profile for {company_name} in the background")
+                self.put(company_name, research())
+            except Exception as e:
+                logger.error(f"Background refresh of {company_name} failed: {str(e)}")
+                logger.error(f"Traceback: {traceback.format_exc()}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        threading.Thread(target=refresh, name=f"company-refresh-{key}", daemon=True).start()
+        return True
+
+
+_default_store = None
+_disabled_reason: Optional[str] = None
+
+
+def disable_company_store(reason: str) -> None:
+    """Turn the store off for the rest of the process, e.g. while the fake LLM writes canned reports."""
+    global _disabled_reason
+    if _disabled_reason is None:
+        logger.info(f"Company profile store disabled: {reason}")
+    _disabled_reason = reason
+
+
+def get_company_store() -> Optional[CompanyProfileStore]:
+    """Process-wide store configured from the environment, or None when disabled.
+
+    RRF_COMPANY_PROFILE_TTL_HOURS sets the TTL (0 disables the store) and
+    RRF_COMPANY_PROFILE_DIR its location, which may be shared between hosts.
+    """
+    global _default_store
+    ttl_hours = float(os.environ.get("RRF_COMPANY_PROFILE_TTL_HOURS", DEFAULT_TTL_HOURS))
+    if ttl_hours <= 0 or _disabled_reason is not None:
+        return None
+    if _default_store is None:
+        _default_store = CompanyProfileStore(
+            store_dir=os.environ.get("RRF_COMPANY_PROFILE_DIR") or None,
+            ttl_hours=ttl_hours,
+        )
+    return _default_store
@@ -0,0 +1,18 @@
+import sys
+
+
+def use_pysqlite3():
+    """Swap the stdlib sqlite3 module for pysqlite3 when it is installed.
+
+    Some hosts ship an SQLite too old for chromadb (used by crewAI memory).
+    This must run before anything imports sqlite3.
+    """
+    try:
+        if 'sqlite3' in sys.modules:
+            del sys.modules['sqlite3']
+        __import__('pysqlite3')
+        sys.modules['sqlite3'] = sys.modules.pop('pysqlite3')
+        return True
+    except Exception as e:
+        print('SQLite hack failed: ', e)
+        return False
@@ -1,16 +1,48 @@
 from crewai import Agent, Crew, Process, Task
 from crewai.project import CrewBase, agent, crew, task
 from crewai.agents.agent_builder.base_agent import BaseAgent
-from typing import List
+from typing import Dict, List, Optional, Tuple
+import copy
 import logging
+import threading
 import traceback
 import yaml
 from pathlib import Path
 
+from resume_rocket_fuel.llm import build_llm
+
 # Set up logging
 logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+CONFIG_DIR = Path(__file__).parent / "config"
+
+# Parsed YAML keyed by path, with the (mtime, size) it was parsed at
+_config_cache: Dict[Path, Tuple[Tuple[int, int], dict]] = {}
+_config_cache_lock = threading.Lock()
+
+
+def _file_signature(path: Path) -> Tuple[int, int]:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+def load_yaml_config(full_path: Path) -> dict:
+    """Parse a YAML config once per process, re-reading it when the file changes.
+
+    Callers get their own deep copy, since crewAI mutates the config it is given.
+    """
+    signature = _file_signature(full_path)
+    with _config_cache_lock:
+        cached = _config_cache.get(full_path)
+        if cached is None or cached[0] != signature:
+            logger.debug(f"Parsing configuration file {full_path}")
+            with open(full_path, 'r') as f:
+                _config_cache[full_path] = (signature, yaml.safe_load(f))
+        config = _config_cache[full_path][1]
+    return copy.deepcopy(config)
+
+
 @CrewBase
 class ResumeRocketFuel():
     """ResumeRocketFuel crew"""
@@ -21,23 +53,19 @@ class ResumeRocketFuel():
     def _load_config(self, config_path: str) -> dict:
         """Load configuration from YAML file."""
         try:
-            logger.info(f"Loading configuration from {config_path}")
             # Get the absolute path to the config file
             base_path = Path(__file__).parent
             full_path = base_path / config_path
             
-            logger.info(f"Full config path: {full_path}")
-            
             if not full_path.exists():
                 raise FileNotFoundError(f"Configuration file not found: {full_path}")
                 
-            with open(full_path, 'r') as f:
-                config = yaml.safe_load(f)
+            config = load_yaml_config(full_path)
                 
             if not config:
                 raise ValueError(f"Empty configuration file: {config_path}")
                 
-            logger.info(f"Successfully loaded configuration from {config_path}")
+            logger.debug(f"Loaded configuration from {config_path}")
             return config
             
         except Exception as e:
@@ -67,6 +95,7 @@ class ResumeRocketFuel():
                 raise KeyError("research_analyst configuration not found in agents.yaml")
             return Agent(
                 config=self.agents_config['research_analyst'],
+                llm=build_llm(self.agents_config['research_analyst']),
                 verbose=True
             )
         except Exception as e:
@@ -81,6 +110,7 @@ class ResumeRocketFuel():
                 raise KeyError("recruitment_analyst configuration not found in agents.yaml")
             return Agent(
                 config=self.agents_config['recruitment_analyst'],
+                llm=build_llm(self.agents_config['recruitment_analyst']),
                 verbose=True
             )
         except Exception as e:
@@ -95,6 +125,7 @@ class ResumeRocketFuel():
                 raise KeyError("domain_expert configuration not found in agents.yaml")
             return Agent(
                 config=self.agents_config['domain_expert'],
+                llm=build_llm(self.agents_config['domain_expert']),
                 verbose=True
             )
         except Exception as e:
@@ -109,6 +140,7 @@ class ResumeRocketFuel():
                 raise KeyError("cv_editor configuration not found in agents.yaml")
             return Agent(
                 config=self.agents_config['cv_editor'],
+                llm=build_llm(self.agents_config['cv_editor']),
                 verbose=True
             )
         except Exception as e:
@@ -123,6 +155,7 @@ class ResumeRocketFuel():
                 raise KeyError("qa_manager configuration not found in agents.yaml")
             return Agent(
                 config=self.agents_config['qa_manager'],
+                llm=build_llm(self.agents_config['qa_manager']),
                 verbose=True
             )
         except Exception as e:
@@ -232,3 +265,37 @@ class ResumeRocketFuel():
             logger.error(f"Error type: {type(e)}")
             logger.error(f"Traceback: {traceback.format_exc()}")
             raise
+
+
+
+class CrewTemplate:
+    """A fully built crew that is cloned, rather than rebuilt, for every run."""
+
+    def __init__(self):
+        rocket_fuel = ResumeRocketFuel()
+        self.crew = rocket_fuel.crew()
+        self.tasks_config = rocket_fuel.tasks_config
+        self.agents_config = rocket_fuel.agents_config
+        self.signature = config_signature()
+
+    def new_crew(self) -> Crew:
+        """Cheap per-run copy of the template's agents and tasks, ready for inputs."""
+        return self.crew.copy()
+
+
+def config_signature() -> Tuple[Tuple[int, int], ...]:
+    return tuple(_file_signature(CONFIG_DIR / name) for name in ("agents.yaml", "tasks.yaml"))
+
+
+_template: Optional[CrewTemplate] = None
+_template_lock = threading.Lock()
+
+
+def get_crew_template() -> CrewTemplate:
+    """Process-wide crew template, rebuilt when agents.yaml or tasks.yaml change."""
+    global _template
+    with _template_lock:
+        if _template is None or _template.signature != config_signature():
+            logger.info("Building ResumeRocketFuel crew template...")
+            _template = CrewTemplate()
+        return _template
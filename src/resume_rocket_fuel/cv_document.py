@@ -0,0 +1,349 @@
+import functools
+import html
+import importlib
+import logging
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class Run:
+    """A piece of inline text with uniform styling."""
+    text: str
+    bold: bool = False
+    italic: bool = False
+    href: Optional[str] = None
+
+
+Inline = Tuple[Run, ...]
+
+
+@dataclass
+class Paragraph:
+    # Each entry is one hard-broken line
+    lines: List[Inline]
+
+
+@dataclass
+class Bullet:
+    lines: List[Inline]
+
+
+@dataclass
+class Field:
+    label: str
+    value: Inline
+
+
+@dataclass
+class FieldRow:
+    """Items of a ``a | b | c`` line such as the contact details under the name."""
+    items: List[Union[Field, Paragraph]]
+
+
+@dataclass
+class Entry:
+    """A ``###`` item of a section, e.g. one role with its dates and bullets."""
+    title: Inline
+    dates: Optional[Inline] = None
+    blocks: List["Block"] = field(default_factory=list)
+
+
+Block = Union[Paragraph, Bullet, Field, FieldRow, Entry]
+
+
+@dataclass
+class Section:
+    title: str
+    blocks: List[Block] = field(default_factory=list)
+
+
+@dataclass
+class CVDocument:
+    """Parsed CV: the name, the header lines under it, then ``##`` sections."""
+    title: Optional[Inline] = None
+    header: List[Block] = field(default_factory=list)
+    sections: List[Section] = field(default_factory=list)
+
+    def section(self, title: str) -> Optional[Section]:
+        for section in self.sections:
+            if section.title.lower() == title.lower():
+                return section
+        return None
+
+
+# Inline markup: **bold**, *italic*, [text](url) and `code`
+_INLINE = re.compile(r"\*\*(.+?)\*\*|\*(?!\s)(.+?)(?<!\s)\*|\[([^\]]+)\]\(([^)\s]+)\)|`([^`]+)`")
+_HEADING = re.compile(r"^(#{1,6})\s+(.*?)\s*#*$")
+_BULLET = re.compile(r"^(?:[-*+]|\d+[.)])\s+(.*)$")
+_BOLD_FIELD = re.compile(r"^\*\*([^*]{1,40}?):\*\*\s*(.*)$|^\*\*([^*]{1,40}?)\*\*:\s*(.*)$")
+_PLAIN_FIELD = re.compile(r"^([A-Za-z][\w &/().-]{0,13}):\s+(.+)$")
+_RULE = re.compile(r"^(?:-{3,}|\*{3,}|_{3,})$")
+
+
+def parse_inline(text: str) -> Inline:
+    runs = []
+    position = 0
+    for match in _INLINE.finditer(text):
+        if match.start() > position:
+            runs.append(Run(text[position:match.start()]))
+        bold, italic, link_text, href, code = match.groups()
+        if bold is not None:
+            runs.extend(Run(run.text, bold=True, italic=run.italic, href=run.href) for run in parse_inline(bold))
+        elif italic is not None:
+            runs.append(Run(italic, italic=True))
+        elif link_text is not None:
+            runs.append(Run(link_text, href=href))
+        else:
+            runs.append(Run(code))
+        position = match.end()
+    if position < len(text):
+        runs.append(Run(text[position:]))
+    return tuple(runs)
+
+
+def inline_text(runs: Inline) -> str:
+    return "".join(run.text for run in runs)
+
+
+def _parse_field(text: str) -> Optional[Field]:
+    match = _BOLD_FIELD.match(text)
+    if match:
+        label = match.group(1) or match.group(3)
+        value = match.group(2) if match.group(1) is not None else match.group(4)
+        return Field(label.strip(), parse_inline(value.strip()))
+    match = _PLAIN_FIELD.match(text)
+    if match:
+        return Field(match.group(1).strip(), parse_inline(match.group(2).strip()))
+    return None
+
+
+def _parse_text_line(text: str) -> Block:
+    """A line of body text: a row of fields, a single field or a paragraph."""
+    if " | " in text:
+        items = []
+        for item in text.split(" | "):
+            item = item.strip()
+            items.append(_parse_field(item) or Paragraph([parse_inline(item)]))
+        return FieldRow(items)
+    return _parse_field(text) or Paragraph([parse_inline(text)])
+
+
+def _is_italic_line(text: str) -> bool:
+    return (len(text) > 2 and text[0] == text[-1] and text[0] in "*_"
+            and text[1] != text[0] and text[-2] != text[0])
+
+
+def parse_markdown(text: str) -> CVDocument:
+    """Parse CV Markdown into a CVDocument in a single pass over its lines."""
+    document = CVDocument()
+    section: Optional[Section] = None
+    entry: Optional[Entry] = None
+    # The open paragraph or bullet that continuation lines are appended to
+    open_block: Optional[Union[Paragraph, Bullet]] = None
+    hard_break = False
+
+    def container() -> List[Block]:
+        if entry is not None:
+            return entry.blocks
+        if section is not None:
+            return section.blocks
+        return document.header
+
+    for raw in text.splitlines():
+        stripped = raw.strip()
+        if stripped.startswith("```") or _RULE.match(stripped):
+            # Fences around the whole CV and horizontal rules carry no content
+            open_block = None
+            continue
+        if not stripped:
+            open_block = None
+            continue
+        line_break = raw.endswith("  ") or raw.endswith("\\")
+        stripped = stripped.rstrip("\\").rstrip()
+
+        heading = _HEADING.match(stripped)
+        if heading:
+            open_block = None
+            level, title = len(heading.group(1)), heading.group(2)
+            if level == 1 and document.title is None:
+                document.title = parse_inline(title)
+            elif level <= 2:
+                section = Section(inline_text(parse_inline(title)))
+                document.sections.append(section)
+                entry = None
+            else:
+                entry = Entry(parse_inline(title))
+                if section is None:
+                    section = Section("")
+                    document.sections.append(section)
+                section.blocks.append(entry)
+            continue
+
+        bullet = _BULLET.match(stripped)
+        if bullet:
+            open_block = Bullet([parse_inline(bullet.group(1))])
+            container().append(open_block)
+        elif open_block is not None:
+            # Continuation of the previous line: a new line after a hard break, else the same line
+            if hard_break:
+                open_block.lines.append(parse_inline(stripped))
+            else:
+                open_block.lines[-1] = open_block.lines[-1] + (Run(" "),) + parse_inline(stripped)
+        elif entry is not None and entry.dates is None and not entry.blocks and _is_italic_line(stripped):
+            entry.dates = parse_inline(stripped)
+        else:
+            block = _parse_text_line(stripped)
+            container().append(block)
+            open_block = block if isinstance(block, Paragraph) else None
+        hard_break = line_break
+    return document
+
+
+@functools.lru_cache(maxsize=32)
+def _load_document(path: str, mtime_ns: int, size: int) -> CVDocument:
+    with open(path, "r", encoding="utf-8") as f:
+        return parse_markdown(f.read())
+
+
+def load_document(md_path: Path) -> CVDocument:
+    """Parse a Markdown file once; later calls for the unchanged file reuse the result.
+
+    The returned document is shared, so renderers must not modify it.
+    """
+    stat = Path(md_path).stat()
+    return _load_document(str(Path(md_path).resolve()), stat.st_mtime_ns, stat.st_size)
+
+
+# HTML rendering
+
+HTML_STYLE = """
+body { font-family: Arial, Helvetica, sans-serif; font-size: 10.5pt; line-height: 1.4; color: #222; margin: 40px; }
+h1 { color: #2E4053; font-size: 20pt; margin: 0 0 4px 0; }
+h2 { color: #2E4053; font-size: 13pt; border-bottom: 1px solid #c8ced6; margin: 18px 0 6px 0; padding-bottom: 2px; }
+h3 { font-size: 11pt; margin: 10px 0 0 0; }
+p { margin: 3px 0; }
+ul { margin: 4px 0 4px 20px; padding: 0; }
+li { margin: 2px 0; }
+.contact { color: #444; }
+.dates { color: #666; font-style: italic; margin: 0 0 4px 0; }
+a { color: #1F618D; text-decoration: none; }
+"""
+
+
+def _runs_html(runs: Inline) -> str:
+    parts = []
+    for run in runs:
+        text = html.escape(run.text)
+        if run.href:
+            text = f'<a href="{html.escape(run.href, quote=True)}">{text}</a>'
+        if run.italic:
+            text = f"<em>{text}</em>"
+        if run.bold:
+            text = f"<strong>{text}</strong>"
+        parts.append(text)
+    return "".join(parts)
+
+
+def _lines_html(lines: List[Inline]) -> str:
+    return "<br>".join(_runs_html(line) for line in lines)
+
+
+def _field_html(item: Union[Field, Paragraph]) -> str:
+    if isinstance(item, Field):
+        return f"<strong>{html.escape(item.label)}:</strong> {_runs_html(item.value)}"
+    return _lines_html(item.lines)
+
+
+def _blocks_html(blocks: List[Block], css_class: str = "") -> str:
+    out = []
+    in_list = False
+    class_attr = f' class="{css_class}"' if css_class else ""
+    for block in blocks:
+        if isinstance(block, Bullet) != in_list:
+            out.append("<ul>" if not in_list else "</ul>")
+            in_list = not in_list
+        if isinstance(block, Bullet):
+            out.append(f"<li>{_lines_html(block.lines)}</li>")
+        elif isinstance(block, Paragraph):
+            out.append(f"<p{class_attr}>{_lines_html(block.lines)}</p>")
+        elif isinstance(block, Field):
+            out.append(f"<p{class_attr}>{_field_html(block)}</p>")
+        elif isinstance(block, FieldRow):
+            out.append(f"<p{class_attr}>{' | '.join(_field_html(item) for item in block.items)}</p>")
+        elif isinstance(block, Entry):
+            out.append('<div class="entry">')
+            out.append(f"<h3>{_runs_html(block.title)}</h3>")
+            if block.dates:
+                out.append(f'<p class="dates">{_runs_html(block.dates)}</p>')
+            out.append(_blocks_html(block.blocks))
+            out.append("</div>")
+    if in_list:
+        out.append("</ul>")
+    return "\n".join(out)
+
+
+def render_header_html(document: CVDocument) -> str:
+    title = f"<h1>{_runs_html(document.title)}</h1>\n" if document.title else ""
+    return f"<header>\n{title}{_blocks_html(document.header, 'contact')}\n</header>"
+
+
+def render_section_html(section: Section) -> str:
+    """HTML of one section, usable on its own, e.g. to show a CV as it is produced."""
+    heading = f"<h2>{html.escape(section.title)}</h2>\n" if section.title else ""
+    return f"<section>\n{heading}{_blocks_html(section.blocks)}\n</section>"
+
+
+def render_html(document: CVDocument, section_html: Optional[List[str]] = None) -> str:
+    """Render a complete, self-contained HTML page for the document.
+
+    ``section_html`` may hold the HTML of the first sections, already rendered
+    while the CV was being generated; the remaining sections are rendered here.
+    """
+    title = html.escape(inline_text(document.title)) if document.title else "Curriculum Vitae"
+    sections = list(section_html or [])
+    sections += [render_section_html(s) for s in document.sections[len(sections):]]
+    body = "\n".join([render_header_html(document)] + sections)
+    return (
+        "<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n"
+        f"<title>{title}</title>\n<style>{HTML_STYLE}</style>\n</head>\n<body>\n{body}\n</body>\n</html>\n"
+    )
+
+
+def write_html(document: CVDocument, html_path: Path) -> None:
+    Path(html_path).write_text(render_html(document), encoding="utf-8")
+
+
+# Renderers take a parsed document and an output path. Entries given as
+# "module:function" strings are imported on first use to keep imports light.
+RENDERERS: Dict[str, Union[str, Callable[[CVDocument, Path], None]]] = {
+    "html": write_html,
+    "pdf": "resume_rocket_fuel.pdf_export:write_pdf",
+}
+
+
+def register_renderer(output_format: str, renderer: Union[str, Callable[[CVDocument, Path], None]]) -> None:
+    RENDERERS[output_format.lower()] = renderer
+
+
+def get_renderer(output_format: str) -> Callable[[CVDocument, Path], None]:
+    renderer = RENDERERS.get(output_format.lower())
+    if renderer is None:
+        raise ValueError(f"No renderer for output format {output_format!r}; known: {sorted(RENDERERS)}")
+    if isinstance(renderer, str):
+        module_name, function_name = renderer.split(":")
+        renderer = getattr(importlib.import_module(module_name), function_name)
+        RENDERERS[output_format.lower()] = renderer
+    return renderer
+
+
+def render_document(document: CVDocument, outputs: Dict[str, Path]) -> Dict[str, Path]:
+    """Render one parsed document to several formats, e.g. {"html": ..., "pdf": ...}."""
+    for output_format, path in outputs.items():
+        get_renderer(output_format)(document, Path(path))
+        logger.info(f"✅ Rendered {output_format.upper()} to {path}")
+    return outputs
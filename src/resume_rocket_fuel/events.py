@@ -0,0 +1,102 @@
+import logging
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from typing import Callable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+RUN_STARTED = "run_started"
+RUN_FINISHED = "run_finished"
+RUN_FAILED = "run_failed"
+TASK_STARTED = "task_started"
+TASK_FINISHED = "task_finished"
+TASK_FAILED = "task_failed"
+TASK_SKIPPED = "task_skipped"
+# Part of a task's output is available while the task is still running
+TASK_OUTPUT = "task_output"
+AGENT_STEP = "agent_step"
+MESSAGE = "message"
+
+
+@dataclass
+class ProgressEvent:
+    kind: str
+    task: Optional[str] = None
+    agent: Optional[str] = None
+    message: Optional[str] = None
+    duration_s: Optional[float] = None
+    output_chars: Optional[int] = None
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict:
+        return {key: value for key, value in asdict(self).items() if value is not None}
+
+
+def _task_label(task: Optional[str]) -> str:
+    return (task or "task").replace("_", " ")
+
+
+def describe_event(event: ProgressEvent) -> str:
+    """Human readable one-line summary of an event for status displays."""
+    label = _task_label(event.task)
+    if event.kind == TASK_STARTED:
+        return f"▶️ {event.agent or 'Agent'} started: {label}"
+    if event.kind == TASK_FINISHED:
+        return f"✅ Finished {label} in {event.duration_s:.1f}s ({event.output_chars} chars)"
+    if event.kind == TASK_SKIPPED:
+        return f"⏭️ Reused earlier result for {label}"
+    if event.kind == TASK_FAILED:
+        return f"❌ {label} failed: {event.message}"
+    if event.kind == TASK_OUTPUT:
+        return f"📝 {label}: {event.message}"
+    if event.kind == AGENT_STEP:
+        return f"🤖 {event.agent or 'Agent'} is working on {label}..."
+    if event.kind == RUN_FINISHED and event.duration_s is not None:
+        return f"{event.message or '🎉 Done'} ({event.duration_s:.1f}s)"
+    return event.message or event.kind
+
+
+def log_event(event: ProgressEvent) -> None:
+    if event.kind == AGENT_STEP:
+        logger.debug(describe_event(event))
+    elif event.kind in (TASK_FAILED, RUN_FAILED):
+        logger.error(describe_event(event))
+    else:
+        logger.info(describe_event(event))
+
+
+class EventBus:
+    """Synchronous publish/subscribe channel for the progress of one run.
+
+    Subscribers are called in the publishing thread; a failing subscriber is
+    logged and never interrupts the run or the other subscribers.
+    """
+
+    def __init__(self):
+        self._subscribers: List[Callable[[ProgressEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[ProgressEvent], None]) -> Callable[[], None]:
+        """Register a subscriber and return a function that removes it again."""
+        with self._lock:
+            self._subscribers.append(callback)
+
+        def unsubscribe():
+            with self._lock:
+                if callback in self._subscribers:
+                    self._subscribers.remove(callback)
+
+        return unsubscribe
+
+    def publish(self, event: ProgressEvent) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for callback in subscribers:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.warning(f"Progress subscriber {callback!r} failed: {str(e)}")
+
+    def message(self, text: str) -> None:
+        self.publish(ProgressEvent(MESSAGE, message=text))
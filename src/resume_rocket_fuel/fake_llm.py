@@ -0,0 +1,169 @@
+import logging
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+
+from resume_rocket_fuel.llm import CachingLLM
+
+logger = logging.getLogger(__name__)
+
+# agents.yaml selects the fake LLM with e.g. "model: fake/gpt-4-turbo"
+FAKE_PREFIX = "fake/"
+# RRF_FAKE_LLM=1 swaps every agent's model for the fake one, e.g. for benchmarks
+FORCE_ENV = "RRF_FAKE_LLM"
+
+# Sample outputs shipped with the package, one per task
+SAMPLES_DIR = Path(__file__).parent / "output"
+CANNED_FILES = {
+    "upload_materials": "upload_materials.md",
+    "generate_company_profile_report": "company_profile_report.md",
+    "analyze_cv_and_jd": "cv_analysis_suggestions.md",
+    "optimize_cv_for_domain": "domain_expert_suggestions.md",
+    "merge_cv_enhancements": "final_cv.md",
+    "qa_review_final_cv": "final_cv.md",
+}
+DEFAULT_ANSWER = "# Report\n\nNo sample output is available for this task."
+
+# Typical characters per token, as in count_tokens' estimate
+CHARS_PER_TOKEN = 4
+_TOKEN = re.compile(rf"\s*\S{{1,{CHARS_PER_TOKEN}}}|\s+")
+
+
+def is_fake_model(model: str) -> bool:
+    return model.startswith(FAKE_PREFIX)
+
+
+def fake_llm_forced() -> bool:
+    return os.environ.get(FORCE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def isolate_shared_state() -> None:
+    """Keep canned answers and simulated latencies out of the state real runs share.
+
+    Disables the company profile store and keeps model latencies in memory for
+    the rest of the process, so real runs never reuse a fake company report or
+    route by fake timings.
+    """
+    from resume_rocket_fuel.company_store import disable_company_store
+    from resume_rocket_fuel.routing import keep_latencies_in_memory
+
+    disable_company_store("the fake LLM is in use")
+    keep_latencies_in_memory()
+
+
+def fake_model_name(model: str) -> str:
+    """Name of the fake LLM standing in for ``model``."""
+    return model if is_fake_model(model) else f"{FAKE_PREFIX}{model}"
+
+
+@dataclass
+class FakeLLMSettings:
+    """Simulated timing: a fixed latency to the first token, then a steady token rate (0 = instant)."""
+    latency_s: float = 0.0
+    tokens_per_s: float = 0.0
+
+    @classmethod
+    def from_config(cls, agent_config: dict) -> "FakeLLMSettings":
+        """Settings from the agent's ``fake_llm`` entry, overridden by RRF_FAKE_LLM_LATENCY_S and
+        RRF_FAKE_LLM_TOKENS_PER_S."""
+        config = agent_config.get("fake_llm") or {}
+        return cls(
+            latency_s=float(os.environ.get("RRF_FAKE_LLM_LATENCY_S", config.get("latency_s", cls.latency_s))),
+            tokens_per_s=float(os.environ.get("RRF_FAKE_LLM_TOKENS_PER_S",
+                                              config.get("tokens_per_s", cls.tokens_per_s))),
+        )
+
+
+@lru_cache(maxsize=None)
+def canned_answer(task_name: Optional[str]) -> str:
+    """The sample output of ``task_name``, as the text after "Final Answer:"."""
+    name = CANNED_FILES.get(task_name or "")
+    if name is None:
+        return DEFAULT_ANSWER
+    return (SAMPLES_DIR / name).read_text(encoding="utf-8")
+
+
+def _tokens(text: str):
+    return _TOKEN.findall(text)
+
+
+# Task crewAI is running in each thread, for calls made by Crew.kickoff rather than the scheduler
+_kickoff_task = threading.local()
+_tracker_installed = False
+_tracker_lock = threading.Lock()
+
+
+def _install_task_tracker() -> None:
+    """Record the task named by crewAI's task started events, which are emitted in the task's thread."""
+    global _tracker_installed
+    with _tracker_lock:
+        if _tracker_installed:
+            return
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.task_events import TaskStartedEvent
+
+        def on_task_started(source, event):
+            _kickoff_task.name = getattr(event.task, "name", None)
+
+        crewai_event_bus.register_handler(TaskStartedEvent, on_task_started)
+        _tracker_installed = True
+
+
+class FakeLLM(CachingLLM):
+    """Deterministic local stand-in for an LLM, answering every task with its sample output.
+
+    Calls take the simulated time of ``settings`` and, when streaming, emit
+    crewAI stream chunk events like a real provider, so the scheduler, live
+    preview, tracing and rendering all run as usual with no network access.
+    Responses are never cached, so every run pays the simulated latency.
+    """
+
+    def __init__(self, model: str, settings: Optional[FakeLLMSettings] = None, **kwargs):
+        super().__init__(model=model, cache=None, **kwargs)
+        self.settings = settings or FakeLLMSettings()
+        _install_task_tracker()
+
+    def supports_function_calling(self) -> bool:
+        return False
+
+    def supports_stop_words(self) -> bool:
+        return False
+
+    def _call(self, task_name: Optional[str], messages, tools, *args, **kwargs):
+        task_name = task_name or getattr(_kickoff_task, "name", None)
+        response = f"Thought: I now can give a great answer\nFinal Answer: {canned_answer(task_name)}"
+        start = time.perf_counter()
+        if self.settings.latency_s > 0:
+            time.sleep(self.settings.latency_s)
+        if self.stream:
+            self._stream(response)
+        elif self.settings.tokens_per_s > 0:
+            time.sleep(len(_tokens(response)) / self.settings.tokens_per_s)
+        self._record_latency(task_name, time.perf_counter() - start, response)
+        return response, False
+
+    def _stream(self, response: str) -> None:
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+
+        start = time.perf_counter()
+        for index, token in enumerate(_tokens(response)):
+            if self.settings.tokens_per_s > 0:
+                # Sleep to a schedule rather than per token so the overhead doesn't add up
+                delay = start + index / self.settings.tokens_per_s - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            crewai_event_bus.emit(self, event=LLMStreamChunkEvent(chunk=token))
+
+
+def build_fake_llm(model: str, agent_config: dict, stream: bool = False) -> FakeLLM:
+    isolate_shared_state()
+    settings = FakeLLMSettings.from_config(agent_config)
+    model = fake_model_name(model)
+    logger.info(f"Using fake LLM {model} (latency {settings.latency_s}s, {settings.tokens_per_s or 'unlimited'} tokens/s)")
+    return FakeLLM(model=model, settings=settings, stream=stream)
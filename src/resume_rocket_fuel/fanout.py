@@ -0,0 +1,203 @@
+import json
+import logging
+import re
+import shutil
+import threading
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from resume_rocket_fuel.batch import read_manifest_rows
+from resume_rocket_fuel.company_store import get_company_store, normalize_company_name
+from resume_rocket_fuel.events import AGENT_STEP, EventBus, describe_event
+from resume_rocket_fuel.rate_limit import BATCH, priority_lane
+from resume_rocket_fuel.workspace import Workspace
+
+logger = logging.getLogger(__name__)
+
+RESULTS_FILE = "results.jsonl"
+# Runs in flight at once; each also runs its independent tasks concurrently
+DEFAULT_MAX_PARALLEL = 4
+
+
+@dataclass
+class FanoutTarget:
+    """One job description to tailor the shared CV for."""
+    jd_pdf: str
+    company: str
+    format: str = "PDF"
+
+
+def load_targets(manifest_path: Path) -> List[FanoutTarget]:
+    """Read (jd_pdf, company, format) rows from a JSONL or CSV manifest.
+
+    Relative PDF paths are resolved against the manifest's directory.
+    """
+    manifest_path = Path(manifest_path)
+    targets = []
+    for index, row in enumerate(read_manifest_rows(manifest_path)):
+        missing = [field for field in ("jd_pdf", "company") if not row.get(field)]
+        if missing:
+            raise ValueError(f"Manifest row {index + 1} is missing {', '.join(missing)}")
+        jd_pdf = str((manifest_path.parent / row["jd_pdf"]).resolve())
+        targets.append(FanoutTarget(jd_pdf, row["company"], (row.get("format") or "PDF").upper()))
+    return targets
+
+
+def _target_dir_name(index: int, target: FanoutTarget) -> str:
+    slug = re.sub(r"[^a-z0-9]+", "-", normalize_company_name(target.company)).strip("-") or "company"
+    return f"{index + 1:02d}-{slug}-{Path(target.jd_pdf).stem}"
+
+
+def completed_records(results_path: Path) -> Dict[str, dict]:
+    """Records of runs that already succeeded according to a results file, keyed by workspace."""
+    done = {}
+    if results_path.exists():
+        with open(results_path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # A partially written line from an interrupted run
+                    continue
+                if record.get("status") == "succeeded":
+                    done[record["workspace"]] = record
+    return done
+
+
+def _research_profiles(targets: List[FanoutTarget], max_parallel: int) -> Dict[str, str]:
+    """One company profile per distinct company, from the store or researched concurrently.
+
+    Without this, runs for the same company would all miss the store at once
+    and research it in parallel. Companies whose research fails are left out,
+    so their runs research them on their own.
+    """
+    from resume_rocket_fuel.pipeline import extract_text_from_pdf, research_company_profile
+
+    store = get_company_store()
+    profiles = {}
+    to_research = {}
+    for target in targets:
+        key = normalize_company_name(target.company)
+        if key in profiles or key in to_research:
+            continue
+        stored = store.get(target.company) if store else None
+        if stored:
+            profiles[key] = stored.report
+        else:
+            to_research[key] = target
+    if not to_research:
+        return profiles
+
+    logger.info(f"Researching {len(to_research)} companies for {len(targets)} job descriptions")
+
+    def research(target: FanoutTarget) -> str:
+        with priority_lane(BATCH):
+            report = research_company_profile(target.company, extract_text_from_pdf(Path(target.jd_pdf)))
+        # Looked up again, since building the crew may have disabled the store (see fake_llm.py)
+        current_store = get_company_store()
+        if current_store:
+            current_store.put(target.company, report)
+        return report
+
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="fanout-research") as pool:
+        futures = {pool.submit(research, target): key for key, target in to_research.items()}
+        for future in as_completed(futures):
+            key = futures[future]
+            try:
+                profiles[key] = future.result()
+            except Exception as e:
+                logger.error(f"Company research for {to_research[key].company} failed: {str(e)}")
+    return profiles
+
+
+def run_fanout(cv_pdf: Path, targets: List[FanoutTarget], out_dir: Path, max_parallel: int = DEFAULT_MAX_PARALLEL,
+               resume: bool = False, status_callback: Optional[Callable[[str], None]] = None) -> List[dict]:
+    """Tailor one CV to many job descriptions, sharing the work that does not depend on the JD.
+
+    The CV is extracted and structured once, and each distinct company is
+    researched once. Then one pipeline run per job description tailors the
+    CV, with up to ``max_parallel`` runs at a time. Each run uses its own
+    workspace under ``out_dir``. One JSON line per run is written to
+    ``out_dir/results.jsonl``, and the records are returned in target order.
+    With ``resume``, targets that already succeeded there are not run again
+    and their stored records are returned.
+    ``status_callback`` receives every progress line, prefixed with the run's
+    workspace name.
+    """
+    from resume_rocket_fuel.pipeline import pipeline_run, prepare_cv
+
+    out_dir = Path(out_dir).resolve()
+    out_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out_dir / RESULTS_FILE
+    results: List[Optional[dict]] = [None] * len(targets)
+    if resume:
+        done = completed_records(results_path)
+        for index, target in enumerate(targets):
+            results[index] = done.get(str(out_dir / _target_dir_name(index, target)))
+        skipped = sum(1 for record in results if record is not None)
+        if skipped:
+            logger.info(f"Skipping {skipped} job descriptions that already succeeded")
+    else:
+        results_path.unlink(missing_ok=True)
+    pending = [index for index, record in enumerate(results) if record is None]
+
+    start = time.perf_counter()
+    if pending:
+        cv = prepare_cv(Path(cv_pdf))
+        logger.info(f"Prepared {cv_pdf} once for {len(pending)} job descriptions in "
+                    f"{time.perf_counter() - start:.2f}s")
+        profiles = _research_profiles([targets[index] for index in pending], max_parallel)
+
+    def run_target(index: int, target: FanoutTarget) -> dict:
+        workspace = Workspace(out_dir / _target_dir_name(index, target))
+        if resume:
+            workspace.clear(keep=(workspace.checkpoints.name,))
+        else:
+            shutil.rmtree(workspace.path, ignore_errors=True)
+        workspace.create()
+        events = EventBus()
+
+        def report(event):
+            if status_callback and event.kind != AGENT_STEP:
+                status_callback(f"[{workspace.run_id}] {describe_event(event)}")
+
+        events.subscribe(report)
+        record = {**asdict(target), "cv_pdf": str(cv_pdf), "workspace": str(workspace.path)}
+        run_start = time.perf_counter()
+        try:
+            with priority_lane(BATCH):
+                success = pipeline_run(
+                    Path(cv_pdf), Path(target.jd_pdf), target.company, target.format, workspace=workspace,
+                    events=events, resume=resume, cv=cv,
+                    company_profile=profiles.get(normalize_company_name(target.company)),
+                )
+            record["status"] = "succeeded" if success else "failed"
+        except Exception as e:
+            logger.error(f"Fan-out run for {target.jd_pdf} failed: {str(e)}")
+            logger.error(f"Traceback: {traceback.format_exc()}")
+            record["status"] = "failed"
+            record["error"] = f"{type(e).__name__}: {str(e)}"
+        record["duration_s"] = round(time.perf_counter() - run_start, 3)
+        record["outputs"] = [
+            str(path) for path in (workspace.final_md, workspace.final_html, workspace.final_pdf) if path.exists()
+        ]
+        return record
+
+    write_lock = threading.Lock()
+    with ThreadPoolExecutor(max_workers=max(1, max_parallel), thread_name_prefix="fanout") as pool:
+        futures = {pool.submit(run_target, index, targets[index]): index for index in pending}
+        for future in as_completed(futures):
+            record = future.result()
+            results[futures[future]] = record
+            with write_lock, open(results_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record) + "\n")
+            logger.info(f"{record['company']} ({Path(record['jd_pdf']).name}) {record['status']} "
+                        f"in {record['duration_s']:.1f}s")
+
+    succeeded = sum(1 for record in results if record["status"] == "succeeded")
+    logger.info(f"Fan-out finished: {succeeded}/{len(results)} succeeded in {time.perf_counter() - start:.1f}s")
+    return results
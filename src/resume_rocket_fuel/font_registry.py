@@ -0,0 +1,212 @@
+import logging
+import mmap
+import threading
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+# fontTools logs every table it subsets at INFO, once per font per document
+logging.getLogger("fontTools.subset").setLevel(logging.WARNING)
+
+FONT_DIR = Path(__file__).parent.absolute() / "fonts"
+
+# Bundled families in order of preference, as {style: file}. A family is only
+# used when all four of its faces are valid TrueType files.
+FAMILIES: Dict[str, Dict[str, str]] = {
+    "DejaVuSans": {
+        "": "DejaVuSans.ttf", "B": "DejaVuSans-Bold.ttf",
+        "I": "DejaVuSans-Oblique.ttf", "BI": "DejaVuSans-BoldOblique.ttf",
+    },
+    "DejaVuSansCondensed": {
+        "": "DejaVuSansCondensed.ttf", "B": "DejaVuSansCondensed-Bold.ttf",
+        "I": "DejaVuSansCondensed-Oblique.ttf", "BI": "DejaVuSansCondensed-BoldOblique.ttf",
+    },
+    "DejaVuSerif": {
+        "": "DejaVuSerif.ttf", "B": "DejaVuSerif-Bold.ttf",
+        "I": "DejaVuSerif-Italic.ttf", "BI": "DejaVuSerif-BoldItalic.ttf",
+    },
+    "DejaVuSerifCondensed": {
+        "": "DejaVuSerifCondensed.ttf", "B": "DejaVuSerifCondensed-Bold.ttf",
+        "I": "DejaVuSerifCondensed-Italic.ttf", "BI": "DejaVuSerifCondensed-BoldItalic.ttf",
+    },
+}
+
+TRUETYPE_SIGNATURES = (b'\x00\x01\x00\x00', b'true', b'typ1', b'OTTO')
+
+# fpdf2 TTFFont state that FontFace.attach sets per document, as of fpdf2 2.8
+PER_DOCUMENT_SLOTS = ("i", "fontkey", "ttfont", "missing_glyphs", "biggest_size_pt", "_hbfont", "subset")
+
+
+def verify_font_file(file_path) -> bool:
+    """Whether a file starts with a TrueType/OpenType signature."""
+    try:
+        with open(file_path, 'rb') as f:
+            return f.read(4) in TRUETYPE_SIGNATURES
+    except OSError as e:
+        logger.error(f"Error verifying font file {file_path}: {e}")
+        return False
+
+
+@lru_cache(maxsize=None)
+def can_share_parsed_fonts() -> bool:
+    """Whether the installed fpdf2 has the font internals FontFace.attach relies on."""
+    try:
+        from fpdf.fonts import SubsetMap, TTFFont  # noqa: F401
+    except ImportError:
+        return False
+    if not set(PER_DOCUMENT_SLOTS) <= set(getattr(TTFFont, "__slots__", ())):
+        logger.warning("This fpdf2 version's TTFFont differs from the one font sharing was written for; "
+                       "fonts will be parsed once per document")
+        return False
+    return True
+
+
+class _MappedFile:
+    """Read-only file object over shared font bytes, with its own position.
+
+    fontTools reads tables lazily from it, so each document gets an
+    independent TTFont without copying or re-reading the font file.
+    """
+
+    def __init__(self, data, name: str):
+        self._data = memoryview(data)
+        self._position = 0
+        self.name = name
+
+    def read(self, size: int = -1) -> bytes:
+        end = len(self._data) if size is None or size < 0 else min(len(self._data), self._position + size)
+        chunk = self._data[self._position:end].tobytes()
+        self._position = end
+        return chunk
+
+    def seek(self, offset: int, whence: int = 0) -> int:
+        base = (0, self._position, len(self._data))[whence]
+        self._position = max(0, base + offset)
+        return self._position
+
+    def tell(self) -> int:
+        return self._position
+
+    def seekable(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        pass
+
+
+class FontFace:
+    """One TTF file, parsed once per process and attached to any number of documents."""
+
+    codepoints: FrozenSet[int] = frozenset()
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._template = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _load(self):
+        from fpdf import FPDF
+
+        with open(self.path, 'rb') as f:
+            try:
+                self._data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                # Filesystems without mmap support
+                self._data = f.read()
+        # fpdf2 parses the font (metrics, cmap, glyph ids) when it is added to a document
+        scratch = FPDF()
+        scratch.add_font("face", "", str(self.path))
+        self._template = scratch.fonts["face"]
+        self.codepoints = frozenset(self._template.cmap)
+
+    def template(self):
+        with self._lock:
+            if self._template is None:
+                self._load()
+        return self._template
+
+    def attach(self, pdf, family: str, style: str = "") -> None:
+        """Add this face to ``pdf`` as ``family``/``style`` without parsing the file again.
+
+        The parsed metrics are shared read-only; the glyph subset, the list of
+        missing glyphs and the fontTools object that gets subset on output are
+        per document. With an fpdf2 whose internals differ, the face is added
+        with ``pdf.add_font`` instead.
+        """
+        if not can_share_parsed_fonts():
+            pdf.add_font(family, style, str(self.path))
+            return
+
+        from fontTools import ttLib
+        from fpdf.fonts import SubsetMap, TTFFont
+
+        fontkey = f"{family.lower()}{style}"
+        template = self.template()
+        font = TTFFont.__new__(TTFFont)
+        for slot in TTFFont.__slots__:
+            if hasattr(template, slot):
+                setattr(font, slot, getattr(template, slot))
+        font.i = len(pdf.fonts) + 1
+        font.fontkey = fontkey
+        font.ttfont = ttLib.TTFont(_MappedFile(self._data, str(self.path)), recalcTimestamp=False, lazy=True)
+        font.missing_glyphs = []
+        font.biggest_size_pt = 0
+        font._hbfont = None
+        font.subset = SubsetMap(font)
+        pdf.fonts[fontkey] = font
+
+
+class FontRegistry:
+    """Process-wide set of bundled font faces, resolved and parsed on first use."""
+
+    def __init__(self, font_dir: Path = FONT_DIR):
+        self.font_dir = font_dir
+        self._faces: Dict[str, FontFace] = {}
+        self._family: Optional[Tuple[str, Dict[str, FontFace]]] = None
+        self._lock = threading.Lock()
+
+    def _face(self, file_name: str) -> FontFace:
+        if file_name not in self._faces:
+            self._faces[file_name] = FontFace(self.font_dir / file_name)
+        return self._faces[file_name]
+
+    def family(self) -> Optional[Tuple[str, Dict[str, FontFace]]]:
+        """The first bundled family with four valid faces, or None."""
+        with self._lock:
+            if self._family is None:
+                for name, files in FAMILIES.items():
+                    invalid = [f for f in files.values() if not verify_font_file(self.font_dir / f)]
+                    if invalid:
+                        logger.warning(f"Skipping font family {name}: invalid font files {', '.join(invalid)}")
+                        continue
+                    self._family = (name, {style: self._face(f) for style, f in files.items()})
+                    logger.debug(f"Using bundled font family {name}")
+                    break
+                else:
+                    self._family = ("", {})
+        return self._family if self._family[0] else None
+
+    def load(self) -> Optional[Dict[str, FontFace]]:
+        """Faces of the bundled family by style, parsed, or None to fall back to a core font."""
+        family = self.family()
+        if family is None:
+            return None
+        name, faces = family
+        try:
+            for face in faces.values():
+                face.template()
+            return faces
+        except Exception as e:
+            logger.error(f"Could not load font family {name}, falling back to a core font: {str(e)}")
+            with self._lock:
+                self._family = ("", {})
+            return None
+
+
+_registry = FontRegistry()
+
+
+def get_font_registry() -> FontRegistry:
+    return _registry
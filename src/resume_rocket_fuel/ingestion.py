@@ -0,0 +1,200 @@
+import json
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from resume_rocket_fuel.prompt_compaction import split_sections
+from resume_rocket_fuel.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Task whose output (a full restatement of the CV and job description) is now built locally
+UPLOAD_TASK = "upload_materials"
+
+# Headings of common CV templates. PDF extraction often runs them into the
+# surrounding text ("... Innovator DETAILS Riyadh ..."), so in a CV they are
+# also recognised mid-line when written in capitals.
+CV_HEADINGS = (
+    "EMPLOYMENT HISTORY", "WORK EXPERIENCE", "PROFESSIONAL EXPERIENCE", "WORK HISTORY", "EXPERIENCE",
+    "PROFESSIONAL SUMMARY", "SUMMARY", "PROFILE", "PERSONAL DETAILS", "DETAILS", "CONTACT", "LINKS",
+    "KEY SKILLS", "SKILLS", "EDUCATION", "CERTIFICATIONS", "COURSES", "LANGUAGES", "HOBBIES", "INTERESTS",
+    "PROJECTS", "AWARDS", "ACHIEVEMENTS", "PUBLICATIONS", "REFERENCES", "VOLUNTEERING",
+)
+_RUN_IN_HEADING = re.compile(r"(?<!\S)(" + "|".join(CV_HEADINGS) + r")(?!\S)")
+
+_MONTH = r"(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Sept|Oct|Nov|Dec)[a-z]*\.?"
+_DATE = rf"(?:{_MONTH}\s+)?(?:19|20)\d{{2}}"
+_DATE_RANGE = re.compile(rf"\b{_DATE}\s*(?:[—–-]|to)\s*(?:{_DATE}|Current|Present|Now|Today)\b", re.IGNORECASE)
+# "Label: text" bullets that extraction ran into the previous sentence
+_RUN_IN_BULLET = re.compile(r"(?<=[.!?])\s+(?=[A-Z][^.:\n]{2,80}:\s)")
+_SENTENCE_END = re.compile(r"[.!?]\s+|\n")
+
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"\+?\d[\d ()-]{7,}\d")
+_URL = re.compile(r"(?:https?://|www\.|linkedin\.com/|github\.com/)\S+", re.IGNORECASE)
+# Longer first lines are prose (e.g. "About the job Established in ..."), not a name or title
+MAX_TITLE_CHARS = 80
+
+
+@dataclass
+class IngestedEntry:
+    """One dated item of a section, e.g. a role with its dates and bullets."""
+    title: str
+    dates: str
+    bullets: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IngestedSection:
+    index: int
+    kind: str
+    heading: str
+    lines: List[str] = field(default_factory=list)
+    entries: List[IngestedEntry] = field(default_factory=list)
+
+
+@dataclass
+class IngestedDocument:
+    """A CV or job description split into indexed sections and dated entries."""
+    title: str
+    contact: Dict[str, List[str]]
+    sections: List[IngestedSection]
+    chars: int
+
+    def to_markdown(self, level: int = 1) -> str:
+        lines = [f"{'#' * level} {self.title}", ""] if self.title else []
+        for section in self.sections:
+            if section.heading:
+                lines += [f"{'#' * (level + 1)} {section.heading}", ""]
+            if section.lines:
+                lines += section.lines + [""]
+            for entry in section.entries:
+                lines.append(f"{'#' * (level + 2)} {entry.title}" if entry.title else "")
+                if entry.dates:
+                    lines.append(entry.dates)
+                lines += [f"- {bullet}" for bullet in entry.bullets] + [""]
+        return "\n".join(lines).strip()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+@dataclass
+class Materials:
+    company: str
+    cv: IngestedDocument
+    jd: IngestedDocument
+
+    def summary(self) -> str:
+        roles = sum(len(section.entries) for section in self.cv.sections)
+        return (f"CV: {len(self.cv.sections)} sections, {roles} dated entries, {self.cv.chars} characters; "
+                f"job description: {len(self.jd.sections)} sections, {self.jd.chars} characters")
+
+    def to_markdown(self) -> str:
+        """The upload_materials report: a receipt followed by both documents in full."""
+        return "\n\n".join([
+            "# Uploaded materials",
+            f"- Company: {self.company}\n- {self.summary()}",
+            "# Candidate CV",
+            self.cv.to_markdown(level=2) or "_No text could be extracted from the CV._",
+            "# Job Description",
+            self.jd.to_markdown(level=2) or "_No text could be extracted from the job description._",
+        ])
+
+    def write_json(self, path: Path) -> None:
+        data = {"company": self.company, "cv": self.cv.to_dict(), "jd": self.jd.to_dict()}
+        Path(path).write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+
+
+def split_run_in_headings(text: str) -> str:
+    """Put capitalised CV headings that extraction ran into other text on lines of their own."""
+    return _RUN_IN_HEADING.sub(lambda match: f"\n{match.group(1)}\n", text)
+
+
+def _contact(text: str) -> Dict[str, List[str]]:
+    found = {"email": _EMAIL.findall(text), "phone": _PHONE.findall(text), "links": _URL.findall(text)}
+    return {key: list(dict.fromkeys(value.strip() for value in values)) for key, values in found.items()}
+
+
+def _join_wrapped(lines: List[str]) -> List[str]:
+    """Rejoin lines that extraction broke mid-sentence."""
+    joined = []
+    for line in lines:
+        if joined and line[:1].islower() and not joined[-1].endswith((".", "!", "?", ":")):
+            joined[-1] = f"{joined[-1]} {line}"
+        else:
+            joined.append(line)
+    return joined
+
+
+def _entries(text: str) -> List[IngestedEntry]:
+    """Split section text into entries at date ranges; the title is the clause before the dates."""
+    matches = list(_DATE_RANGE.finditer(text))
+    starts = []
+    for index, match in enumerate(matches):
+        floor = matches[index - 1].end() if index else 0
+        starts.append(max((m.end() for m in _SENTENCE_END.finditer(text, floor, match.start())), default=floor))
+    entries = []
+    for index, match in enumerate(matches):
+        end = starts[index + 1] if index + 1 < len(matches) else len(text)
+        body = [line.strip() for line in text[match.end():end].split("\n") if line.strip()]
+        bullets = [part.strip() for line in _join_wrapped(body) for part in _RUN_IN_BULLET.split(line)]
+        entries.append(IngestedEntry(text[starts[index]:match.start()].strip(" ,-–—|\n"), match.group(0),
+                                     [bullet[2:] if bullet.startswith("- ") else bullet for bullet in bullets]))
+    return entries
+
+
+def parse_document(text: str, is_cv: bool = False) -> IngestedDocument:
+    """Parse normalized text (see prompt_compaction.normalize_text) into sections and entries.
+
+    Sections carrying date ranges, such as employment history, are split into
+    entries of title, dates and bullets; other sections keep their lines.
+    """
+    if is_cv:
+        text = split_run_in_headings(text)
+    title = ""
+    sections = []
+    for kind, heading, lines in split_sections(text):
+        body = _join_wrapped([line.strip() for line in (lines[1:] if heading else lines) if line.strip()])
+        if not sections and not title:
+            # A short first line is the candidate's name or the job title
+            if not heading and body and len(body[0]) <= MAX_TITLE_CHARS:
+                title, body = body[0], body[1:]
+            elif heading and kind == "other" and heading.upper() not in CV_HEADINGS:
+                title, heading = heading, ""
+        section = IngestedSection(len(sections), kind if heading else "intro", heading)
+        joined = "\n".join(body)
+        first = _DATE_RANGE.search(joined)
+        if first:
+            head = joined[:first.start()]
+            cut = max((m.end() for m in _SENTENCE_END.finditer(head)), default=0)
+            section.lines = [line for line in joined[:cut].split("\n") if line.strip()]
+            section.entries = _entries(joined[cut:])
+        else:
+            section.lines = body
+        if section.heading or section.lines or section.entries:
+            sections.append(section)
+    return IngestedDocument(title, _contact(text), sections, len(text))
+
+
+@dataclass
+class PreparedCV:
+    """A CV extracted and structured once, shared by the runs of a fan-out over many job descriptions."""
+    path: Path
+    text: str
+    document: IngestedDocument
+
+
+@traced("ingest_materials")
+def ingest_materials(cv_text: str, jd_text: str, company: str,
+                     cv_document: Optional[IngestedDocument] = None) -> Materials:
+    """Structure the normalized CV and job description without calling an LLM.
+
+    ``cv_document`` is the already parsed CV, e.g. from a PreparedCV.
+    """
+    cv = cv_document if cv_document is not None else parse_document(cv_text, is_cv=True)
+    materials = Materials(company, cv, parse_document(jd_text))
+    logger.info(f"📥 Ingested materials for {company}: {materials.summary()}")
+    return materials
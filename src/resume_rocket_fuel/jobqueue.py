@@ -0,0 +1,185 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+from pathlib import Path
+from typing import List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = Path("output") / "jobs.sqlite3"
+# A running job whose worker has not sent a heartbeat for this long is requeued
+STALE_AFTER_SECONDS = 120
+MAX_ATTEMPTS = 3
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    cv_path TEXT NOT NULL,
+    jd_path TEXT NOT NULL,
+    company TEXT NOT NULL,
+    output_format TEXT NOT NULL,
+    workspace TEXT NOT NULL,
+    progress TEXT,
+    events TEXT NOT NULL DEFAULT '[]',
+    error TEXT,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    worker TEXT,
+    created REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    heartbeat REAL
+);
+CREATE INDEX IF NOT EXISTS jobs_status_created ON jobs (status, created);
+"""
+
+
+def default_db_path() -> Path:
+    return Path(os.environ.get("RRF_JOB_DB") or DEFAULT_DB_PATH).absolute()
+
+
+class JobQueue:
+    """Durable FIFO queue of pipeline jobs stored in a local SQLite database.
+
+    The database is shared by the UI (which submits and polls jobs) and any
+    number of worker processes (which claim and run them). Every operation
+    uses its own short transaction, so processes can come and go freely.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path or default_db_path())
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        conn = sqlite3.connect(str(self.db_path), timeout=30, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            conn.close()
+
+    def submit(self, cv_path: Path, jd_path: Path, company: str, output_format: str, workspace: Path) -> str:
+        job_id = uuid.uuid4().hex[:12]
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, cv_path, jd_path, company, output_format, workspace, progress, created)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, str(cv_path), str(jd_path), company, output_format, str(workspace),
+                 "⏳ Waiting for a worker...", time.time()),
+            )
+        logger.info(f"Queued job {job_id} for {company}")
+        return job_id
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = dict(row)
+        job["events"] = json.loads(job["events"] or "[]")
+        return job
+
+    def position(self, job_id: str) -> int:
+        """Number of queued jobs ahead of this one."""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT COUNT(*) FROM jobs WHERE status = ? AND created < (SELECT created FROM jobs WHERE id = ?)",
+                (QUEUED, job_id),
+            ).fetchone()
+        return row[0]
+
+    def claim(self, worker: str) -> Optional[dict]:
+        """Atomically take the oldest queued job, or return None if there is none."""
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY created LIMIT 1", (QUEUED,)
+                ).fetchone()
+                if row is None:
+                    conn.execute("COMMIT")
+                    return None
+                now = time.time()
+                conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, started = ?, heartbeat = ?, attempts = attempts + 1"
+                    " WHERE id = ?",
+                    (RUNNING, worker, now, now, row["id"]),
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        return self.get(row["id"])
+
+    def update_progress(self, job_id: str, message: str, event: Optional[dict] = None) -> None:
+        with self._connect() as conn:
+            if event is not None:
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, heartbeat = ?, events = json_insert(events, '$[#]', json(?))"
+                    " WHERE id = ?",
+                    (message, time.time(), json.dumps(event), job_id),
+                )
+            else:
+                conn.execute(
+                    "UPDATE jobs SET progress = ?, heartbeat = ? WHERE id = ?", (message, time.time(), job_id)
+                )
+
+    def heartbeat(self, job_id: str) -> None:
+        with self._connect() as conn:
+            conn.execute("UPDATE jobs SET heartbeat = ? WHERE id = ?", (time.time(), job_id))
+
+    def finish(self, job_id: str, succeeded: bool, error: Optional[str] = None) -> None:
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished = ? WHERE id = ?",
+                (SUCCEEDED if succeeded else FAILED, error, time.time(), job_id),
+            )
+
+    def requeue_stale(self, stale_after: float = STALE_AFTER_SECONDS) -> int:
+        """Requeue running jobs whose worker died, failing those out of attempts."""
+        cutoff = time.time() - stale_after
+        with self._connect() as conn:
+            conn.execute("BEGIN IMMEDIATE")
+            failed = conn.execute(
+                "UPDATE jobs SET status = ?, error = 'Worker stopped responding', finished = ?"
+                " WHERE status = ? AND heartbeat < ? AND attempts >= ?",
+                (FAILED, time.time(), RUNNING, cutoff, MAX_ATTEMPTS),
+            ).rowcount
+            requeued = conn.execute(
+                "UPDATE jobs SET status = ?, worker = NULL, progress = '⏳ Retrying after a worker failure...'"
+                " WHERE status = ? AND heartbeat < ?",
+                (QUEUED, RUNNING, cutoff),
+            ).rowcount
+            conn.execute("COMMIT")
+        if failed or requeued:
+            logger.warning(f"Recovered stale jobs: {requeued} requeued, {failed} failed")
+        return requeued
+
+    def active_workspaces(self) -> Set[Path]:
+        """Workspaces of jobs that are queued or running, whose inputs must be kept."""
+        with self._connect() as conn:
+            rows = conn.execute("SELECT workspace FROM jobs WHERE status IN (?, ?)", (QUEUED, RUNNING)).fetchall()
+        return {Path(row["workspace"]).absolute() for row in rows}
+
+    def list_jobs(self, status: Optional[str] = None, limit: int = 50) -> List[dict]:
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created DESC LIMIT ?", (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute("SELECT * FROM jobs ORDER BY created DESC LIMIT ?", (limit,)).fetchall()
+        return [dict(row) for row in rows]
@@ -0,0 +1,128 @@
+import logging
+import threading
+from itertools import accumulate
+from typing import Callable, Dict, Hashable, List, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GREEDY = "greedy"
+OPTIMAL = "optimal"
+
+# Distinct tokens cached per font before that font's cache is reset
+MAX_TOKENS_PER_FONT = 50_000
+
+
+class FontMetricsCache:
+    """Token widths memoized per font, keyed by (family, style, size) and token.
+
+    ``measure`` is only called the first time a token is seen in a font, so
+    the expensive per-word metric lookups happen once per process rather than
+    once per line.
+    """
+
+    def __init__(self, max_tokens_per_font: int = MAX_TOKENS_PER_FONT):
+        self.max_tokens_per_font = max_tokens_per_font
+        self._fonts: Dict[Hashable, Dict[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def widths(self, font_key: Hashable, tokens: Sequence[str], measure: Callable[[str], float]) -> List[float]:
+        with self._lock:
+            cache = self._fonts.get(font_key)
+            if cache is None or len(cache) > self.max_tokens_per_font:
+                cache = self._fonts[font_key] = {}
+        result = []
+        for token in tokens:
+            width = cache.get(token)
+            if width is None:
+                width = cache[token] = measure(token)
+            result.append(width)
+        return result
+
+    def clear(self) -> None:
+        with self._lock:
+            self._fonts.clear()
+
+
+_default_cache = FontMetricsCache()
+
+
+def get_metrics_cache() -> FontMetricsCache:
+    return _default_cache
+
+
+def _line_width(prefix: List[float], start: int, stop: int, space_width: float) -> float:
+    """Width of words[start:stop] joined by single spaces, from prefix sums."""
+    return prefix[stop] - prefix[start] + (stop - start - 1) * space_width
+
+
+def break_greedy(widths: Sequence[float], space_width: float, max_width: float) -> List[Tuple[int, int]]:
+    """First-fit line breaking; returns (start, stop) word ranges, one per line.
+
+    A word wider than ``max_width`` gets a line of its own.
+    """
+    lines = []
+    start = 0
+    line_width = 0.0
+    for index, width in enumerate(widths):
+        if index == start:
+            line_width = width
+        elif line_width + space_width + width <= max_width:
+            line_width += space_width + width
+        else:
+            lines.append((start, index))
+            start = index
+            line_width = width
+    if start < len(widths):
+        lines.append((start, len(widths)))
+    return lines
+
+
+def break_optimal(widths: Sequence[float], space_width: float, max_width: float) -> List[Tuple[int, int]]:
+    """Minimum-raggedness line breaking (the Knuth-Plass total-fit idea, without
+    stretchable glue or hyphenation).
+
+    Minimizes the sum of squared trailing space over all lines but the last,
+    using prefix sums so every candidate line is measured in O(1).
+    """
+    count = len(widths)
+    if count == 0:
+        return []
+    prefix = [0.0, *accumulate(widths)]
+    # cost[i]: best total badness for words[i:], next_break[i]: end of its first line
+    cost = [0.0] * (count + 1)
+    next_break = [count] * (count + 1)
+    for start in range(count - 1, -1, -1):
+        best = None
+        for stop in range(start + 1, count + 1):
+            width = _line_width(prefix, start, stop, space_width)
+            if width > max_width and stop > start + 1:
+                break
+            if stop == count:
+                badness = 0.0
+            else:
+                slack = max_width - width
+                # An overlong single word is allowed but heavily penalized
+                badness = slack * slack if slack >= 0 else (max_width * 10) ** 2
+            total = badness + cost[stop]
+            if best is None or total < best:
+                best = total
+                next_break[start] = stop
+        cost[start] = best
+    lines = []
+    start = 0
+    while start < count:
+        lines.append((start, next_break[start]))
+        start = next_break[start]
+    return lines
+
+
+def break_words(words: Sequence[str], widths: Sequence[float], space_width: float, max_width: float,
+                mode: str = GREEDY) -> List[str]:
+    """Break ``words`` (with their measured ``widths``) into lines of text."""
+    if mode == OPTIMAL:
+        ranges = break_optimal(widths, space_width, max_width)
+    elif mode == GREEDY:
+        ranges = break_greedy(widths, space_width, max_width)
+    else:
+        raise ValueError(f"Unknown line breaking mode: {mode}")
+    return [" ".join(words[start:stop]) for start, stop in ranges]
@@ -0,0 +1,148 @@
+import logging
+import os
+import time
+from typing import Optional
+
+from crewai import LLM
+
+from resume_rocket_fuel.llm_cache import LLMCache, cache_key, get_default_cache
+from resume_rocket_fuel.rate_limit import DEFAULT_COMPLETION_TOKENS, get_rate_limiter
+from resume_rocket_fuel.scheduler import current_task
+from resume_rocket_fuel.streaming import current_stream, install_chunk_handler
+from resume_rocket_fuel.tracing import LLM_CALL, span, tracing_enabled
+
+logger = logging.getLogger(__name__)
+
+
+def default_model() -> str:
+    return os.environ.get("OPENAI_MODEL_NAME", "gpt-4o-mini")
+
+
+def count_tokens(model: str, messages=None, text: Optional[str] = None) -> int:
+    """Token count of a prompt or completion, estimated from its length if litellm can't tell."""
+    if isinstance(messages, str):
+        messages = [{"role": "user", "content": messages}]
+    try:
+        import litellm
+
+        return litellm.token_counter(model=model, messages=messages, text=text)
+    except Exception:
+        if messages is not None:
+            return sum(len(str(message.get("content", ""))) for message in messages) // 4
+        return len(text or "") // 4
+
+
+class CachingLLM(LLM):
+    """LLM that serves repeated calls from the on-disk response cache."""
+
+    def __init__(self, model: str, cache: Optional[LLMCache] = None, **kwargs):
+        if get_rate_limiter() is not None:
+            # The rate limiter retries with backoff shared across calls; the provider SDK must not retry as well
+            kwargs.setdefault("max_retries", 0)
+        super().__init__(model=model, **kwargs)
+        self.cache = cache
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        task_name = current_task.get()
+        stream = current_stream.get()
+        if stream is not None:
+            stream.restart()
+        with span("llm_call", LLM_CALL, model=self.model, task=task_name) as llm_span:
+            response, cached = self._call(task_name, messages, tools, *args, **kwargs)
+            if stream is not None and isinstance(response, str):
+                # Cached and non-streaming responses arrive whole
+                if cached or not self.stream:
+                    stream.feed(response)
+                stream.finish()
+            if tracing_enabled():
+                llm_span.set(cached=cached)
+                # Cached responses cost nothing, but are counted so runs stay comparable
+                llm_span.add_tokens(
+                    prompt=count_tokens(self.model, messages=messages),
+                    completion=count_tokens(self.model, text=response if isinstance(response, str) else ""),
+                )
+            return response
+
+    def _record_latency(self, task_name: Optional[str], duration_s: float, response) -> None:
+        """Feed the duration of a provider request to model routing (see routing.py)."""
+        router = _model_router()
+        if router is not None:
+            completion = count_tokens(self.model, text=response if isinstance(response, str) else "")
+            router.tracker.record(self.model, task_name, duration_s, completion)
+
+    def _request(self, task_name: Optional[str], messages, tools, *args, **kwargs):
+        """One request to the provider, timed on its own so rate limit waits and retries don't count as latency."""
+        start = time.perf_counter()
+        response = LLM.call(self, messages, tools, *args, **kwargs)
+        self._record_latency(task_name, time.perf_counter() - start, response)
+        return response
+
+    def _provider_call(self, task_name: Optional[str], messages, tools, *args, **kwargs):
+        """Call the provider within its rate limits (see rate_limit.py)."""
+        limiter = get_rate_limiter()
+        if limiter is None:
+            return self._request(task_name, messages, tools, *args, **kwargs)
+        stream = current_stream.get()
+        return limiter.call(
+            self.model,
+            lambda: self._request(task_name, messages, tools, *args, **kwargs),
+            prompt_tokens=count_tokens(self.model, messages=messages),
+            count_completion=lambda response: count_tokens(
+                self.model, text=response if isinstance(response, str) else ""),
+            completion_tokens=self.max_tokens or DEFAULT_COMPLETION_TOKENS,
+            # A retried stream starts its answer over
+            on_retry=stream.restart if stream is not None else None,
+        )
+
+    def _call(self, task_name: Optional[str], messages, tools, *args, **kwargs):
+        # Tool-using calls can have side effects, so always execute them
+        if self.cache is None or tools:
+            return self._provider_call(task_name, messages, tools, *args, **kwargs), False
+
+        key = cache_key(task_name, self.model, messages)
+        cached = self.cache.get(key)
+        if cached is not None:
+            logger.info(f"⚡ LLM cache hit for {task_name or 'unknown task'} ({self.model})")
+            return cached, True
+
+        response = self._provider_call(task_name, messages, tools, *args, **kwargs)
+        if isinstance(response, str) and response.strip():
+            self.cache.put(key, response, task=task_name, model=self.model)
+        return response, False
+
+
+def _model_router():
+    from resume_rocket_fuel.routing import get_model_router
+
+    return get_model_router()
+
+
+def build_model_llm(model: str, agent_config: dict) -> LLM:
+    """Create the LLM calling ``model`` for an agent from its agents.yaml entry."""
+    # Streamed tokens feed the live preview of tasks with stream_output (see streaming.py)
+    stream = bool(agent_config.get("stream"))
+    if stream:
+        install_chunk_handler()
+    # Deterministic offline stand-in for benchmarks and local runs (see fake_llm.py)
+    from resume_rocket_fuel.fake_llm import build_fake_llm, fake_llm_forced, is_fake_model
+
+    if is_fake_model(model) or fake_llm_forced():
+        return build_fake_llm(model, agent_config, stream=stream)
+    return CachingLLM(model=model, cache=get_default_cache(), stream=stream)
+
+
+def build_llm(agent_config: dict) -> LLM:
+    """Create the LLM for an agent from its agents.yaml entry, routing its tasks across model tiers if enabled."""
+    model = agent_config.get("model") or default_model()
+    from resume_rocket_fuel.fake_llm import fake_llm_forced, is_fake_model, isolate_shared_state
+
+    if is_fake_model(model) or fake_llm_forced():
+        # With routing, fake LLMs are only built on first call; isolate the shared state before the run uses it
+        isolate_shared_state()
+    router = _model_router()
+    if router is None:
+        return build_model_llm(model, agent_config)
+    from resume_rocket_fuel.routing import RoutingLLM
+
+    return RoutingLLM(model, router, lambda routed: build_model_llm(routed, router.model_config(routed, agent_config)),
+                      stream=bool(agent_config.get("stream")))
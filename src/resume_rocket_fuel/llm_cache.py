@@ -0,0 +1,178 @@
+import argparse
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached response, e.g. after a prompt format change
+CACHE_VERSION = 1
+
+DEFAULT_CACHE_DIR = Path.home() / ".cache" / "resume_rocket_fuel" / "llm"
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+def cache_key(task_name: Optional[str], model: str, messages: Any) -> str:
+    """Content hash of a single LLM call."""
+    payload = json.dumps(
+        {"version": CACHE_VERSION, "task": task_name, "model": model, "messages": messages},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class LLMCache:
+    """Content-addressed, size-bounded LRU cache of LLM responses on disk.
+
+    Each entry is a JSON file named after its key. Reads bump the file's mtime,
+    so eviction removes the least recently used entries first once the cache
+    grows beyond ``max_bytes``.
+    """
+
+    def __init__(self, cache_dir: Optional[Path] = None, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir or DEFAULT_CACHE_DIR)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = None  # key -> size in bytes, least recently used first
+        self._total_bytes = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _load_index(self) -> "OrderedDict[str, int]":
+        if self._index is None:
+            entries = []
+            if self.cache_dir.exists():
+                for path in self.cache_dir.glob("*/*.json"):
+                    try:
+                        stat = path.stat()
+                    except FileNotFoundError:
+                        continue
+                    entries.append((stat.st_mtime, path.stem, stat.st_size))
+            entries.sort()
+            self._index = OrderedDict((key, size) for _, key, size in entries)
+            self._total_bytes = sum(self._index.values())
+        return self._index
+
+    def get(self, key: str) -> Optional[str]:
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            os.utime(path)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logger.warning(f"Discarding unreadable cache entry {path}: {str(e)}")
+            self.delete(key)
+            return None
+        with self._lock:
+            index = self._load_index()
+            if key in index:
+                index.move_to_end(key)
+        return entry.get("response")
+
+    def put(self, key: str, response: str, **metadata) -> None:
+        path = self._path(key)
+        data = json.dumps(
+            {"response": response, "created": time.time(), **metadata}, ensure_ascii=False
+        ).encode("utf-8")
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp_name, path)
+        except Exception as e:
+            logger.warning(f"Failed to write cache entry {path}: {str(e)}")
+            return
+        with self._lock:
+            index = self._load_index()
+            self._total_bytes += len(data) - index.pop(key, 0)
+            index[key] = len(data)
+            self._evict()
+
+    def delete(self, key: str) -> None:
+        self._path(key).unlink(missing_ok=True)
+        with self._lock:
+            if self._index is not None and key in self._index:
+                self._total_bytes -= self._index.pop(key)
+
+    def _evict(self) -> None:
+        while self._total_bytes > self.max_bytes and self._index:
+            key, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            self._path(key).unlink(missing_ok=True)
+            logger.debug(f"Evicted LLM cache entry {key}")
+
+    def invalidate(self, task_name: Optional[str] = None) -> int:
+        """Remove all entries, or only those recorded for ``task_name``."""
+        removed = 0
+        if self.cache_dir.exists():
+            for path in self.cache_dir.glob("*/*.json"):
+                if task_name is not None:
+                    try:
+                        with open(path, "r", encoding="utf-8") as f:
+                            if json.load(f).get("task") != task_name:
+                                continue
+                    except Exception:
+                        pass
+                path.unlink(missing_ok=True)
+                removed += 1
+        with self._lock:
+            self._index = None
+        logger.info(f"Invalidated {removed} LLM cache entries")
+        return removed
+
+    def clear(self) -> int:
+        return self.invalidate()
+
+
+_default_cache = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> Optional[LLMCache]:
+    """Process-wide cache configured from the environment, or None when disabled.
+
+    RRF_LLM_CACHE=0 disables caching, RRF_LLM_CACHE_DIR sets the location and
+    RRF_LLM_CACHE_MAX_MB bounds its size.
+    """
+    global _default_cache
+    if os.environ.get("RRF_LLM_CACHE", "1").lower() in ("0", "false", "off"):
+        return None
+    with _default_cache_lock:
+        if _default_cache is None:
+            max_mb = float(os.environ.get("RRF_LLM_CACHE_MAX_MB", DEFAULT_MAX_BYTES / (1024 * 1024)))
+            _default_cache = LLMCache(
+                cache_dir=os.environ.get("RRF_LLM_CACHE_DIR") or None,
+                max_bytes=int(max_mb * 1024 * 1024),
+            )
+        return _default_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Manage the Resume Rocket Fuel LLM response cache")
+    parser.add_argument("--clear", action="store_true", help="Remove every cached response")
+    parser.add_argument("--task", help="Only remove responses recorded for this task")
+    args = parser.parse_args()
+
+    cache = get_default_cache() or LLMCache()
+    if args.clear or args.task:
+        cache.invalidate(args.task)
+    else:
+        index = cache._load_index()
+        print(f"{cache.cache_dir}: {len(index)} entries, {cache._total_bytes} bytes")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+import argparse
+import json
+import logging
+import sys
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+
+def run():
+    """Optimise a single CV for one job description from the command line."""
+    parser = argparse.ArgumentParser(prog="run_crew", description="Run the Resume Rocket Fuel crew once")
+    parser.add_argument("cv_pdf", type=Path, help="Candidate CV (PDF)")
+    parser.add_argument("jd_pdf", type=Path, help="Job description (PDF)")
+    parser.add_argument("company", help="Company name")
+    parser.add_argument("--format", default="PDF", choices=["PDF", "HTML"], type=str.upper)
+    args = parser.parse_args()
+
+    from resume_rocket_fuel.pipeline import pipeline_run
+
+    success = pipeline_run(args.cv_pdf, args.jd_pdf, args.company, args.format, status_callback=print)
+    sys.exit(0 if success else 1)
+
+
+def batch():
+    """Run a JSONL/CSV manifest of CV/JD jobs on a worker pool."""
+    parser = argparse.ArgumentParser(
+        prog="batch",
+        description="Run pipeline_run over a manifest of (cv_pdf, jd_pdf, company, format) jobs",
+    )
+    parser.add_argument("manifest", type=Path, help="JSONL or CSV manifest")
+    parser.add_argument("--out-dir", type=Path, default=Path("batch_output"),
+                        help="Directory for per-job outputs and results.jsonl")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--executor", choices=["process", "thread"], default="process")
+    parser.add_argument("--no-resume", action="store_true", help="Re-run jobs that already succeeded")
+    parser.add_argument("--limit", type=int, help="Only run the first N pending jobs")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from resume_rocket_fuel.batch import run_batch
+
+    results = run_batch(
+        args.manifest,
+        args.out_dir,
+        workers=args.workers,
+        executor=args.executor,
+        resume=not args.no_resume,
+        limit=args.limit,
+    )
+    sys.exit(0 if all(record["status"] == "succeeded" for record in results) else 1)
+
+
+def fanout():
+    """Tailor one CV to many job descriptions."""
+    parser = argparse.ArgumentParser(
+        prog="fanout",
+        description="Tailor one CV to several job descriptions, extracting the CV and researching each "
+                    "company only once",
+    )
+    parser.add_argument("cv_pdf", type=Path, help="Candidate CV (PDF)")
+    parser.add_argument("--job", nargs=2, action="append", default=[], metavar=("JD_PDF", "COMPANY"),
+                        help="A job description and its company; repeat for each role")
+    parser.add_argument("--manifest", type=Path, help="JSONL or CSV of (jd_pdf, company, format) rows")
+    parser.add_argument("--format", default="PDF", choices=["PDF", "HTML"], type=str.upper,
+                        help="Output format for --job entries")
+    parser.add_argument("--out-dir", type=Path, default=Path("fanout_output"),
+                        help="Directory for per-role outputs and results.jsonl")
+    parser.add_argument("--parallel", type=int, default=4, help="Roles tailored at the same time")
+    parser.add_argument("--resume", action="store_true", help="Continue failed roles from their checkpoints")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from resume_rocket_fuel.fanout import FanoutTarget, load_targets, run_fanout
+
+    targets = [FanoutTarget(str(Path(jd_pdf).resolve()), company, args.format) for jd_pdf, company in args.job]
+    if args.manifest:
+        targets += load_targets(args.manifest)
+    if not targets:
+        parser.error("Give at least one --job JD_PDF COMPANY or a --manifest")
+
+    results = run_fanout(args.cv_pdf, targets, args.out_dir, max_parallel=args.parallel, resume=args.resume,
+                         status_callback=print)
+    sys.exit(0 if all(record["status"] == "succeeded" for record in results) else 1)
+
+
+def replay():
+    """Resume an earlier run from its task checkpoints."""
+    parser = argparse.ArgumentParser(
+        prog="replay",
+        description="Re-run an earlier pipeline run in its workspace, restoring every task whose checkpoint "
+                    "still matches its inputs",
+    )
+    parser.add_argument("run", help="Run ID (under the workspace root) or workspace directory")
+    parser.add_argument("--from-task", help="Also re-run this task and every task downstream of it")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    from resume_rocket_fuel.workspace import Workspace, workspace_root
+
+    path = Path(args.run)
+    workspace = Workspace(path if path.is_dir() else workspace_root() / args.run)
+    if not workspace.run_manifest.exists():
+        parser.error(f"{workspace.path} has no {workspace.run_manifest.name}; it was not created by a pipeline run")
+    with open(workspace.run_manifest, "r", encoding="utf-8") as f:
+        manifest = json.load(f)
+
+    if args.from_task:
+        from resume_rocket_fuel.checkpoints import CheckpointStore
+        from resume_rocket_fuel.crew import CONFIG_DIR, load_yaml_config
+        from resume_rocket_fuel.scheduler import build_task_graph, downstream_tasks
+
+        graph = build_task_graph(load_yaml_config(CONFIG_DIR / "tasks.yaml"))
+        if args.from_task not in graph:
+            parser.error(f"Unknown task {args.from_task!r}; tasks are: {', '.join(graph)}")
+        rerun = downstream_tasks(graph, {args.from_task})
+        CheckpointStore(workspace.checkpoints).invalidate(rerun)
+        logger.info(f"Re-running {', '.join(sorted(rerun))}")
+
+    from resume_rocket_fuel.pipeline import pipeline_run
+
+    success = pipeline_run(
+        Path(manifest["cv_path"]), Path(manifest["jd_path"]), manifest["company"], manifest["output_format"],
+        status_callback=print, workspace=workspace, resume=True,
+    )
+    sys.exit(0 if success else 1)
+
+
+if __name__ == "__main__":
+    run()
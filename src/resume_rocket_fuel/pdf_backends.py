@@ -0,0 +1,167 @@
+import logging
+import os
+import shutil
+import threading
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+from resume_rocket_fuel.cv_document import CVDocument
+
+logger = logging.getLogger(__name__)
+
+WKHTMLTOPDF = "wkhtmltopdf"
+WEASYPRINT = "weasyprint"
+FPDF2 = "fpdf2"
+AUTO = "auto"
+
+# Order tried by "auto": in-process HTML rendering first, then the external
+# binary, then the built-in layout, which needs nothing beyond fpdf2
+AUTO_ORDER = (WEASYPRINT, WKHTMLTOPDF, FPDF2)
+
+# The HTML is static, so no JavaScript delay or debugging is needed
+WKHTMLTOPDF_OPTIONS = {
+    'page-size': 'A4',
+    'margin-top': '0.75in',
+    'margin-right': '0.75in',
+    'margin-bottom': '0.75in',
+    'margin-left': '0.75in',
+    'encoding': 'UTF-8',
+    'quiet': None,
+    'enable-local-file-access': None,
+    'disable-javascript': None,
+}
+
+
+class PdfBackendUnavailable(RuntimeError):
+    """Raised when a requested PDF backend is not installed."""
+
+
+def _render_wkhtmltopdf(document: CVDocument, html_path: Path, pdf_path: Path) -> None:
+    from resume_rocket_fuel.wkhtml_pool import get_wkhtmltopdf_pool
+
+    # Warm processes avoid a wkhtmltopdf start-up per document; pool size 0 falls back to pdfkit
+    pool = get_wkhtmltopdf_pool(WKHTMLTOPDF_OPTIONS)
+    if pool is not None:
+        pool.convert(html_path, pdf_path)
+        return
+    import pdfkit
+
+    pdfkit.from_file(str(html_path), str(pdf_path), options=WKHTMLTOPDF_OPTIONS)
+
+
+_weasyprint_lock = threading.Lock()
+_weasyprint_fonts = None
+
+
+def _render_weasyprint(document: CVDocument, html_path: Path, pdf_path: Path) -> None:
+    global _weasyprint_fonts
+    import weasyprint
+    from weasyprint.text.fonts import FontConfiguration
+
+    with _weasyprint_lock:
+        # Font discovery is the slow part of a first render; share it across documents
+        if _weasyprint_fonts is None:
+            _weasyprint_fonts = FontConfiguration()
+        fonts = _weasyprint_fonts
+    weasyprint.HTML(filename=str(html_path)).write_pdf(str(pdf_path), font_config=fonts)
+
+
+def _render_fpdf2(document: CVDocument, html_path: Path, pdf_path: Path) -> None:
+    from resume_rocket_fuel.pdf_export import write_pdf
+
+    write_pdf(document, pdf_path)
+
+
+BACKENDS: Dict[str, Callable[[CVDocument, Path, Path], None]] = {
+    WKHTMLTOPDF: _render_wkhtmltopdf,
+    WEASYPRINT: _render_weasyprint,
+    FPDF2: _render_fpdf2,
+}
+
+_availability: Dict[str, bool] = {}
+# Concurrent first checks could otherwise see a half-imported module that then fails to load
+_availability_lock = threading.Lock()
+
+
+def is_available(backend: str) -> bool:
+    """Whether a backend's dependencies are installed (checked once per process)."""
+    with _availability_lock:
+        return _check_available(backend)
+
+
+def _check_available(backend: str) -> bool:
+    if backend not in _availability:
+        try:
+            if backend == WKHTMLTOPDF:
+                import pdfkit  # noqa: F401
+                available = shutil.which("wkhtmltopdf") is not None
+            elif backend == WEASYPRINT:
+                # Also fails with OSError when the system Pango libraries are missing
+                import weasyprint  # noqa: F401
+                available = True
+            elif backend == FPDF2:
+                import fpdf  # noqa: F401
+                available = True
+            else:
+                raise ValueError(f"Unknown PDF backend {backend!r}; choose from {sorted(BACKENDS)} or {AUTO!r}")
+        except (ImportError, OSError) as e:
+            logger.debug(f"PDF backend {backend} unavailable: {str(e)}")
+            available = False
+        _availability[backend] = available
+    return _availability[backend]
+
+
+def available_backends() -> List[str]:
+    return [backend for backend in AUTO_ORDER if is_available(backend)]
+
+
+def resolve_backend(backend: Optional[str] = None) -> str:
+    """Pick the backend from the argument or $RRF_PDF_BACKEND, resolving "auto"."""
+    backend = (backend or os.environ.get("RRF_PDF_BACKEND") or AUTO).lower()
+    if backend == AUTO:
+        for candidate in AUTO_ORDER:
+            if is_available(candidate):
+                return candidate
+        raise PdfBackendUnavailable("No PDF backend available; install weasyprint, wkhtmltopdf or fpdf2")
+    if not is_available(backend):
+        raise PdfBackendUnavailable(f"PDF backend {backend!r} is not installed")
+    return backend
+
+
+def render_pdf(document: CVDocument, html_path: Path, pdf_path: Path, backend: Optional[str] = None) -> str:
+    """Render a CV to PDF with the chosen backend and return the backend's name.
+
+    The HTML backends convert ``html_path`` (rendered from ``document``); fpdf2
+    lays out ``document`` directly.
+    """
+    backend = resolve_backend(backend)
+    Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+    BACKENDS[backend](document, Path(html_path), Path(pdf_path))
+    return backend
+
+
+def render_pdfs(jobs: Sequence[Tuple[CVDocument, Path, Path]],
+                backend: Optional[str] = None) -> List[Tuple[Path, Optional[Exception]]]:
+    """Bulk export: render (document, html_path, pdf_path) jobs, returning (pdf_path, error or None).
+
+    With wkhtmltopdf the whole batch is queued on the warm pool at once, so
+    conversions run on all of its processes in parallel.
+    """
+    backend = resolve_backend(backend)
+    for _, _, pdf_path in jobs:
+        Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+    if backend == WKHTMLTOPDF:
+        from resume_rocket_fuel.wkhtml_pool import get_wkhtmltopdf_pool
+
+        pool = get_wkhtmltopdf_pool(WKHTMLTOPDF_OPTIONS)
+        if pool is not None:
+            return pool.convert_many([(html_path, pdf_path) for _, html_path, pdf_path in jobs])
+    results = []
+    for document, html_path, pdf_path in jobs:
+        try:
+            BACKENDS[backend](document, Path(html_path), Path(pdf_path))
+            results.append((Path(pdf_path), None))
+        except Exception as e:
+            logger.error(f"Failed to render {pdf_path}: {str(e)}")
+            results.append((Path(pdf_path), e))
+    return results
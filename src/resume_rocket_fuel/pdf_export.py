@@ -1,10 +1,16 @@
 from pathlib import Path
 import logging
 from fpdf import FPDF
-from fpdf.enums import XPos, YPos
+from fpdf.enums import TextEmphasis, XPos, YPos
 import textwrap
 import re
-import os
+import unicodedata
+
+from resume_rocket_fuel.cv_document import (
+    Bullet, CVDocument, Entry, Field, FieldRow, Paragraph, Run, inline_text, load_document,
+)
+from resume_rocket_fuel.font_registry import get_font_registry
+from resume_rocket_fuel.linebreak import GREEDY, break_words, get_metrics_cache
 
 # Enhanced Logging Setup
 logging.basicConfig(
@@ -13,171 +19,143 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-# Font configuration
-SCRIPT_DIR = Path(__file__).parent.absolute()
-FONT_DIR = SCRIPT_DIR / "fonts"
-FONT_PATH_REGULAR = FONT_DIR / "DejaVuSans.ttf"
-FONT_PATH_BOLD = FONT_DIR / "DejaVuSans-Bold.ttf"
-
-def verify_font_file(file_path):
-    """Verify that a font file is valid"""
-    try:
-        with open(file_path, 'rb') as f:
-            # Check for TrueType font signature
-            signature = f.read(4)
-            return signature in [b'\x00\x01\x00\x00', b'true', b'typ1', b'OTTO']
-    except Exception as e:
-        logger.error(f"Error verifying font file {file_path}: {e}")
-        return False
-
-def download_fonts():
-    """Download and verify DejaVu fonts"""
-    try:
-        # Create fonts directory if it doesn't exist
-        FONT_DIR.mkdir(parents=True, exist_ok=True)
-        logger.info(f"Font directory created/verified at {FONT_DIR}")
-
-        # Font URLs from a more reliable source
-        font_urls = {
-            FONT_PATH_REGULAR: "https://github.com/liberationfonts/liberation-fonts/raw/main/liberation-fonts-ttf-2.1.5/LiberationSans-Regular.ttf",
-            FONT_PATH_BOLD: "https://github.com/liberationfonts/liberation-fonts/raw/main/liberation-fonts-ttf-2.1.5/LiberationSans-Bold.ttf"
-        }
-
-        for font_path, url in font_urls.items():
-            try:
-                # Download to a temporary file first
-                import tempfile
-                with tempfile.NamedTemporaryFile(suffix='.ttf', delete=False) as temp_file:
-                    logger.info(f"Downloading font from {url}")
-                    import urllib.request
-                    urllib.request.urlretrieve(url, temp_file.name)
-                    
-                    # Verify the downloaded font
-                    if verify_font_file(temp_file.name):
-                        # If verification passes, move to final location
-                        import shutil
-                        shutil.move(temp_file.name, str(font_path))
-                        logger.info(f"Font downloaded and verified at {font_path}")
-                    else:
-                        logger.error(f"Downloaded font file is invalid: {font_path}")
-                        if temp_file.name:
-                            os.unlink(temp_file.name)
-                        return False
-            except Exception as e:
-                logger.error(f"Error downloading font {url}: {e}")
-                return False
-
-        # Final verification of all fonts
-        all_fonts_valid = all(verify_font_file(str(path)) for path in [FONT_PATH_REGULAR, FONT_PATH_BOLD])
-        if not all_fonts_valid:
-            logger.error("One or more font files failed verification")
-            return False
-
-        return True
-    except Exception as e:
-        logger.error(f"Error in font download process: {str(e)}")
-        return False
-
 def debug_text(text, context=""):
     """Helper function to debug text content"""
+    if not logger.isEnabledFor(logging.DEBUG):
+        return
     logger.debug(f"{context} Text length: {len(text)}")
-    logger.debug(f"{context} Text (raw): {repr(text)}")
-    logger.debug(f"{context} Text (normal): {text}")
-    # Print character codes for special characters
-    special_chars = [(i, char, ord(char)) for i, char in enumerate(text) if ord(char) > 127]
-    if special_chars:
-        logger.debug(f"{context} Special characters found:")
-        for pos, char, code in special_chars:
-            logger.debug(f"  Position {pos}: '{char}' (Unicode: {code})")
-
-def sanitize_text(text, context=""):
-    """Sanitize text by replacing special characters with ASCII equivalents"""
+    if not text.isascii():
+        # Print character codes for special characters
+        special_chars = ", ".join(f"{i}:{char!r} (U+{ord(char):04X})" for i, char in enumerate(text) if ord(char) > 127)
+        logger.debug(f"{context} Special characters found: {special_chars}")
+
+# ASCII equivalents for characters the fonts in use cannot render
+ASCII_REPLACEMENTS = {
+    '\u2019': "'",  # Right single quote
+    '\u2018': "'",  # Left single quote
+    '\u201d': '"',  # Right double quote
+    '\u201c': '"',  # Left double quote
+    '—': '-',  # Em dash
+    '–': '-',  # En dash
+    '…': '...',  # Ellipsis
+    '•': '*',  # Bullet point
+    '©': '(c)',  # Copyright
+    '®': '(R)',  # Registered trademark
+    '™': '(TM)',  # Trademark
+    '°': ' degrees',  # Degree symbol
+    '±': '+/-',  # Plus-minus
+    '×': 'x',  # Multiplication
+    '÷': '/',  # Division
+    '≤': '<=',  # Less than or equal
+    '≥': '>=',  # Greater than or equal
+    '≠': '!=',  # Not equal
+    '≈': '~',  # Approximately equal
+    '∞': 'infinity',  # Infinity
+    '∑': 'sum',  # Summation
+    '∏': 'product',  # Product
+    '∆': 'delta',  # Delta
+    '∂': 'd',  # Partial derivative
+    '√': 'sqrt',  # Square root
+    '∫': 'integral',  # Integral
+    '∴': 'therefore',  # Therefore
+    '∵': 'because',  # Because
+    '∼': '~',  # Tilde
+    '≅': '~=',  # Approximately equal
+    '≡': '===',  # Identity
+    '⊂': 'subset of',  # Subset
+    '⊃': 'superset of',  # Superset
+    '⊆': 'subset or equal',  # Subset or equal
+    '⊇': 'superset or equal',  # Superset or equal
+    '⊕': '(+)',  # Circled plus
+    '⊗': '(x)',  # Circled times
+    '⊥': '_|_',  # Perpendicular
+    '‖': '||',  # Parallel
+    '∠': 'angle',  # Angle
+    '∧': 'and',  # Logical and
+    '∨': 'or',  # Logical or
+    '¬': 'not',  # Logical not
+    '∃': 'exists',  # Exists
+    '∀': 'for all',  # For all
+    '∈': 'in',  # Element of
+    '∉': 'not in',  # Not element of
+    '∋': 'contains',  # Contains
+    '∌': 'does not contain',  # Does not contain
+    '∩': 'intersection',  # Intersection
+    '∪': 'union',  # Union
+    '∅': 'empty set',  # Empty set
+    '∇': 'nabla',  # Nabla
+    '∎': 'QED',  # End of proof
+}
+
+class _AsciiTable(dict):
+    """str.translate table for non-ASCII characters: known symbols map to their
+    expansions, anything else to its accent-stripped NFKD form (or '?'), memoized."""
+
+    def __missing__(self, code):
+        folded = unicodedata.normalize('NFKD', chr(code)).encode('ascii', 'ignore').decode('ascii')
+        self[code] = folded or '?'
+        return self[code]
+
+_ASCII_TABLE = _AsciiTable(str.maketrans(ASCII_REPLACEMENTS))
+_NON_ASCII_RUN = re.compile(r'[^\x00-\x7f]+')
+
+def _translate_run(match):
+    return match.group().translate(_ASCII_TABLE)
+
+def _fit_run(match, codepoints):
+    return "".join(c if ord(c) in codepoints else c.translate(_ASCII_TABLE) for c in match.group())
+
+def sanitize_text(text, context="", codepoints=None):
+    """Sanitize text by replacing special characters with ASCII equivalents.
+
+    One pass over the text: only runs of non-ASCII characters are translated,
+    through a precompiled table. Pure ASCII text is returned as is, so calling
+    this on already sanitized text is nearly free. Characters in ``codepoints``
+    (those the document's font has glyphs for) are kept.
+    """
     try:
-        # Replace common special characters with ASCII equivalents
-        replacements = {
-            ''': "'",  # Right single quote
-            ''': "'",  # Left single quote
-            '"': '"',  # Right double quote
-            '"': '"',  # Left double quote
-            '—': '-',  # Em dash
-            '–': '-',  # En dash
-            '…': '...',  # Ellipsis
-            '•': '*',  # Bullet point
-            '©': '(c)',  # Copyright
-            '®': '(R)',  # Registered trademark
-            '™': '(TM)',  # Trademark
-            '°': ' degrees',  # Degree symbol
-            '±': '+/-',  # Plus-minus
-            '×': 'x',  # Multiplication
-            '÷': '/',  # Division
-            '≤': '<=',  # Less than or equal
-            '≥': '>=',  # Greater than or equal
-            '≠': '!=',  # Not equal
-            '≈': '~',  # Approximately equal
-            '∞': 'infinity',  # Infinity
-            '∑': 'sum',  # Summation
-            '∏': 'product',  # Product
-            '∆': 'delta',  # Delta
-            '∂': 'd',  # Partial derivative
-            '√': 'sqrt',  # Square root
-            '∫': 'integral',  # Integral
-            '∴': 'therefore',  # Therefore
-            '∵': 'because',  # Because
-            '∼': '~',  # Tilde
-            '≅': '~=',  # Approximately equal
-            '≡': '===',  # Identity
-            '≤': '<=',  # Less than or equal
-            '≥': '>=',  # Greater than or equal
-            '⊂': 'subset of',  # Subset
-            '⊃': 'superset of',  # Superset
-            '⊆': 'subset or equal',  # Subset or equal
-            '⊇': 'superset or equal',  # Superset or equal
-            '⊕': '(+)',  # Circled plus
-            '⊗': '(x)',  # Circled times
-            '⊥': '_|_',  # Perpendicular
-            '‖': '||',  # Parallel
-            '∠': 'angle',  # Angle
-            '∧': 'and',  # Logical and
-            '∨': 'or',  # Logical or
-            '¬': 'not',  # Logical not
-            '∃': 'exists',  # Exists
-            '∀': 'for all',  # For all
-            '∈': 'in',  # Element of
-            '∉': 'not in',  # Not element of
-            '∋': 'contains',  # Contains
-            '∌': 'does not contain',  # Does not contain
-            '∩': 'intersection',  # Intersection
-            '∪': 'union',  # Union
-            '∅': 'empty set',  # Empty set
-            '∇': 'nabla',  # Nabla
-            '∎': 'QED',  # End of proof
-        }
-        
-        for old, new in replacements.items():
-            text = text.replace(old, new)
-            
-        # Log the sanitized text for debugging
-        logger.debug(f"Sanitizing text: {text}")
-        logger.debug(f"After sanitization: {text}")
-        
-        return text
+        if text.isascii():
+            return text
+        if codepoints is not None:
+            return _NON_ASCII_RUN.sub(lambda match: _fit_run(match, codepoints), text)
+        return _NON_ASCII_RUN.sub(_translate_run, text)
     except Exception as e:
         logger.error(f"Error sanitizing text: {e}")
         return text
 
 class SimplePDF(FPDF):
-    def __init__(self):
+    def __init__(self, line_breaking=GREEDY):
         logger.debug("Initializing SimplePDF")
         super().__init__(format='A4')
+        self.line_breaking = line_breaking
+        self.metrics = get_metrics_cache()
         self.set_margins(8, 15, 8)
         self.set_auto_page_break(auto=True, margin=15)
         self.font_size_normal = 9
         self.font_size_header = 10
         self.font_size_title = 14
         self.effective_width = self.w - 2 * self.l_margin
-        
-        # Initialize with Helvetica font
-        self.set_font('Helvetica', '', self.font_size_normal)
+
+        # Bundled Unicode fonts, parsed once per process; Helvetica (ASCII only) if they are missing
+        self._faces = get_font_registry().load()
+        self.codepoints = self._faces[''].codepoints if self._faces else None
+        self.base_font = 'cv' if self._faces else 'Helvetica'
+        self.bullet = "\u2022 " if self.codepoints and 0x2022 in self.codepoints else "- "
+        self.set_font(self.base_font, '', self.font_size_normal)
+
+    def set_font(self, family=None, style='', size=0):
+        # Faces are added on first use, so unused styles are not subset and embedded
+        faces = getattr(self, '_faces', None)
+        if faces and family == 'cv':
+            # fpdf2 passes a TextEmphasis when restoring the font on a new page
+            key = ''.join(sorted(c for c in TextEmphasis.coerce(style).style if c in 'BI'))
+            if f'cv{key}' not in self.fonts:
+                faces[key].attach(self, 'cv', key)
+        super().set_font(family, style, size)
+
+    def fit_text(self, text):
+        """Replace only the characters the current fonts have no glyph for."""
+        return sanitize_text(text, codepoints=self.codepoints)
 
     def write_text(self, text, context=""):
         """Write text with proper encoding and error handling"""
@@ -189,15 +167,11 @@ class SimplePDF(FPDF):
             # Ensure text is a string
             text = str(text)
             
-            # Sanitize the text
-            text = sanitize_text(text, context)
-            
-            # Encode as UTF-8 first, then decode as ASCII with replacement
-            encoded_text = text.encode('utf-8', 'replace')
-            ascii_text = encoded_text.decode('ascii', 'replace')
+            # Replace characters the font cannot render (a no-op for text that was already fitted)
+            text = self.fit_text(text)
             
             # Write the text
-            self.write(5, ascii_text)
+            self.write(5, text)
             
         except Exception as e:
             logger.error(f"Error in write_text: {e}")
@@ -210,30 +184,29 @@ class SimplePDF(FPDF):
                 logger.error(f"Error writing safe text: {e2}")
                 pass
 
+    def _font_key(self):
+        return (self.font_family, self.font_style, self.font_size_pt, self.font_stretching, self.char_spacing)
+
+    def _measure(self, token):
+        return self.get_string_width(token, normalized=True)
+
+    def _break_text(self, text, width):
+        """Split text into lines no wider than ``width`` using cached token widths."""
+        words = text.split()
+        widths = self.metrics.widths(self._font_key(), words + [' '], self._measure)
+        space_width = widths.pop()
+        return break_words(words, widths, space_width, width, mode=self.line_breaking)
+
     def calculate_line_breaks(self, text, width):
         """Calculate line breaks for text to fit within a given width"""
-        words = text.split()
-        lines = []
-        current_line = []
-        current_width = 0
-        
-        for word in words:
-            word_width = self.get_string_width(word)
-            if current_width + word_width <= width:
-                current_line.append(word)
-                current_width += word_width + self.get_string_width(' ')
-            else:
-                lines.append(' '.join(current_line))
-                current_line = [word]
-                current_width = word_width + self.get_string_width(' ')
-        
-        if current_line:
-            lines.append(' '.join(current_line))
-        
-        return lines
+        return self._break_text(text, width)
 
-    def write_wrapped_cell(self, text, width=None, height=5, align='L', indent=0):
-        """Write a cell with text wrapping and proper indentation"""
+    def write_wrapped_cell(self, text, width=None, height=5, align='L', indent=0, bold=False, no_split=False):
+        """Write a cell with text wrapping and proper indentation.
+
+        With ``no_split`` the text is written as a single cell and the cursor
+        stays on the same line, e.g. for labels followed by a value.
+        """
         try:
             if text is None:
                 logger.warning("Received None text in write_wrapped_cell")
@@ -247,31 +220,24 @@ class SimplePDF(FPDF):
             # Calculate available width
             available_width = width - indent
 
-            # Split text into lines that fit within available width
-            lines = []
-            words = text.split()
-            current_line = []
-            current_width = 0
-
-            for word in words:
-                word_width = self.get_string_width(word)
-                if current_width + word_width <= available_width:
-                    current_line.append(word)
-                    current_width += word_width + self.get_string_width(' ')
-                else:
-                    if current_line:
-                        lines.append(' '.join(current_line))
-                    current_line = [word]
-                    current_width = word_width + self.get_string_width(' ')
-
-            if current_line:
-                lines.append(' '.join(current_line))
-
-            # Write each line with proper indentation
-            for line in lines:
-                if indent > 0:
-                    self.cell(indent, height)
-                self.cell(available_width, height, line, ln=True, align=align)
+            previous_style = self.font_style
+            if bold:
+                self.set_font(self.font_family, 'B', self.font_size_pt)
+            try:
+                if no_split:
+                    if indent > 0:
+                        self.cell(indent, height)
+                    self.cell(available_width, height, text, align=align, new_x=XPos.RIGHT, new_y=YPos.TOP)
+                    return
+
+                # Write each line with proper indentation
+                for line in self._break_text(text, available_width):
+                    if indent > 0:
+                        self.cell(indent, height)
+                    self.cell(available_width, height, line, align=align, new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            finally:
+                if bold:
+                    self.set_font(self.font_family, previous_style, self.font_size_pt)
 
         except Exception as e:
             logger.error(f"Error in write_wrapped_cell: {e}")
@@ -284,10 +250,7 @@ class SimplePDF(FPDF):
             # Debug the text being processed
             debug_text(text, context)
             
-            # Sanitize the text
-            text = sanitize_text(text, context)
-            
-            # Write the text
+            # Write the text (write_text fits it to the font)
             self.write_text(text, context)
             
         except Exception as e:
@@ -306,31 +269,86 @@ class SimplePDF(FPDF):
     def write_header(self, text, level=1):
         """Special method to handle headers of different levels"""
         if level == 1:  # Main title
-            self.set_font('Helvetica', 'B', self.font_size_title)
-            self.cell(0, 10, self.safe_write(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
+            self.set_font(self.base_font, 'B', self.font_size_title)
+            self.cell(0, 10, self.fit_text(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT, align="C")
             self.ln(5)
         elif level == 2:  # Section headers
-            self.set_font('Helvetica', 'B', self.font_size_header)
-            self.cell(0, 8, self.safe_write(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
+            self.set_font(self.base_font, 'B', self.font_size_header)
+            self.cell(0, 8, self.fit_text(text), new_x=XPos.LMARGIN, new_y=YPos.NEXT)
             self.ln(2)
+        self.set_font(self.base_font, '', self.font_size_normal)
 
     def write_field(self, label, value):
         """Write a field with a label and value"""
-        self.set_font('Helvetica', 'B', self.font_size_normal)
-        self.cell(43.8003111111111, 6, self.safe_write(label), new_x=XPos.RIGHT, new_y=YPos.TOP)
+        self.set_font(self.base_font, 'B', self.font_size_normal)
+        self.cell(43.8003111111111, 6, self.fit_text(label), new_x=XPos.RIGHT, new_y=YPos.TOP)
         
-        self.set_font('Helvetica', '', self.font_size_normal)
-        self.write_wrapped_cell(150.2012444444444, 6, self.safe_write(value), align="L")
+        self.set_font(self.base_font, '', self.font_size_normal)
+        self.write_wrapped_cell(self.fit_text(value), width=150.2012444444444, height=6, align="L")
         self.ln()
 
-def process_bold_text(text):
-    """Process bold text with debugging"""
-    logger.debug(f"Processing bold text: {repr(text)}")
-    result = re.sub(r'\*\*(.*?)\*\*', r'\1', text)
-    logger.debug(f"After bold processing: {repr(result)}")
-    return result
-
-def convert_markdown_to_pdf(md_path: Path, pdf_path: Path) -> bool:
+def _write_runs(pdf, runs, height=6):
+    """Write inline runs as flowing text, switching to bold/italic where marked."""
+    for run in runs:
+        style = ('B' if run.bold else '') + ('I' if run.italic else '')
+        pdf.set_font(pdf.base_font, style, pdf.font_size_normal)
+        pdf.write(height, pdf.fit_text(run.text), link=run.href or '')
+    pdf.set_font(pdf.base_font, '', pdf.font_size_normal)
+
+def _write_field_row(pdf, items):
+    for index, item in enumerate(items):
+        if index > 0:
+            pdf.write(6, "  |  ")
+        if isinstance(item, Field):
+            _write_runs(pdf, (Run(f"{item.label}: ", bold=True),) + item.value)
+        else:
+            for line in item.lines:
+                _write_runs(pdf, line)
+    pdf.ln(6)
+
+def _write_blocks(pdf, blocks):
+    for block in blocks:
+        if isinstance(block, Bullet):
+            for index, line in enumerate(block.lines):
+                prefix = pdf.bullet if index == 0 else "  "
+                pdf.write_wrapped_cell(prefix + pdf.fit_text(inline_text(line)), width=pdf.effective_width, height=6, indent=5)
+            pdf.ln(1)
+        elif isinstance(block, Paragraph):
+            for line in block.lines:
+                pdf.write_wrapped_cell(pdf.fit_text(inline_text(line)), width=pdf.effective_width, height=6)
+            pdf.ln(2)
+        elif isinstance(block, Field):
+            _write_field_row(pdf, [block])
+        elif isinstance(block, FieldRow):
+            _write_field_row(pdf, block.items)
+        elif isinstance(block, Entry):
+            pdf.ln(1)
+            pdf.write_wrapped_cell(pdf.fit_text(inline_text(block.title)), width=pdf.effective_width, height=6, bold=True)
+            if block.dates:
+                pdf.set_font(pdf.base_font, 'I', pdf.font_size_normal)
+                pdf.write_wrapped_cell(pdf.fit_text(inline_text(block.dates)), width=pdf.effective_width, height=5)
+                pdf.set_font(pdf.base_font, '', pdf.font_size_normal)
+            _write_blocks(pdf, block.blocks)
+
+def render_pdf(document: CVDocument, pdf: SimplePDF) -> SimplePDF:
+    """Lay out a parsed CV on a SimplePDF."""
+    pdf.add_page()
+    if document.title:
+        pdf.write_header(inline_text(document.title), level=1)
+    _write_blocks(pdf, document.header)
+    for section in document.sections:
+        if section.title:
+            pdf.ln(2)
+            pdf.write_header(section.title, level=2)
+        _write_blocks(pdf, section.blocks)
+    return pdf
+
+def write_pdf(document: CVDocument, pdf_path: Path, line_breaking: str = GREEDY) -> None:
+    """Renderer entry point: write a parsed CV to ``pdf_path`` with fpdf2."""
+    pdf = render_pdf(document, SimplePDF(line_breaking=line_breaking))
+    pdf.output(str(pdf_path))
+
+def convert_markdown_to_pdf(md_path: Path, pdf_path: Path, line_breaking: str = GREEDY) -> bool:
     try:
         logger.info(f"🔧 Starting PDF conversion...")
         logger.info(f"📄 Markdown Input Path: {md_path.resolve()}")
@@ -340,114 +358,9 @@ def convert_markdown_to_pdf(md_path: Path, pdf_path: Path) -> bool:
             logger.error(f"❌ Markdown file not found at {md_path.resolve()}")
             return False
 
-        # Initialize PDF
-        pdf = SimplePDF()
-        
-        pdf.add_page()
-        logger.info("PDF initialized and page added")
-
-        with open(md_path, "r", encoding="utf-8") as file:
-            logger.debug("Reading markdown file...")
-            lines = file.readlines()
-            logger.info(f"Read {len(lines)} lines from markdown file")
-
-            in_education_section = False
-            for line_num, line in enumerate(lines, 1):
-                try:
-                    logger.debug(f"\nProcessing line {line_num}: {repr(line.strip())}")
-                    
-                    # Process and sanitize the line
-                    line = sanitize_text(process_bold_text(line.strip()))
-                    debug_text(line, f"Line {line_num} after processing")
-                    
-                    if not line:
-                        logger.debug("Empty line - adding spacing")
-                        pdf.ln(5)
-                        continue
-
-                    # Section detection
-                    if line.startswith("## Education"):
-                        logger.debug("Entering Education section")
-                        in_education_section = True
-                    elif line.startswith("## "):
-                        logger.debug("Exiting Education section")
-                        in_education_section = False
-
-                    # Process different line types
-                    try:
-                        if line.startswith("# "):
-                            logger.debug("Processing H1 header")
-                            pdf.write_header(line[2:], level=1)
-                        elif line.startswith("## "):
-                            logger.debug("Processing H2 header")
-                            pdf.write_header(line[3:], level=2)
-                        elif line.startswith("### "):
-                            logger.debug("Processing H3 header")
-                            pdf.write_header(line[4:], level=3)
-                        elif line.startswith("**") and in_education_section:
-                            logger.debug("Processing education entry")
-                            # Special handling for education entries
-                            parts = line.split(",", 1)  # Split at first comma
-                            if len(parts) == 2:
-                                degree = parts[0].strip("*").strip()
-                                institution_and_date = parts[1].strip()
-                                
-                                # Calculate widths
-                                pdf.set_font('Helvetica', 'B', pdf.font_size_normal)
-                                
-                                # Write degree (bold, no wrap)
-                                degree_width = pdf.get_string_width(degree + ", ")
-                                pdf.cell(degree_width, 6, degree + ",", new_x=XPos.RIGHT)
-                                
-                                # Write institution and date (normal, can wrap)
-                                pdf.set_font('Helvetica', '', pdf.font_size_normal)
-                                pdf.write_wrapped_cell(pdf.effective_width - degree_width, 6, institution_and_date)
-                            else:
-                                # Fallback for unexpected format
-                                pdf.write_wrapped_cell(pdf.effective_width, 6, line)
-                            pdf.ln(3)
-                        elif line.startswith("- "):
-                            logger.debug("Processing list item")
-                            # Handle bullet points with potential date separators
-                            content = line[2:]
-                            if " | " in content:
-                                # Split content by vertical bars and handle each part
-                                items = [item.strip() for item in content.split(" | ")]
-                                for i, item in enumerate(items):
-                                    if i > 0:
-                                        pdf.write_wrapped_cell(10, 6, "-", align="C", no_split=True)
-                                    # For contact info, don't split labels
-                                    if ":" in item and len(item.split(":")[0]) < 15:  # Assume it's a label if before : is short
-                                        label, value = item.split(":", 1)
-                                        pdf.write_wrapped_cell(pdf.get_string_width(label + ": "), 6, label + ":", bold=True, no_split=True)
-                                        pdf.write_wrapped_cell((pdf.effective_width - 10 * (len(items) - 1)) / len(items) - pdf.get_string_width(label + ": "), 6, value.strip())
-                                    else:
-                                        pdf.write_wrapped_cell((pdf.effective_width - 10 * (len(items) - 1)) / len(items), 6, item)
-                            else:
-                                # Regular bullet point
-                                pdf.write_wrapped_cell(pdf.effective_width, 6, "- " + content, indent=5)
-                            pdf.ln(2)
-                        else:
-                            logger.debug("Processing regular text or field")
-                            if ":" in line and len(line.split(":")[0]) < 15:
-                                key, value = line.split(":", 1)
-                                logger.debug(f"Processing field - Key: {repr(key)}, Value: {repr(value)}")
-                                pdf.write_field(key.strip(), value.strip())
-                            else:
-                                logger.debug("Processing regular text")
-                                pdf.write_wrapped_cell(pdf.effective_width, 6, line)
-                            pdf.ln(2)
-                    except Exception as e:
-                        logger.error(f"Error processing line {line_num}: {str(e)}")
-                        logger.error(f"Problematic line: {repr(line)}")
-                        raise
-
-                except Exception as e:
-                    logger.error(f"Error in line {line_num}: {str(e)}")
-                    logger.error(f"Skipping problematic line: {repr(line)}")
-                    continue
-
-        pdf.output(str(pdf_path))
+        document = load_document(md_path)
+        logger.info(f"Parsed {len(document.sections)} sections from markdown file")
+        write_pdf(document, pdf_path, line_breaking=line_breaking)
         logger.info(f"✅ PDF successfully created at {pdf_path}")
         return True
 
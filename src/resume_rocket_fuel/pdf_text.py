@@ -0,0 +1,119 @@
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Defaults sized generously for CVs and job descriptions
+DEFAULT_MAX_PAGES = int(os.environ.get("RRF_PDF_MAX_PAGES", 40))
+DEFAULT_MAX_FILE_BYTES = int(os.environ.get("RRF_PDF_MAX_FILE_MB", 20)) * 1024 * 1024
+DEFAULT_MAX_TEXT_CHARS = int(os.environ.get("RRF_PDF_MAX_TEXT_CHARS", 200_000))
+# Documents with at least this many pages are split across the process pool
+PARALLEL_PAGE_THRESHOLD = 12
+PAGES_PER_CHUNK = 4
+# Separates pages in extracted text, as pdftotext does, so headers and footers can be told apart from content
+PAGE_BREAK = "\f"
+
+
+class PdfTooLargeError(ValueError):
+    """Raised when a PDF exceeds the configured file size limit."""
+
+
+def _open_reader(pdf_path: Path):
+    import PyPDF2
+
+    return PyPDF2.PdfReader(str(pdf_path))
+
+
+def _check_file_size(pdf_path: Path, max_file_bytes: int) -> None:
+    size = Path(pdf_path).stat().st_size
+    if size > max_file_bytes:
+        raise PdfTooLargeError(f"{pdf_path} is {size} bytes, above the {max_file_bytes} byte limit")
+
+
+def iter_pdf_pages(pdf_path: Path, max_pages: int = DEFAULT_MAX_PAGES,
+                   max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                   max_text_chars: int = DEFAULT_MAX_TEXT_CHARS) -> Iterator[str]:
+    """Yield the text of each page lazily, stopping at the page and text limits."""
+    _check_file_size(pdf_path, max_file_bytes)
+    yield from _iter_reader_pages(_open_reader(pdf_path), pdf_path, max_pages, max_text_chars)
+
+
+def _iter_reader_pages(reader, pdf_path: Path, max_pages: int, max_text_chars: int) -> Iterator[str]:
+    total_chars = 0
+    for index, page in enumerate(reader.pages):
+        if index >= max_pages:
+            logger.warning(f"Stopped reading {pdf_path} after {max_pages} pages")
+            return
+        text = page.extract_text() or ""
+        if total_chars + len(text) > max_text_chars:
+            logger.warning(f"Truncated {pdf_path} at {max_text_chars} characters of text")
+            yield text[:max_text_chars - total_chars]
+            return
+        total_chars += len(text)
+        yield text
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Process pool worker: extract pages [start, stop) of a PDF."""
+    reader = _open_reader(Path(pdf_path))
+    return [(reader.pages[index].extract_text() or "") for index in range(start, stop)]
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            workers = int(os.environ.get("RRF_PDF_WORKERS", min(4, os.cpu_count() or 1)))
+            # Callers are multithreaded (worker heartbeats, prewarming, Streamlit sessions), and a forked
+            # child can inherit a lock another thread held, e.g. a logging handler's, and deadlock on it
+            method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+            _pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context(method))
+        return _pool
+
+
+def _page_chunks(page_count: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + PAGES_PER_CHUNK, page_count)) for start in range(0, page_count, PAGES_PER_CHUNK)]
+
+
+def extract_pdf_text(pdf_path: Path, max_pages: int = DEFAULT_MAX_PAGES,
+                     max_file_bytes: int = DEFAULT_MAX_FILE_BYTES,
+                     max_text_chars: int = DEFAULT_MAX_TEXT_CHARS,
+                     parallel: Optional[bool] = None) -> str:
+    """Extract the text of a PDF, pages separated by PAGE_BREAK, within the limits.
+
+    Small documents are read page by page in this process. Documents with at
+    least PARALLEL_PAGE_THRESHOLD pages (or when ``parallel`` is True) are split
+    into page ranges that are extracted concurrently in a process pool.
+    """
+    _check_file_size(pdf_path, max_file_bytes)
+    reader = _open_reader(pdf_path)
+    page_count = min(len(reader.pages), max_pages)
+    if parallel is None:
+        parallel = page_count >= PARALLEL_PAGE_THRESHOLD
+    if not parallel:
+        return PAGE_BREAK.join(_iter_reader_pages(reader, pdf_path, max_pages, max_text_chars))
+
+    pool = _get_pool()
+    futures = [pool.submit(_extract_page_range, str(pdf_path), start, stop) for start, stop in _page_chunks(page_count)]
+    pages = []
+    total_chars = 0
+    for future in futures:
+        for text in future.result():
+            if total_chars + len(text) > max_text_chars:
+                logger.warning(f"Truncated {pdf_path} at {max_text_chars} characters of text")
+                pages.append(text[:max_text_chars - total_chars])
+                for pending in futures:
+                    pending.cancel()
+                return PAGE_BREAK.join(pages)
+            total_chars += len(text)
+            pages.append(text)
+    return PAGE_BREAK.join(pages)
@@ -1,14 +1,27 @@
-import streamlit as st
+import json
 import logging
+import threading
 import traceback
 from pathlib import Path
-import PyPDF2
+from typing import Optional
 import time
-import markdown  # Added for HTML conversion
-import pdfkit  # Added for HTML to PDF conversion
 
-from resume_rocket_fuel.crew import ResumeRocketFuel
-from resume_rocket_fuel.pdf_export import convert_markdown_to_pdf
+# crewAI, pdfkit and streamlit are imported where they are used so
+# that importing this module (and the UI that submits to it) stays fast
+from resume_rocket_fuel.checkpoints import CheckpointStore, RestoredOutput
+from resume_rocket_fuel.company_store import get_company_store
+from resume_rocket_fuel.cv_document import CVDocument, load_document, write_html
+from resume_rocket_fuel.events import (
+    RUN_FAILED, RUN_FINISHED, RUN_STARTED, TASK_OUTPUT, EventBus, ProgressEvent, describe_event, log_event,
+)
+from resume_rocket_fuel.ingestion import UPLOAD_TASK, PreparedCV, ingest_materials, parse_document
+from resume_rocket_fuel.pdf_backends import render_pdf, resolve_backend
+from resume_rocket_fuel.pdf_text import PdfTooLargeError, extract_pdf_text
+from resume_rocket_fuel.prompt_compaction import PromptCompactor, normalize_text
+from resume_rocket_fuel.scheduler import run_task_graph
+from resume_rocket_fuel.streaming import SectionPreview
+from resume_rocket_fuel.tracing import RUN, current_span, span, traced, write_metrics
+from resume_rocket_fuel.workspace import Workspace, create_workspace
 
 # Logging Setup
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -24,42 +37,55 @@ def save_uploaded_file(uploaded_file, output_path):
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
+@traced("extract_pdf")
 def extract_text_from_pdf(pdf_path: Path) -> str:
-    text = ""
     try:
-        with open(pdf_path, 'rb') as f:
-            pdf_reader = PyPDF2.PdfReader(f)
-            for page in pdf_reader.pages:
-                text += page.extract_text() or ""
+        return extract_pdf_text(pdf_path)
+    except PdfTooLargeError:
+        raise
     except Exception as e:
         logger.error(f"Failed to read PDF at {pdf_path}: {str(e)}")
-    return text
-
-def simulate_agent_progress(status_callback):
-    agent_steps = [
-        "👀 Agent 1 analyzing your CV...",
-        "🧠 Agent 2 researching company details...",
-        "✍️ Agent 3 crafting personalized improvements...",
-        "🤖 QA Agent preparing the final version..."
-    ]
-    for step in agent_steps:
-        status_callback(step)
-        time.sleep(2)
+        return ""
 
-def generate_html_from_md(md_path: Path, html_path: Path) -> bool:
+def _warm_imports():
+    try:
+        start = time.perf_counter()
+        from resume_rocket_fuel.crew import get_crew_template
+        get_crew_template()
+        # Resolving the PDF backend imports it, so the first render does not pay for that
+        resolve_backend()
+        logger.info(f"Pipeline dependencies warmed up in {time.perf_counter() - start:.1f}s")
+    except Exception as e:
+        logger.warning(f"Warming up pipeline dependencies failed: {str(e)}")
+
+def prewarm_in_background() -> threading.Thread:
+    """Import the agent stack and build the crew template off the calling thread."""
+    thread = threading.Thread(target=_warm_imports, name="pipeline-prewarm", daemon=True)
+    thread.start()
+    return thread
+
+@traced("render_html")
+def render_html_file(document: CVDocument, html_path: Path) -> bool:
     try:
-        with open(md_path, "r", encoding="utf-8") as f_in:
-            md_content = f_in.read()
-        html_content = markdown.markdown(md_content)
-        with open(html_path, "w", encoding="utf-8") as f_out:
-            f_out.write(html_content)
+        write_html(document, html_path)
         logger.info(f"✅ HTML successfully created at {html_path}")
         return True
     except Exception as e:
         logger.error(f"❌ HTML conversion failed: {str(e)}")
         return False
 
-def convert_html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
+def generate_html_from_md(md_path: Path, html_path: Path) -> bool:
+    try:
+        document = load_document(md_path)
+    except Exception as e:
+        logger.error(f"❌ Could not parse {md_path}: {str(e)}")
+        return False
+    return render_html_file(document, html_path)
+
+@traced("render_pdf")
+def convert_html_to_pdf(html_path: Path, pdf_path: Path, document: Optional[CVDocument] = None,
+                        backend: Optional[str] = None) -> bool:
+    """Render the CV to PDF with the configured backend (see pdf_backends)."""
     try:
         logger.info("=== Starting PDF Conversion Process ===")
         logger.info(f"Current working directory: {Path.cwd()}")
@@ -87,23 +113,6 @@ def convert_html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
             logger.error(f"❌ Error reading HTML file: {str(e)}")
             return False
         
-        # Configure pdfkit options
-        options = {
-            'page-size': 'A4',
-            'margin-top': '0.75in',
-            'margin-right': '0.75in',
-            'margin-bottom': '0.75in',
-            'margin-left': '0.75in',
-            'encoding': 'UTF-8',
-            'quiet': None,
-            'enable-local-file-access': None,  # Allow access to local files
-            'debug-javascript': None,  # Enable JavaScript debugging
-            'javascript-delay': '1000',  # Wait for JavaScript to execute
-            'no-stop-slow-scripts': None  # Don't stop on slow scripts
-        }
-        
-        logger.info(f"PDF conversion options: {options}")
-        
         # Ensure output directory exists
         try:
             pdf_path.parent.mkdir(parents=True, exist_ok=True)
@@ -113,9 +122,10 @@ def convert_html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
             return False
         
         # Convert HTML to PDF
-        logger.info("Starting PDF conversion with pdfkit...")
         try:
-            pdfkit.from_file(str(html_path), str(pdf_path), options=options)
+            backend = resolve_backend(backend)
+            logger.info(f"Starting PDF conversion with {backend}...")
+            render_pdf(document, html_path, pdf_path, backend=backend)
             logger.info("✅ PDF conversion completed")
         except Exception as e:
             logger.error(f"❌ Error during PDF conversion: {str(e)}")
@@ -142,26 +152,95 @@ def convert_html_to_pdf(html_path: Path, pdf_path: Path) -> bool:
         logger.error(f"Traceback: {traceback.format_exc()}")
         return False
 
-def pipeline_run(cv_path: Path, jd_path: Path, company_name: str, output_format: str, status_callback=None) -> bool:
+COMPANY_PROFILE_TASK = "generate_company_profile_report"
+
+def prepare_cv(cv_path: Path) -> PreparedCV:
+    """Extract and structure a CV once, for runs against many job descriptions (see fanout.py)."""
+    text = extract_text_from_pdf(cv_path)
+    return PreparedCV(Path(cv_path), text, parse_document(normalize_text(text), is_cv=True))
+
+def research_company_profile(company_name: str, jd_content: str) -> str:
+    """Run only the research_analyst task and return the company profile report."""
+    from resume_rocket_fuel.crew import get_crew_template
+    template = get_crew_template()
+    crew = template.new_crew()
+    task_variables = {
+        "OUTPUT_DIR": "",
+        "CANDIDATE_CV": "",
+        "JOB_DESCRIPTION": jd_content,
+        "COMPANY_NAME": company_name,
+        "COMPANY_PROFILE_REPORT": "",
+        "CV_ANALYSIS_REPORT": "",
+        "UPDATED_CV_ANALYSIS_REPORT": "",
+        "FINAL_CV_MARKDOWN": ""
+    }
+    compactor = PromptCompactor(template.tasks_config, task_variables)
+    # Refreshes are not tied to a run, so they only update the store
+    outputs = run_task_graph(crew, compactor.inputs(), template.tasks_config,
+                             only={COMPANY_PROFILE_TASK}, write_outputs=False, input_filter=compactor)
+    return outputs[COMPANY_PROFILE_TASK].raw
+
+def pipeline_run(cv_path: Path, jd_path: Path, company_name: str, output_format: str, status_callback=None,
+                 workspace: Optional[Workspace] = None, events: Optional[EventBus] = None,
+                 resume: bool = False, cv: Optional[PreparedCV] = None,
+                 company_profile: Optional[str] = None) -> bool:
+    """Run the crew and render the final CV into ``workspace`` (a new one if omitted).
+
+    Progress is published to ``events``; ``status_callback`` receives a one-line
+    description of every event. With RRF_TRACE_DIR set, the run is traced as a
+    tree of spans and the process's metrics file is refreshed afterwards.
+    Every task's output is checkpointed in the workspace; with ``resume`` set,
+    tasks whose checkpoint still matches their inputs are restored instead of
+    run, so a retry after a failure starts at the first task that failed.
+    A ``cv`` from prepare_cv replaces extracting ``cv_path`` again, and a
+    ``company_profile`` report replaces researching the company.
+    """
+    with span("pipeline_run", RUN, company=company_name, output_format=output_format, resume=resume):
+        try:
+            return _pipeline_run(cv_path, jd_path, company_name, output_format, status_callback, workspace, events,
+                                 resume, cv, company_profile)
+        finally:
+            write_metrics()
+
+def _pipeline_run(cv_path: Path, jd_path: Path, company_name: str, output_format: str, status_callback,
+                  workspace: Optional[Workspace], events: Optional[EventBus], resume: bool = False,
+                  cv: Optional[PreparedCV] = None, company_profile: Optional[str] = None) -> bool:
+    events = events or EventBus()
+    unsubscribers = [events.subscribe(log_event)]
+    if status_callback:
+        unsubscribers.append(events.subscribe(lambda event: status_callback(describe_event(event))))
+    run_start = time.perf_counter()
     try:
         logger.info("=== Starting Pipeline Run ===")
-        logger.info(f"Current working directory: {Path.cwd()}")
+        workspace = (workspace or create_workspace()).create()
+        logger.info(f"Workspace: {workspace.path}")
+        current_span().set(run_id=workspace.run_id)
         logger.info(f"CV path: {cv_path}")
         logger.info(f"JD path: {jd_path}")
         logger.info(f"Company name: {company_name}")
         logger.info(f"Output format: {output_format}")
+        workspace.run_manifest.write_text(json.dumps({
+            "cv_path": str(Path(cv_path).absolute()),
+            "jd_path": str(Path(jd_path).absolute()),
+            "company": company_name,
+            "output_format": output_format,
+        }, indent=2), encoding="utf-8")
+        checkpoints = CheckpointStore(workspace.checkpoints, restore=resume)
+        if resume:
+            logger.info(f"Resuming with checkpoints of: {', '.join(sorted(checkpoints.tasks())) or 'no tasks'}")
         
-        rocket_fuel = ResumeRocketFuel()
-        crew = rocket_fuel.crew()
+        # Agents and tasks are built once per process and cloned for each run
+        from resume_rocket_fuel.crew import get_crew_template
+        template = get_crew_template()
+        crew = template.new_crew()
 
-        cv_content = extract_text_from_pdf(cv_path)
+        cv_content = cv.text if cv is not None else extract_text_from_pdf(cv_path)
         jd_content = extract_text_from_pdf(jd_path)
 
-        if status_callback:
-            status_callback("🚀 Starting CV optimization process...")
-            simulate_agent_progress(status_callback)
+        events.publish(ProgressEvent(RUN_STARTED, message="🚀 Starting CV optimization process..."))
 
         task_variables = {
+            "OUTPUT_DIR": str(workspace.path),
             "CANDIDATE_CV": cv_content,
             "JOB_DESCRIPTION": jd_content,
             "COMPANY_NAME": company_name,
@@ -170,86 +249,109 @@ def pipeline_run(cv_path: Path, jd_path: Path, company_name: str, output_format:
             "UPDATED_CV_ANALYSIS_REPORT": "",
             "FINAL_CV_MARKDOWN": ""
         }
-
-        result = crew.kickoff(inputs=task_variables)
-
-        # Use absolute paths for output files
-        output_dir = Path.cwd() / "output"
-        output_dir.mkdir(parents=True, exist_ok=True)
-        
-        final_md_path = output_dir / "final_cv.md"
-        final_pdf_path = output_dir / "final_cv.pdf"
-        final_html_path = output_dir / "final_polished_cv.html"
+        # Normalize the extracted documents once; each task then gets only the sections it needs
+        compactor = PromptCompactor(template.tasks_config, task_variables)
+        task_variables = compactor.inputs()
+
+        # The CV and job description are structured locally rather than restated by an LLM;
+        # downstream prompts receive the sectioned Markdown and upload_materials is skipped
+        materials = ingest_materials(task_variables["CANDIDATE_CV"], task_variables["JOB_DESCRIPTION"], company_name,
+                                     cv_document=cv.document if cv is not None else None)
+        materials.write_json(workspace.materials_json)
+        task_variables["CANDIDATE_CV"] = materials.cv.to_markdown()
+        task_variables["JOB_DESCRIPTION"] = materials.jd.to_markdown()
+        completed = {UPLOAD_TASK: materials.to_markdown()}
+
+        # Reuse a fresh company profile from the shared store instead of re-researching it
+        company_store = get_company_store()
+        if company_profile:
+            completed[COMPANY_PROFILE_TASK] = company_profile
+        elif company_store:
+            profile = company_store.get(company_name)
+            if profile:
+                logger.info(f"Using stored company profile for {company_name} (age: {profile.age / 3600:.1f}h)")
+                completed[COMPANY_PROFILE_TASK] = profile.report
+                if profile.needs_refresh:
+                    company_store.refresh_in_background(
+                        company_name, lambda: research_company_profile(company_name, task_variables["JOB_DESCRIPTION"])
+                    )
+
+        # Tasks run as soon as their inputs are ready, independent ones concurrently
+        # Sections of the CV are rendered to workspace.preview_html as the editor and QA agents write them
+        result = run_task_graph(crew, task_variables, template.tasks_config, completed=completed, events=events,
+                                input_filter=compactor, stream_listener=SectionPreview(workspace.preview_html),
+                                checkpoints=checkpoints)
+        compactor.log_report()
+        compactor.write_report(workspace.compaction_report)
+
+        # Only freshly researched profiles are stored; a restored checkpoint may be older than its TTL allows
+        profile_output = result.get(COMPANY_PROFILE_TASK)
+        if company_store and profile_output is not None and not isinstance(profile_output, RestoredOutput):
+            company_store.put(company_name, profile_output.raw)
+
+        output_dir = workspace.path
+        final_md_path = workspace.final_md
+        polished_md_path = workspace.polished_md
+        final_pdf_path = workspace.final_pdf
+        final_html_path = workspace.final_html
 
         logger.info("=== Checking Output Files ===")
-        logger.info(f"Output directory: {output_dir.absolute()}")
-        logger.info(f"Markdown file exists: {final_md_path.exists()}")
-        if final_md_path.exists():
-            logger.info(f"Markdown file size: {final_md_path.stat().st_size} bytes")
-            
-        logger.info(f"HTML file exists: {final_html_path.exists()}")
-        if final_html_path.exists():
-            logger.info(f"HTML file size: {final_html_path.stat().st_size} bytes")
-            
-        logger.info(f"PDF file exists: {final_pdf_path.exists()}")
-        if final_pdf_path.exists():
-            logger.info(f"PDF file size: {final_pdf_path.stat().st_size} bytes")
-
-        if final_md_path.exists() and final_md_path.stat().st_size > 0:
+        logger.info(f"Output directory: {output_dir}")
+        # Prefer the QA-reviewed Markdown, falling back to the merged CV
+        source_md_path = next(
+            (path for path in (polished_md_path, final_md_path) if path.exists() and path.stat().st_size > 0), None
+        )
+        for path in (polished_md_path, final_md_path):
+            logger.info(f"{path.name} exists: {path.exists()}")
+            if path.exists():
+                logger.info(f"{path.name} size: {path.stat().st_size} bytes")
+
+        if source_md_path is not None:
             logger.info("=== Starting Output Generation ===")
             logger.info(f"Output format requested: {output_format}")
-            
+
+            # Parse once; every output format is rendered from the same document
+            document = load_document(source_md_path)
+            logger.info(f"Parsed {source_md_path.name} into {len(document.sections)} sections")
+            if not render_html_file(document, final_html_path):
+                return False
+
             if output_format.upper() == "PDF":
-                logger.info("PDF output requested, checking prerequisites...")
-                # First ensure we have the HTML version
-                if not final_html_path.exists():
-                    logger.warning("⚠️ HTML file not found. Converting from markdown...")
-                    html_success = generate_html_from_md(final_md_path, final_html_path)
-                    if not html_success:
-                        logger.warning("⚠️ HTML conversion failed.")
-                        return False
-                    logger.info("✅ HTML file created successfully")
-                
-                # Then convert HTML to PDF
-                if final_html_path.exists():
-                    logger.info("Starting PDF conversion process...")
-                    logger.info(f"HTML file path: {final_html_path}")
-                    logger.info(f"PDF file path: {final_pdf_path}")
-                    try:
-                        pdf_success = convert_html_to_pdf(final_html_path, final_pdf_path)
-                        if not pdf_success:
-                            logger.error("❌ PDF conversion failed")
-                            return False
-                        logger.info("✅ PDF conversion completed successfully")
-                    except Exception as e:
-                        logger.error(f"❌ Error during PDF conversion: {str(e)}")
-                        logger.error(f"Traceback: {traceback.format_exc()}")
+                logger.info("Starting PDF conversion process...")
+                logger.info(f"HTML file path: {final_html_path}")
+                logger.info(f"PDF file path: {final_pdf_path}")
+                try:
+                    pdf_success = convert_html_to_pdf(final_html_path, final_pdf_path, document=document)
+                    if not pdf_success:
+                        logger.error("❌ PDF conversion failed")
                         return False
-                else:
-                    logger.error("❌ HTML file not found for PDF conversion")
+                    logger.info("✅ PDF conversion completed successfully")
+                except Exception as e:
+                    logger.error(f"❌ Error during PDF conversion: {str(e)}")
+                    logger.error(f"Traceback: {traceback.format_exc()}")
                     return False
-            elif output_format.upper() == "HTML":
-                if not final_html_path.exists():
-                    logger.warning("⚠️ HTML file not found. Converting from markdown...")
-                    html_success = generate_html_from_md(final_md_path, final_html_path)
-                    if not html_success:
-                        logger.warning("⚠️ HTML conversion failed.")
         else:
             logger.warning("⚠️ final_cv.md not found or empty. No output generated.")
 
-        if status_callback:
-            status_callback("🎉 Your optimized CV is ready!")
+        events.publish(ProgressEvent(
+            RUN_FINISHED, message="🎉 Your optimized CV is ready!", duration_s=time.perf_counter() - run_start
+        ))
 
         return True
 
     except Exception as e:
         logger.error(f"Error in pipeline_run: {str(e)}")
         logger.error(f"Traceback: {traceback.format_exc()}")
-        if status_callback:
-            status_callback("❌ An error occurred during processing.")
+        events.publish(ProgressEvent(RUN_FAILED, message="❌ An error occurred during processing."))
         return False
+    finally:
+        for unsubscribe in unsubscribers:
+            unsubscribe()
 
 def main():
+    import streamlit as st
+    import streamlit.components.v1 as components
+
     st.title("📄 Resume Rocket Fuel")
     st.write("Upload your CV and Job Description to get started.")
 
@@ -259,33 +361,40 @@ def main():
     output_format = st.selectbox("📦 Select Output Format", ["PDF", "HTML"])
 
     if st.button("🚀 Submit"):
-        # Create output directory relative to project root
-        output_dir = Path("output")
-        output_dir.mkdir(exist_ok=True)
-
         if not all([cv_file, jd_file, company_name]):
             st.error("❗ Please provide all required inputs: CV, Job Description, and Company Name")
             return
 
-        cv_path = output_dir / "cv.pdf"
-        jd_path = output_dir / "jd.pdf"
+        # Every submission gets its own workspace so concurrent sessions don't collide
+        workspace = create_workspace()
+        cv_path = workspace.cv_pdf
+        jd_path = workspace.jd_pdf
 
         if not save_uploaded_file(cv_file, cv_path) or not save_uploaded_file(jd_file, jd_path):
             st.error("❗ File saving failed.")
             return
 
         status_placeholder = st.empty()
+        preview_placeholder = st.empty()
+        events = EventBus()
+
+        def update_status(event: ProgressEvent):
+            status_placeholder.info(describe_event(event))
+            # Show the CV sections generated so far
+            if event.kind == TASK_OUTPUT and workspace.preview_html.exists():
+                with preview_placeholder.container():
+                    components.html(workspace.preview_html.read_text(encoding="utf-8"), height=600, scrolling=True)
 
-        def update_status(message: str):
-            status_placeholder.info(message)
+        events.subscribe(update_status)
 
         try:
             with st.spinner("🚀 Launching Agents..."):
                 logger.info("Running backend pipeline with real-time updates...")
-                result = pipeline_run(cv_path, jd_path, company_name, output_format, status_callback=update_status)
+                result = pipeline_run(cv_path, jd_path, company_name, output_format,
+                                      workspace=workspace, events=events)
 
-            final_pdf = output_dir / "final_cv.pdf"
-            final_html = output_dir / "final_polished_cv.html"
+            final_pdf = workspace.final_pdf
+            final_html = workspace.final_html
 
             if result:
                 st.success("✅ CV optimization completed successfully!")
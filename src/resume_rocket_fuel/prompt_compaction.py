@@ -0,0 +1,280 @@
+import json
+import logging
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from resume_rocket_fuel.pdf_text import PAGE_BREAK
+from resume_rocket_fuel.scheduler import task_placeholders
+
+logger = logging.getLogger(__name__)
+
+# Inputs extracted from PDFs, cleaned up once before the crew starts
+NORMALIZED_VARIABLES = ("CANDIDATE_CV", "JOB_DESCRIPTION")
+
+# Section kinds and the heading keywords that identify them
+SECTION_KINDS: Dict[str, Tuple[str, ...]] = {
+    "boilerplate": ("equal opportunit", "eeo", "diversity", "how to apply", "privacy", "disclaimer",
+                    "accommodation", "recruitment agenc"),
+    "benefits": ("benefit", "what we offer", "perks", "compensation", "salary", "rewards"),
+    "requirements": ("requirement", "qualification", "skills", "experience", "what you bring",
+                     "looking for", "about you", "preferred", "must have", "nice to have", "education",
+                     "certification", "competenc"),
+    "role": ("responsibilit", "what you'll do", "what you will do", "duties", "the role", "role overview",
+             "about the role", "job summary", "position summary", "key accountabilit", "job purpose"),
+    "sector": ("sector", "industry"),
+    "mission": ("mission", "vision", "values", "purpose"),
+    "culture": ("culture", "leadership insight", "leadership team", "working at", "life at"),
+    "milestones": ("milestone", "initiative", "recent news", "achievements"),
+    "hiring": ("hiring", "employer brand"),
+    "outlook": ("outlook", "future"),
+    "company": ("about us", "who we are", "our company", "company overview", "about the company", "why join"),
+}
+
+_INVISIBLE = dict.fromkeys(map(ord, "­​‌‍⁠﻿"), None)
+_BULLET = re.compile(r"^[•●▪◦‣⁃∙➢►–—*]\s*")
+# Bullets and wide gaps that PDF extraction left inside one long line
+_INLINE_BULLET = re.compile(r"[ \t]*[•●▪◦‣➢►][ \t]*")
+_LAYOUT_GAP = re.compile(r"[ \t]{3,}")
+_PAGE_NUMBER = re.compile(r"^(?:page\s*)?\d{1,3}(?:\s*(?:of|/)\s*\d{1,3})?$", re.IGNORECASE)
+# A word broken across lines at a hyphen; the hyphen is kept, as it may belong to a compound
+_HYPHENATED = re.compile(r"(\w-)\n(\w)")
+_SPACES = re.compile(r"[ \t\v]+")
+_SECTOR_LINE = re.compile(r"^\W*(?:sector|industry)\W*:", re.IGNORECASE)
+# Lines at the top and at the bottom of a page that may be running headers, footers or page numbers
+PAGE_EDGE_LINES = 2
+
+
+def _clean_page(page: str) -> List[str]:
+    page = _INLINE_BULLET.sub("\n- ", _LAYOUT_GAP.sub("\n", page))
+    return [_BULLET.sub("- ", _SPACES.sub(" ", raw).strip()) for raw in page.split("\n")]
+
+
+def _page_edges(lines: List[str]) -> List[int]:
+    """Indexes of the first and last PAGE_EDGE_LINES non-blank lines of a page."""
+    filled = [index for index, line in enumerate(lines) if line]
+    return sorted(set(filled[:PAGE_EDGE_LINES] + filled[-PAGE_EDGE_LINES:]))
+
+
+def normalize_text(text: str) -> str:
+    """Clean PDF-extraction artifacts and page furniture out of a document.
+
+    Folds ligatures and full-width forms (NFKC), drops invisible characters,
+    page numbers and running headers and footers (lines repeated at the edge
+    of most pages, split by pdf_text.PAGE_BREAK), rejoins words hyphenated
+    across lines, puts inline bullets and layout gaps on lines of their own,
+    unifies bullet glyphs to "- " and collapses runs of spaces and blank lines.
+    """
+    text = unicodedata.normalize("NFKC", text).translate(_INVISIBLE)
+    text = _HYPHENATED.sub(r"\1\2", text.replace("\r\n", "\n").replace("\r", "\n"))
+    pages = [_clean_page(page) for page in text.split(PAGE_BREAK)]
+    edges = [_page_edges(page) for page in pages]
+    furniture = set()
+    if len(pages) > 1:
+        counts = Counter()
+        for page, indexes in zip(pages, edges):
+            counts.update({page[index].casefold() for index in indexes})
+        furniture = {line for line, count in counts.items() if count >= max(2, len(pages) / 2)}
+
+    lines = []
+    for page, indexes in zip(pages, edges):
+        for index in indexes:
+            if _PAGE_NUMBER.match(page[index]) or page[index].casefold() in furniture:
+                page[index] = ""
+        for line in page:
+            if not line:
+                if lines and lines[-1]:
+                    lines.append("")
+                continue
+            lines.append(line)
+    return "\n".join(lines).strip()
+
+
+def _heading(line: str) -> Optional[str]:
+    """The heading text if ``line`` looks like a section heading, else None."""
+    stripped = line.strip()
+    if stripped.startswith("#"):
+        return stripped.lstrip("#").strip()
+    plain = stripped.strip("*_ ").rstrip(":").strip("*_ ")
+    if not plain or len(plain) > 60 or len(plain.split()) > 8 or plain.startswith("- "):
+        return None
+    if stripped.endswith(":") or stripped.endswith(":**") or (stripped.startswith("**") and stripped.endswith("**")):
+        return plain
+    if plain.isupper() and any(c.isalpha() for c in plain):
+        return plain
+    return None
+
+
+def section_kind(heading: str) -> str:
+    heading = heading.casefold()
+    for kind, keywords in SECTION_KINDS.items():
+        if any(keyword in heading for keyword in keywords):
+            return kind
+    return "other"
+
+
+def split_sections(text: str) -> List[Tuple[str, str, List[str]]]:
+    """Split a document into (kind, heading, lines); text before the first heading is "intro"."""
+    sections = [("intro", "", [])]
+    for line in text.split("\n"):
+        heading = _heading(line)
+        if heading is not None:
+            sections.append((section_kind(heading), heading, [line]))
+        else:
+            sections[-1][2].append(line)
+    return [section for section in sections if any(line.strip() for line in section[2])]
+
+
+def select_sections(text: str, kinds: Sequence[str]) -> str:
+    """Keep the intro, unrecognised sections and sections of the given kinds.
+
+    "Sector:" lines are always kept. Text with no recognised sections is
+    returned unchanged, so an unstructured document never loses content.
+    """
+    sections = split_sections(text)
+    known = [section for section in sections if section[0] not in ("intro", "other")]
+    if not known:
+        return text
+    wanted = set(kinds) | {"intro", "other"}
+    kept = []
+    for kind, _, lines in sections:
+        if kind in wanted:
+            kept.extend(lines)
+        else:
+            kept.extend(line for line in lines if _SECTOR_LINE.match(line))
+    return "\n".join(kept).strip()
+
+
+_token_counter = None
+
+
+def _count_tokens(text: str) -> int:
+    global _token_counter
+    if _token_counter is None:
+        try:
+            from resume_rocket_fuel.llm import count_tokens, default_model
+
+            _token_counter = lambda text: count_tokens(default_model(), text=text)
+        except ImportError:
+            # Same estimate llm.count_tokens falls back to
+            _token_counter = lambda text: len(text) // 4
+    return _token_counter(text)
+
+
+@dataclass
+class TaskSavings:
+    task: str
+    tokens_before: int
+    tokens_after: int
+    variables: Dict[str, Tuple[int, int]]
+
+    @property
+    def saved(self) -> int:
+        return self.tokens_before - self.tokens_after
+
+    @property
+    def percent_saved(self) -> float:
+        return 100.0 * self.saved / self.tokens_before if self.tokens_before else 0.0
+
+
+class PromptCompactor:
+    """Shrinks the documents interpolated into each task's prompt.
+
+    ``inputs()`` returns the run inputs with the PDF-extracted CV and job
+    description normalized once, before the crew starts. Called as the
+    scheduler's input filter, it then narrows each task's copy of the inputs
+    to the sections listed under the task's ``compact_inputs`` in tasks.yaml
+    (e.g. only the role and requirements of the job description) and records
+    the tokens saved against the uncompacted inputs.
+    """
+
+    def __init__(self, tasks_config: dict, inputs: Dict[str, Any]):
+        self.tasks_config = tasks_config
+        self.raw = dict(inputs)
+        self._inputs = dict(inputs)
+        for variable in NORMALIZED_VARIABLES:
+            if isinstance(inputs.get(variable), str):
+                self._inputs[variable] = normalize_text(inputs[variable])
+        self.savings: Dict[str, TaskSavings] = {}
+        self._selected: Dict[Tuple[str, Tuple[str, ...]], Tuple[str, str]] = {}
+        self._tokens: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def inputs(self) -> Dict[str, Any]:
+        return dict(self._inputs)
+
+    def _select(self, variable: str, text: str, kinds: Tuple[str, ...]) -> str:
+        key = (variable, kinds)
+        with self._lock:
+            cached = self._selected.get(key)
+        if cached is not None and cached[0] is text:
+            return cached[1]
+        # Task outputs such as the company profile are only normalized here, as they arrive
+        base = text if variable in NORMALIZED_VARIABLES else normalize_text(text)
+        selected = select_sections(base, kinds)
+        with self._lock:
+            self._selected[key] = (text, selected)
+        return selected
+
+    def _tokens_of(self, text: str) -> int:
+        with self._lock:
+            count = self._tokens.get(text)
+        if count is None:
+            count = _count_tokens(text)
+            with self._lock:
+                self._tokens[text] = count
+        return count
+
+    def __call__(self, task_name: str, task_inputs: Dict[str, Any]) -> Dict[str, Any]:
+        config = self.tasks_config.get(task_name, {})
+        spec = config.get("compact_inputs") or {}
+        compacted = dict(task_inputs)
+        for variable, kinds in spec.items():
+            if isinstance(compacted.get(variable), str) and compacted[variable]:
+                compacted[variable] = self._select(variable, compacted[variable], tuple(kinds))
+
+        variables = {}
+        for variable in sorted(task_placeholders(config)):
+            after = compacted.get(variable)
+            if not isinstance(after, str) or not after:
+                continue
+            before = self.raw.get(variable) if variable in NORMALIZED_VARIABLES else task_inputs[variable]
+            variables[variable] = (self._tokens_of(before or ""), self._tokens_of(after))
+        savings = TaskSavings(
+            task_name,
+            sum(before for before, _ in variables.values()),
+            sum(after for _, after in variables.values()),
+            variables,
+        )
+        with self._lock:
+            self.savings[task_name] = savings
+        if savings.saved:
+            logger.info(
+                f"🗜️ Compacted inputs of {task_name}: {savings.tokens_before} → {savings.tokens_after} tokens "
+                f"(-{savings.percent_saved:.0f}%)"
+            )
+        return compacted
+
+    def report(self) -> List[TaskSavings]:
+        with self._lock:
+            return [self.savings[name] for name in self.tasks_config if name in self.savings]
+
+    def log_report(self) -> None:
+        rows = self.report()
+        if not rows:
+            return
+        logger.info(f"{'task':<34}{'before':>9}{'after':>9}{'saved':>8}")
+        for row in rows:
+            logger.info(f"{row.task:<34}{row.tokens_before:>9}{row.tokens_after:>9}{row.percent_saved:>7.0f}%")
+        before = sum(row.tokens_before for row in rows)
+        after = sum(row.tokens_after for row in rows)
+        logger.info(f"🗜️ Prompt compaction saved {before - after} of {before} input tokens across {len(rows)} tasks")
+
+    def write_report(self, path: Path) -> None:
+        rows = [{**asdict(row), "saved": row.saved, "percent_saved": round(row.percent_saved, 1)}
+                for row in self.report()]
+        Path(path).write_text(json.dumps(rows, indent=2), encoding="utf-8")
@@ -0,0 +1,331 @@
+import heapq
+import itertools
+import logging
+import math
+import os
+import random
+import re
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Priority lanes, highest first: UI jobs are interactive, batch and fan-out runs are not
+INTERACTIVE = "interactive"
+BATCH = "batch"
+LANES = (INTERACTIVE, BATCH)
+# Share of every bucket that batch calls leave unused, so interactive calls rarely wait behind them
+BATCH_HEADROOM = 0.2
+
+# Completion tokens reserved for a call until its actual length is known
+DEFAULT_COMPLETION_TOKENS = 1024
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_BASE_S = 1.0
+DEFAULT_BACKOFF_MAX_S = 60.0
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504, 529}
+RETRYABLE_ERRORS = {"RateLimitError", "Timeout", "APIConnectionError", "ServiceUnavailableError",
+                    "InternalServerError"}
+
+# Lane of the run making the current call, set by batch and fan-out runs
+current_lane: ContextVar[str] = ContextVar("current_lane", default=INTERACTIVE)
+
+
+@contextmanager
+def priority_lane(lane: str):
+    """Run the enclosed pipeline's LLM calls in ``lane``."""
+    if lane not in LANES:
+        raise ValueError(f"Unknown priority lane {lane!r}; expected one of {', '.join(LANES)}")
+    token = current_lane.set(lane)
+    try:
+        yield
+    finally:
+        current_lane.reset(token)
+
+
+@dataclass
+class ProviderLimits:
+    """One provider account's quota; 0 means unlimited."""
+    requests_per_minute: float = 0
+    tokens_per_minute: float = 0
+    max_concurrency: int = 0
+
+
+# Conservative defaults; set RRF_RATE_LIMIT_<PROVIDER> to your account's tier
+DEFAULT_LIMITS = {
+    "openai": ProviderLimits(500, 300_000, 16),
+    "anthropic": ProviderLimits(50, 80_000, 8),
+    "fake": ProviderLimits(),
+}
+FALLBACK_LIMITS = ProviderLimits(60, 100_000, 8)
+_LIMIT_FIELDS = {"rpm": "requests_per_minute", "tpm": "tokens_per_minute", "concurrency": "max_concurrency"}
+
+
+def provider_for(model: str) -> str:
+    """The provider whose quota a litellm model name draws on."""
+    name = model.lower()
+    if "/" in name:
+        return name.split("/", 1)[0]
+    if name.startswith("claude"):
+        return "anthropic"
+    if name.startswith(("gpt", "o1", "o3", "o4", "chatgpt")):
+        return "openai"
+    return "other"
+
+
+def limits_for(provider: str) -> ProviderLimits:
+    """Limits of ``provider`` for this process.
+
+    RRF_RATE_LIMIT_<PROVIDER> overrides the defaults, e.g.
+    ``RRF_RATE_LIMIT_OPENAI="rpm=500,tpm=30000,concurrency=4"``. The quota is
+    split evenly between the RRF_RATE_LIMIT_PROCESSES processes sharing it.
+    """
+    limits = DEFAULT_LIMITS.get(provider, FALLBACK_LIMITS)
+    override = os.environ.get(f"RRF_RATE_LIMIT_{re.sub(r'[^A-Z0-9]', '_', provider.upper())}")
+    if override:
+        values = {}
+        for part in filter(None, (part.strip() for part in override.split(","))):
+            key, _, value = part.partition("=")
+            if key.strip() not in _LIMIT_FIELDS:
+                raise ValueError(f"Unknown rate limit {key.strip()!r} for {provider}; "
+                                 f"expected {', '.join(_LIMIT_FIELDS)}")
+            values[_LIMIT_FIELDS[key.strip()]] = float(value)
+        limits = replace(limits, **values)
+    processes = max(1, int(os.environ.get("RRF_RATE_LIMIT_PROCESSES", 1)))
+    return ProviderLimits(
+        limits.requests_per_minute / processes,
+        limits.tokens_per_minute / processes,
+        math.ceil(limits.max_concurrency / processes) if limits.max_concurrency else 0,
+    )
+
+
+def share_rate_limits(processes: int) -> None:
+    """Split provider quotas between ``processes`` worker processes (use before starting them, or as
+    their initializer)."""
+    os.environ.setdefault("RRF_RATE_LIMIT_PROCESSES", str(processes))
+
+
+class TokenBucket:
+    """A bucket refilled continuously up to a minute's quota.
+
+    Reservations may overdraw it; the next caller waits until it has refilled.
+    Not thread-safe on its own; ProviderLimiter guards it.
+    """
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float, floor: float = 0.0) -> float:
+        """Seconds until ``amount`` can be taken with ``floor`` left over."""
+        self._refill(now)
+        # A call larger than the whole bucket only waits for a full one
+        amount = min(amount, self.capacity - floor)
+        return max(0.0, (amount + floor - self.level) / self.rate)
+
+    def take(self, amount: float) -> None:
+        self.level -= amount
+
+    def give_back(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+class ProviderLimiter:
+    """Admission control for one provider: request and token buckets, a concurrency cap and priority lanes.
+
+    Waiting calls are admitted strictly in lane order, first come first served
+    within a lane. Batch calls also leave BATCH_HEADROOM of each bucket for
+    interactive calls, which keeps some room for them when other processes
+    share the quota. After a 429 the whole provider pauses for the backoff.
+    """
+
+    def __init__(self, provider: str, limits: ProviderLimits):
+        self.provider = provider
+        self.limits = limits
+        self.requests = TokenBucket(limits.requests_per_minute) if limits.requests_per_minute else None
+        self.tokens = TokenBucket(limits.tokens_per_minute) if limits.tokens_per_minute else None
+        self.active = 0
+        self.blocked_until = 0.0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+
+    def _wait_time(self, ticket, tokens: float, lane: str, now: float) -> float:
+        if self._waiting[0] != ticket:
+            return math.inf
+        if self.limits.max_concurrency and self.active >= self.limits.max_concurrency:
+            return math.inf
+        headroom = BATCH_HEADROOM if lane == BATCH else 0.0
+        waits = [self.blocked_until - now, 0.0]
+        if self.requests:
+            waits.append(self.requests.wait_time(1, now, floor=headroom * self.requests.capacity))
+        if self.tokens:
+            waits.append(self.tokens.wait_time(tokens, now, floor=headroom * self.tokens.capacity))
+        return max(waits)
+
+    def acquire(self, tokens: float, lane: str = INTERACTIVE) -> float:
+        """Block until a call estimated at ``tokens`` may start; return the seconds waited."""
+        ticket = (LANES.index(lane), next(self._sequence))
+        start = time.monotonic()
+        with self._condition:
+            heapq.heappush(self._waiting, ticket)
+            try:
+                while True:
+                    wait = self._wait_time(ticket, tokens, lane, time.monotonic())
+                    if wait <= 0:
+                        break
+                    self._condition.wait(None if wait == math.inf else wait)
+            except BaseException:
+                self._waiting.remove(ticket)
+                heapq.heapify(self._waiting)
+                self._condition.notify_all()
+                raise
+            heapq.heappop(self._waiting)
+            if self.requests:
+                self.requests.take(1)
+            if self.tokens:
+                self.tokens.take(tokens)
+            self.active += 1
+            self._condition.notify_all()
+        return time.monotonic() - start
+
+    def release(self, reserved_tokens: float, used_tokens: float) -> None:
+        """End a call, settling its token reservation against what it actually used."""
+        with self._condition:
+            self.active -= 1
+            if self.tokens:
+                if used_tokens < reserved_tokens:
+                    self.tokens.give_back(reserved_tokens - used_tokens)
+                else:
+                    self.tokens.take(used_tokens - reserved_tokens)
+            self._condition.notify_all()
+
+    def pause(self, seconds: float) -> None:
+        """Hold every call to this provider for ``seconds``, e.g. after a 429."""
+        with self._condition:
+            self.blocked_until = max(self.blocked_until, time.monotonic() + seconds)
+            if self.requests:
+                # The provider counted more requests than the bucket did
+                self.requests.level = min(self.requests.level, 0.0)
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    status = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_rate_limited(error: Exception) -> bool:
+    return _status_code(error) == 429 or type(error).__name__ == "RateLimitError"
+
+
+def is_retryable(error: Exception) -> bool:
+    return is_rate_limited(error) or _status_code(error) in RETRYABLE_STATUS or type(error).__name__ in RETRYABLE_ERRORS
+
+
+def retry_after(error: Exception) -> float:
+    """The provider's Retry-After delay in seconds, or 0 if it sent none."""
+    # litellm keeps the provider's headers apart from the (synthetic) response it attaches
+    headers = (getattr(error, "litellm_response_headers", None)
+               or getattr(getattr(error, "response", None), "headers", None) or {})
+    try:
+        return max(0.0, float(headers.get("retry-after", 0)))
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class RateLimiter:
+    """Process-wide scheduler for LLM calls, sharing each provider's quota between all runs.
+
+    Every call waits for its provider's limiter, then runs. Calls that fail with
+    a 429, a timeout or a server error are retried with jittered exponential
+    backoff, and never sooner than the provider's Retry-After.
+    """
+
+    def __init__(self, max_retries: int = DEFAULT_MAX_RETRIES, backoff_base_s: float = DEFAULT_BACKOFF_BASE_S,
+                 backoff_max_s: float = DEFAULT_BACKOFF_MAX_S):
+        self.max_retries = max_retries
+        self.backoff_base_s = backoff_base_s
+        self.backoff_max_s = backoff_max_s
+        self._limiters: Dict[str, ProviderLimiter] = {}
+        self._lock = threading.Lock()
+
+    def limiter(self, provider: str) -> ProviderLimiter:
+        with self._lock:
+            if provider not in self._limiters:
+                self._limiters[provider] = ProviderLimiter(provider, limits_for(provider))
+            return self._limiters[provider]
+
+    def backoff(self, attempt: int, error: Exception) -> float:
+        # "Full jitter": spread the retries of calls that failed together
+        delay = random.uniform(0, min(self.backoff_max_s, self.backoff_base_s * 2 ** attempt))
+        return max(delay, retry_after(error))
+
+    def call(self, model: str, fn: Callable[[], Any], prompt_tokens: int,
+             count_completion: Callable[[Any], int], completion_tokens: int = DEFAULT_COMPLETION_TOKENS,
+             on_retry: Optional[Callable[[], None]] = None) -> Any:
+        """Run ``fn`` (one LLM request to ``model``) within its provider's limits, retrying transient errors.
+
+        The call reserves ``prompt_tokens + completion_tokens`` and is charged
+        ``prompt_tokens + count_completion(result)`` once it returns.
+        ``on_retry`` runs before each retry, e.g. to reset a stream.
+        """
+        provider = provider_for(model)
+        limiter = self.limiter(provider)
+        lane = current_lane.get()
+        reserved = prompt_tokens + completion_tokens
+        for attempt in itertools.count():
+            waited = limiter.acquire(reserved, lane)
+            if waited >= 1:
+                logger.info(f"⏳ Waited {waited:.1f}s for {provider} rate limits ({lane})")
+            used = reserved
+            try:
+                result = fn()
+                used = prompt_tokens + count_completion(result)
+                return result
+            except Exception as e:
+                if not is_retryable(e) or attempt >= self.max_retries:
+                    raise
+                # Rejected requests are not billed for tokens
+                used = 0 if is_rate_limited(e) else reserved
+                delay = self.backoff(attempt, e)
+                if is_rate_limited(e):
+                    limiter.pause(delay)
+                logger.warning(f"🔁 {model} call failed ({type(e).__name__}: {str(e)[:200]}), "
+                               f"retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+            finally:
+                limiter.release(reserved, used)
+            time.sleep(delay)
+            if on_retry is not None:
+                on_retry()
+
+
+_default_limiter: Optional[RateLimiter] = None
+_default_lock = threading.Lock()
+
+
+def get_rate_limiter() -> Optional[RateLimiter]:
+    """Process-wide rate limiter configured from the environment, or None when RRF_RATE_LIMITS=off.
+
+    RRF_LLM_MAX_RETRIES, RRF_LLM_BACKOFF_BASE_S and RRF_LLM_BACKOFF_MAX_S tune
+    the retries; the limits themselves are read per provider (see limits_for).
+    """
+    global _default_limiter
+    if os.environ.get("RRF_RATE_LIMITS", "on").lower() in ("0", "false", "off"):
+        return None
+    with _default_lock:
+        if _default_limiter is None:
+            _default_limiter = RateLimiter(
+                max_retries=int(os.environ.get("RRF_LLM_MAX_RETRIES", DEFAULT_MAX_RETRIES)),
+                backoff_base_s=float(os.environ.get("RRF_LLM_BACKOFF_BASE_S", DEFAULT_BACKOFF_BASE_S)),
+                backoff_max_s=float(os.environ.get("RRF_LLM_BACKOFF_MAX_S", DEFAULT_BACKOFF_MAX_S)),
+            )
+        return _default_limiter
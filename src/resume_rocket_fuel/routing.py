@@ -0,0 +1,332 @@
+import json
+import logging
+import os
+import statistics
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from crewai import LLM
+
+from resume_rocket_fuel.fake_llm import fake_llm_forced, fake_model_name, is_fake_model
+from resume_rocket_fuel.rate_limit import is_retryable
+from resume_rocket_fuel.scheduler import current_task
+from resume_rocket_fuel.workspace import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+MODELS_CONFIG = "models.yaml"
+DEFAULT_LATENCY_FILE = Path.home() / ".cache" / "resume_rocket_fuel" / "model_latency.json"
+
+# tasks.yaml "model_tier" value that keeps a task on its agent's own model (the default)
+PINNED = "pinned"
+# Output length assumed for a task until its own calls have been measured
+DEFAULT_EXPECTED_OUTPUT_TOKENS = 800
+# Calls remembered per model and task, and calls needed before measurements replace the tier's estimate
+LATENCY_WINDOW = 50
+MIN_SAMPLES = 5
+# How long a routed model that failed is skipped before it is tried again
+FAILURE_COOLDOWN_S = 300.0
+
+
+@dataclass
+class ModelTier:
+    """Models of similar strength and speed, from models.yaml."""
+    name: str
+    models: List[str]
+    # Largest prompt and expected answer the tier is trusted with (0 = no limit)
+    max_input_tokens: int = 0
+    max_output_tokens: int = 0
+    # Throughput assumed for the tier's models until their calls have been measured
+    tokens_per_s: float = 30.0
+    # Simulated timing of the tier's models when running on the fake LLM
+    fake_llm: dict = field(default_factory=dict)
+
+
+@dataclass
+class LatencyStats:
+    samples: int
+    p50_s: float
+    p95_s: float
+    # Seconds per completion token, which predicts calls of other lengths
+    p50_s_per_token: float
+    p95_s_per_token: float
+
+
+@dataclass
+class RouteDecision:
+    model: str
+    tier: str
+    reason: str
+    predicted_s: Optional[float] = None
+
+
+def _percentile(values: List[float], fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+class LatencyTracker:
+    """Rolling latencies per model and answer lengths per task, from the calls made so far.
+
+    The window is saved to ``path`` after every call, so a new process starts
+    from what earlier runs measured. With several processes the last writer
+    wins, which is fine for rolling statistics.
+    """
+
+    def __init__(self, path: Optional[Path] = None, window: int = LATENCY_WINDOW):
+        self.path = Path(path) if path else None
+        self.window = window
+        self._calls: Dict[str, Deque[Tuple[float, int]]] = defaultdict(lambda: deque(maxlen=window))
+        self._outputs: Dict[str, Deque[int]] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path or not self.path.exists():
+            return
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            for model, calls in data.get("models", {}).items():
+                self._calls[model].extend((float(duration), int(tokens)) for duration, tokens in calls)
+            for task, outputs in data.get("tasks", {}).items():
+                self._outputs[task].extend(int(tokens) for tokens in outputs)
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Ignoring unreadable model latency file {self.path}: {str(e)}")
+
+    def record(self, model: str, task_name: Optional[str], duration_s: float, completion_tokens: int) -> None:
+        with self._lock:
+            self._calls[model].append((round(duration_s, 3), completion_tokens))
+            if task_name:
+                self._outputs[task_name].append(completion_tokens)
+            data = {
+                "models": {name: list(calls) for name, calls in self._calls.items()},
+                "tasks": {name: list(outputs) for name, outputs in self._outputs.items()},
+            }
+        if self.path:
+            try:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                write_text_atomic(self.path, json.dumps(data))
+            except OSError as e:
+                logger.warning(f"Could not save model latencies to {self.path}: {str(e)}")
+
+    def stats(self, model: str) -> Optional[LatencyStats]:
+        with self._lock:
+            calls = list(self._calls.get(model, ()))
+        if not calls:
+            return None
+        durations = [duration for duration, _ in calls]
+        per_token = [duration / max(tokens, 1) for duration, tokens in calls]
+        return LatencyStats(len(calls), statistics.median(durations), _percentile(durations, 0.95),
+                            statistics.median(per_token), _percentile(per_token, 0.95))
+
+    def expected_output_tokens(self, task_name: str) -> Optional[int]:
+        with self._lock:
+            outputs = list(self._outputs.get(task_name, ()))
+        return int(statistics.median(outputs)) if outputs else None
+
+
+_tracker: Optional[LatencyTracker] = None
+_tracker_lock = threading.Lock()
+_latencies_in_memory = False
+
+
+def get_latency_tracker() -> LatencyTracker:
+    """Process-wide tracker, saved to $RRF_MODEL_LATENCY_FILE (default under ~/.cache; "off" keeps it in memory)."""
+    global _tracker
+    with _tracker_lock:
+        if _tracker is None:
+            path = os.environ.get("RRF_MODEL_LATENCY_FILE") or str(DEFAULT_LATENCY_FILE)
+            in_memory = _latencies_in_memory or path.lower() == "off"
+            _tracker = LatencyTracker(None if in_memory else Path(path))
+        return _tracker
+
+
+def keep_latencies_in_memory() -> None:
+    """Stop saving latencies for the rest of the process, e.g. while the fake LLM simulates them."""
+    global _latencies_in_memory
+    with _tracker_lock:
+        _latencies_in_memory = True
+        if _tracker is not None:
+            _tracker.path = None
+
+
+def _has_credentials(model: str) -> bool:
+    if is_fake_model(model) or fake_llm_forced():
+        return True
+    try:
+        import litellm
+
+        return bool(litellm.validate_environment(model=model).get("keys_in_environment"))
+    except Exception:
+        return False
+
+
+class ModelRouter:
+    """Picks the model for each task from the tiers in models.yaml.
+
+    A task's ``model_tier`` in tasks.yaml is the weakest tier it may use; tasks
+    without one, or with ``pinned``, always use their agent's model. A routed
+    task goes to the model predicted to answer fastest among the tiers from its
+    own upwards whose limits admit its prompt size and expected answer length.
+    A model's prediction is its rolling p95 seconds per token (or the tier's
+    assumed throughput until it has MIN_SAMPLES calls) times the task's median
+    answer length so far (or its ``expected_output_tokens``).
+    """
+
+    def __init__(self, tiers: List[ModelTier], tasks_config: dict, tracker: LatencyTracker):
+        self.tiers = tiers
+        self.tasks_config = tasks_config
+        self.tracker = tracker
+        self._has_credentials: Dict[str, bool] = {}
+        # Models skipped until the given time.monotonic(), after failing
+        self._cooldowns: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, models_config: dict, tasks_config: dict) -> "ModelRouter":
+        tiers = [ModelTier(**tier) for tier in models_config.get("tiers", [])]
+        return cls(tiers, tasks_config, get_latency_tracker())
+
+    def tier(self, name: str) -> Optional[ModelTier]:
+        return next((tier for tier in self.tiers if tier.name == name), None)
+
+    def tier_of(self, model: str) -> Optional[ModelTier]:
+        return next((tier for tier in self.tiers if model in tier.models), None)
+
+    def available(self, model: str) -> bool:
+        with self._lock:
+            if model not in self._has_credentials:
+                self._has_credentials[model] = _has_credentials(model)
+            return self._has_credentials[model] and time.monotonic() >= self._cooldowns.get(model, 0.0)
+
+    def cool_down(self, model: str, seconds: float = FAILURE_COOLDOWN_S) -> None:
+        """Skip ``model`` for the next ``seconds``."""
+        with self._lock:
+            self._cooldowns[model] = time.monotonic() + seconds
+
+    def expected_output_tokens(self, task_name: str) -> int:
+        measured = self.tracker.expected_output_tokens(task_name)
+        if measured is not None:
+            return measured
+        return int(self.tasks_config.get(task_name, {}).get("expected_output_tokens", DEFAULT_EXPECTED_OUTPUT_TOKENS))
+
+    def model_config(self, model: str, agent_config: dict) -> dict:
+        """Agent config for calls routed to ``model``, with its tier's fake LLM timing unless the agent sets one."""
+        tier = self.tier_of(model)
+        if tier is None or not tier.fake_llm or agent_config.get("fake_llm"):
+            return agent_config
+        return {**agent_config, "fake_llm": tier.fake_llm}
+
+    def predict(self, model: str, tier: ModelTier, output_tokens: int) -> float:
+        """Predicted p95 latency of a call to ``model`` answering ``output_tokens`` tokens."""
+        # Calls are recorded under the model actually called, which keeps simulated latencies apart
+        stats = self.tracker.stats(fake_model_name(model) if fake_llm_forced() else model)
+        if stats is not None and stats.samples >= MIN_SAMPLES:
+            return stats.p95_s_per_token * output_tokens
+        return output_tokens / tier.tokens_per_s
+
+    def route(self, task_name: Optional[str], default_model: str, prompt_tokens: int) -> RouteDecision:
+        setting = self.tasks_config.get(task_name, {}).get("model_tier", PINNED) if task_name else PINNED
+        if setting == PINNED:
+            return RouteDecision(default_model, PINNED, "pinned to the agent's model")
+        lowest = self.tier(setting)
+        if lowest is None:
+            logger.warning(f"Unknown model tier {setting!r} for {task_name}, using the agent's model")
+            return RouteDecision(default_model, PINNED, f"unknown tier {setting}")
+
+        output_tokens = self.expected_output_tokens(task_name)
+        best = None
+        for tier in self.tiers[self.tiers.index(lowest):]:
+            if tier.max_input_tokens and prompt_tokens > tier.max_input_tokens:
+                continue
+            if tier.max_output_tokens and output_tokens > tier.max_output_tokens:
+                continue
+            for model in tier.models:
+                if not self.available(model):
+                    continue
+                predicted = self.predict(model, tier, output_tokens)
+                if best is None or predicted < best.predicted_s:
+                    best = RouteDecision(model, tier.name, f"{prompt_tokens} prompt tokens, ~{output_tokens} "
+                                                          f"answer tokens, predicted p95 {predicted:.1f}s", predicted)
+        if best is None:
+            return RouteDecision(default_model, PINNED, "no tier admits this call")
+        return best
+
+
+class RoutingLLM(LLM):
+    """An agent's LLM that sends each task's calls to the model its router picks.
+
+    One LLM per model is built on first use with ``build``. If a routed model
+    fails, the call is retried once on the agent's own model.
+    """
+
+    def __init__(self, model: str, router: ModelRouter, build: Callable[[str], LLM], **kwargs):
+        super().__init__(model=model, **kwargs)
+        self.router = router
+        self._build = build
+        self._llms: Dict[str, LLM] = {}
+        self._llms_lock = threading.Lock()
+
+    def llm_for(self, model: str) -> LLM:
+        with self._llms_lock:
+            if model not in self._llms:
+                self._llms[model] = self._build(model)
+            return self._llms[model]
+
+    def supports_function_calling(self) -> bool:
+        return self.llm_for(self.model).supports_function_calling()
+
+    def supports_stop_words(self) -> bool:
+        return self.llm_for(self.model).supports_stop_words()
+
+    def get_context_window_size(self) -> int:
+        return self.llm_for(self.model).get_context_window_size()
+
+    def _call_model(self, model: str, messages, tools, *args, **kwargs):
+        llm = self.llm_for(model)
+        # crewAI sets the agent's stop words on this LLM
+        llm.stop = self.stop
+        return llm.call(messages, tools, *args, **kwargs)
+
+    def call(self, messages, tools=None, *args, **kwargs):
+        from resume_rocket_fuel.llm import count_tokens
+
+        task_name = current_task.get()
+        decision = self.router.route(task_name, self.model, count_tokens(self.model, messages=messages))
+        if decision.model != self.model:
+            logger.info(f"🔀 Routing {task_name} to {decision.model} ({decision.tier}: {decision.reason})")
+        try:
+            return self._call_model(decision.model, messages, tools, *args, **kwargs)
+        except Exception as e:
+            if decision.model == self.model:
+                raise
+            logger.warning(f"Routed model {decision.model} failed for {task_name} ({type(e).__name__}: {str(e)}), "
+                           f"falling back to {self.model}")
+            # Rate limits and timeouts were retried already and are transient; other failures bench the model a while
+            if not is_retryable(e):
+                self.router.cool_down(decision.model)
+            return self._call_model(self.model, messages, tools, *args, **kwargs)
+
+
+_router: Optional[ModelRouter] = None
+_router_lock = threading.Lock()
+
+
+def get_model_router() -> Optional[ModelRouter]:
+    """Process-wide router from config/models.yaml, or None if RRF_MODEL_ROUTING=off or there are no tiers."""
+    global _router
+    if os.environ.get("RRF_MODEL_ROUTING", "on").lower() in ("0", "off", "false", "no"):
+        return None
+    with _router_lock:
+        if _router is None:
+            from resume_rocket_fuel.crew import CONFIG_DIR, load_yaml_config
+
+            path = CONFIG_DIR / MODELS_CONFIG
+            if not path.exists():
+                return None
+            _router = ModelRouter.from_config(load_yaml_config(path) or {}, load_yaml_config(CONFIG_DIR / "tasks.yaml"))
+        return _router if _router.tiers else None
@@ -0,0 +1,313 @@
+import contextvars
+import logging
+import queue
+import re
+import threading
+import time
+import traceback
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from resume_rocket_fuel.checkpoints import CheckpointStore, RestoredOutput, task_fingerprint
+from resume_rocket_fuel.events import (
+    AGENT_STEP, TASK_FAILED, TASK_FINISHED, TASK_OUTPUT, TASK_SKIPPED, TASK_STARTED, EventBus, ProgressEvent,
+)
+from resume_rocket_fuel.streaming import OutputStream, current_stream
+from resume_rocket_fuel.tracing import TASK, span
+from resume_rocket_fuel.workspace import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+# Matches {COMPANY_NAME}-style placeholders in task descriptions
+PLACEHOLDER_PATTERN = re.compile(r"\{([A-Z][A-Z0-9_]*)\}")
+
+DEFAULT_MAX_PARALLEL_TASKS = 4
+
+# Name of the crew task executing in the current thread, e.g. for LLM cache keys
+current_task: ContextVar[Optional[str]] = ContextVar("current_task", default=None)
+
+
+def _task_text(task_config: dict) -> str:
+    return f"{task_config.get('description', '')}\n{task_config.get('expected_output', '')}"
+
+
+def task_placeholders(task_config: dict) -> Set[str]:
+    """Return the set of {PLACEHOLDER} names referenced by a task config."""
+    return set(PLACEHOLDER_PATTERN.findall(_task_text(task_config)))
+
+
+def build_task_graph(tasks_config: dict) -> Dict[str, Set[str]]:
+    """Build a task -> upstream tasks mapping from tasks.yaml.
+
+    A task depends on another task when it references the placeholder that
+    task publishes (``output_variable``) or mentions its ``output_file`` by name.
+    """
+    variable_producers = {}
+    file_producers = {}
+    for name, config in tasks_config.items():
+        variable = config.get("output_variable")
+        if variable:
+            if variable in variable_producers:
+                raise ValueError(
+                    f"Output variable {variable} is produced by both "
+                    f"{variable_producers[variable]} and {name}"
+                )
+            variable_producers[variable] = name
+        output_file = config.get("output_file")
+        if output_file:
+            file_producers[Path(output_file).name] = name
+
+    graph = {}
+    for name, config in tasks_config.items():
+        text = _task_text(config)
+        upstream = {variable_producers[v] for v in task_placeholders(config) if v in variable_producers}
+        upstream |= {producer for file_name, producer in file_producers.items() if file_name in text}
+        upstream.discard(name)
+        graph[name] = upstream
+
+    # Fail early on cycles
+    topological_waves(graph)
+    return graph
+
+
+def topological_waves(graph: Dict[str, Set[str]]) -> List[List[str]]:
+    """Group tasks into waves where every task only depends on earlier waves."""
+    remaining = {name: set(deps) for name, deps in graph.items()}
+    unknown = {dep for deps in remaining.values() for dep in deps} - set(remaining)
+    if unknown:
+        raise ValueError(f"Task graph references unknown tasks: {sorted(unknown)}")
+
+    waves = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            raise ValueError(f"Task graph contains a cycle between: {sorted(remaining)}")
+        waves.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return waves
+
+
+def downstream_tasks(graph: Dict[str, Set[str]], names: Set[str]) -> Set[str]:
+    """The given tasks and every task that depends on them, directly or not."""
+    result = set(names)
+    changed = True
+    while changed:
+        changed = False
+        for name, deps in graph.items():
+            if name not in result and deps & result:
+                result.add(name)
+                changed = True
+    return result
+
+
+def _interpolate_task(task, inputs: Dict[str, Any]) -> None:
+    """Render a task's description and expected output from inputs."""
+    interpolate = getattr(task, "interpolate_inputs_and_add_conversation_history", None)
+    if interpolate is None:
+        interpolate = task.interpolate_inputs
+    interpolate(inputs)
+
+
+def render_output_path(task_config: dict, inputs: Dict[str, Any]) -> Optional[Path]:
+    """Resolve a task's templated ``output_file``, e.g. '{OUTPUT_DIR}/final_cv.md'."""
+    template = task_config.get("output_file")
+    if not template:
+        return None
+    return Path(PLACEHOLDER_PATTERN.sub(lambda match: str(inputs[match.group(1)]), template))
+
+
+def _write_output_file(path: Optional[Path], text: str) -> None:
+    # Atomic, so a UI polling the workspace never reads a half-written output
+    if path is not None:
+        write_text_atomic(path, text)
+
+
+def _agent_role(task) -> Optional[str]:
+    agent = getattr(task, "agent", None)
+    role = getattr(agent, "role", None)
+    return role.strip() if isinstance(role, str) else None
+
+
+def run_task_graph(crew, inputs: Dict[str, Any], tasks_config: dict,
+                   max_workers: Optional[int] = None,
+                   completed: Optional[Dict[str, str]] = None,
+                   only: Optional[Set[str]] = None,
+                   write_outputs: bool = True,
+                   events: Optional[EventBus] = None,
+                   input_filter: Optional[Callable[[str, Dict[str, Any]], Dict[str, Any]]] = None,
+                   stream_listener: Optional[Callable[[str, str, bool], Optional[str]]] = None,
+                   checkpoints: Optional[CheckpointStore] = None) -> Dict[str, Any]:
+    """Execute the crew's tasks as a DAG, running independent tasks concurrently.
+
+    Each task is started as soon as all of its upstream tasks have finished, and
+    the raw output of a task is bound to its ``output_variable`` placeholder for
+    the tasks downstream of it. Tasks in ``completed`` are skipped and their given
+    output is used instead; ``only`` restricts execution to a subset of tasks.
+    Unless ``write_outputs`` is False, each output is also written to the task's
+    ``output_file`` rendered from the inputs (typically under ``{OUTPUT_DIR}``).
+    Task start/finish and agent step events are published to ``events`` from
+    the calling thread, so subscribers may safely update UI state.
+    ``input_filter(name, inputs)``, if given, returns the inputs a task's prompt
+    is rendered from, e.g. with long documents cut down to what it needs.
+    For tasks with ``stream_output`` set, ``stream_listener(name, text, done)``
+    is called from the worker thread with the answer so far as the agent's LLM
+    produces it; a message it returns is published as a TASK_OUTPUT event.
+    With ``checkpoints``, each task's output is saved with a fingerprint of
+    its prompt inputs as soon as it finishes, and a task whose fingerprint
+    matches a saved checkpoint is restored instead of run (see checkpoints.py).
+    Returns a mapping of task name -> TaskOutput (or RestoredOutput) for the
+    tasks that were executed or restored.
+    """
+    completed = completed or {}
+    graph = build_task_graph(tasks_config)
+    if only is not None:
+        outside = {dep for name in only for dep in graph[name]} - set(only) - set(completed)
+        if outside:
+            raise ValueError(f"Tasks {sorted(only)} depend on tasks that will not run: {sorted(outside)}")
+        graph = {name: deps for name, deps in graph.items() if name in only}
+    graph = {name: deps - set(completed) for name, deps in graph.items() if name not in completed}
+    logger.info(f"Task execution waves: {topological_waves(graph)}")
+
+    tasks_by_name = {}
+    for config_name, task in zip(tasks_config, crew.tasks):
+        tasks_by_name[getattr(task, "name", None) or config_name] = task
+    missing = (set(graph) | set(completed)) - set(tasks_by_name)
+    if missing:
+        raise KeyError(f"Crew has no tasks named: {sorted(missing)}")
+
+    for crew_agent in crew.agents:
+        crew_agent.interpolate_inputs(inputs)
+    for task in tasks_by_name.values():
+        # Output files are rendered and written here rather than by crewAI
+        task.output_file = None
+
+    # Workers report progress through this queue; the calling thread publishes it
+    progress = queue.SimpleQueue()
+
+    def report(kind: str, name: Optional[str], **details) -> None:
+        if events is not None:
+            progress.put(ProgressEvent(kind, task=name, agent=_agent_role(tasks_by_name.get(name)), **details))
+
+    def publish_progress() -> None:
+        while events is not None and not progress.empty():
+            events.publish(progress.get())
+
+    if events is not None:
+        for crew_agent in crew.agents:
+            crew_agent.step_callback = lambda step: report(AGENT_STEP, current_task.get())
+
+    def write_output(name: str, text: str) -> None:
+        if write_outputs:
+            _write_output_file(render_output_path(tasks_config[name], inputs), text)
+
+    variables = dict(inputs)
+    for name, raw in completed.items():
+        logger.debug(f"Skipping task {name}, output already available")
+        report(TASK_SKIPPED, name)
+        variable = tasks_config[name].get("output_variable")
+        if variable:
+            variables[variable] = raw
+    for name, raw in completed.items():
+        write_output(name, raw)
+
+    # An Agent keeps per-execution state, so it must only run one task at a time
+    agent_locks = {id(crew_agent): threading.Lock() for crew_agent in crew.agents}
+    variables_lock = threading.Lock()
+    outputs = {}
+
+    def execute(name: str):
+        task = tasks_by_name[name]
+        with variables_lock:
+            task_inputs = dict(variables)
+        if input_filter is not None:
+            task_inputs = input_filter(name, task_inputs)
+        fingerprint = None
+        if checkpoints is not None:
+            model = getattr(getattr(task.agent, "llm", None), "model", None)
+            fingerprint = task_fingerprint(name, tasks_config[name], task_inputs,
+                                           task_placeholders(tasks_config[name]), model=model)
+            restored = checkpoints.get(name, fingerprint)
+            if restored is not None:
+                logger.info(f"♻️ Restored {name} from its checkpoint")
+                return RestoredOutput(restored), None
+        _interpolate_task(task, task_inputs)
+        lock = agent_locks.setdefault(id(task.agent), threading.Lock())
+        with lock:
+            logger.debug(f"Starting task {name}")
+            report(TASK_STARTED, name)
+            token = current_task.set(name)
+            start = time.perf_counter()
+            stream_token = None
+            if stream_listener is not None and tasks_config[name].get("stream_output"):
+                stream_token = current_stream.set(
+                    OutputStream(lambda text, done: on_stream(name, start, text, done))
+                )
+            try:
+                with span(name, TASK, agent=_agent_role(task)):
+                    output = task.execute_sync(agent=task.agent)
+                duration = time.perf_counter() - start
+                if checkpoints is not None:
+                    # Saved here, so a sibling task failing later does not lose this output
+                    checkpoints.put(name, fingerprint, output.raw, duration_s=round(duration, 3))
+                return output, duration
+            finally:
+                current_task.reset(token)
+                if stream_token is not None:
+                    current_stream.reset(stream_token)
+
+    def on_stream(name: str, start: float, text: str, done: bool) -> None:
+        try:
+            message = stream_listener(name, text, done)
+        except Exception as e:
+            # A broken preview must not fail the task
+            logger.warning(f"Stream listener failed for {name}: {str(e)}")
+            return
+        if message:
+            report(TASK_OUTPUT, name, message=message, duration_s=round(time.perf_counter() - start, 3))
+
+    pending = {name: set(deps) for name, deps in graph.items()}
+    workers = max_workers or max(1, min(DEFAULT_MAX_PARALLEL_TASKS, len(graph)))
+    publish_progress()
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="crew-task") as executor:
+        running = {}
+        while pending or running:
+            for name in [n for n, deps in pending.items() if not deps]:
+                del pending[name]
+                # Run in a copy of this context so task spans nest under the caller's span
+                running[executor.submit(contextvars.copy_context().run, execute, name)] = name
+
+            done, _ = wait(running, timeout=0.5, return_when=FIRST_COMPLETED)
+            publish_progress()
+            for future in done:
+                name = running.pop(future)
+                try:
+                    output, duration = future.result()
+                except Exception as e:
+                    logger.error(f"Task {name} failed: {str(e)}")
+                    logger.error(f"Traceback: {traceback.format_exc()}")
+                    for other in running:
+                        other.cancel()
+                    report(TASK_FAILED, name, message=str(e))
+                    publish_progress()
+                    raise
+                outputs[name] = output
+                if duration is None:
+                    report(TASK_SKIPPED, name, message="restored from checkpoint")
+                else:
+                    logger.debug(f"Finished task {name} in {duration:.1f}s")
+                    report(TASK_FINISHED, name, duration_s=round(duration, 3), output_chars=len(output.raw or ""))
+                publish_progress()
+                write_output(name, output.raw)
+                variable = tasks_config[name].get("output_variable")
+                if variable:
+                    with variables_lock:
+                        variables[variable] = output.raw
+                for deps in pending.values():
+                    deps.discard(name)
+
+    return outputs
@@ -0,0 +1,135 @@
+import logging
+import threading
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from resume_rocket_fuel.cv_document import parse_markdown, render_html, render_section_html
+from resume_rocket_fuel.workspace import write_text_atomic
+
+logger = logging.getLogger(__name__)
+
+# crewAI agents answer as "Thought: ...\nFinal Answer: <answer>"
+FINAL_ANSWER_MARKER = "Final Answer:"
+
+
+class OutputStream:
+    """The answer of the LLM call currently running a task, fed chunk by chunk.
+
+    ``listener(text, done)`` receives the answer so far each time a line of it
+    is completed, and the whole answer with ``done`` set once the call returns.
+    """
+
+    def __init__(self, listener: Callable[[str, bool], None]):
+        self.listener = listener
+        self._chunks: List[str] = []
+        self._notified = 0
+
+    def restart(self) -> None:
+        # Each LLM call of an agent produces a new answer
+        self._chunks = []
+        self._notified = 0
+
+    def answer(self) -> str:
+        text = "".join(self._chunks)
+        marker = text.rfind(FINAL_ANSWER_MARKER)
+        if marker >= 0:
+            return text[marker + len(FINAL_ANSWER_MARKER):].lstrip()
+        if text.lstrip().startswith(("Thought:", "Action:")):
+            return ""
+        return text
+
+    def feed(self, chunk: str) -> None:
+        self._chunks.append(chunk)
+        if "\n" not in chunk:
+            return
+        answer = self.answer()
+        end = answer.rfind("\n") + 1
+        if end > self._notified:
+            self._notified = end
+            self.listener(answer[:end], False)
+
+    def finish(self) -> None:
+        self.listener(self.answer(), True)
+
+
+# Stream of the task running in the current thread, set by the scheduler for tasks with stream_output
+current_stream: ContextVar[Optional[OutputStream]] = ContextVar("current_stream", default=None)
+
+_handler_installed = False
+_handler_lock = threading.Lock()
+
+
+def install_chunk_handler() -> None:
+    """Forward crewAI's LLM stream chunks to the stream of the task that requested them.
+
+    crewAI emits chunks synchronously from the thread making the LLM call, so
+    the context variable identifies the task.
+    """
+    global _handler_installed
+    with _handler_lock:
+        if _handler_installed:
+            return
+        from crewai.utilities.events import crewai_event_bus
+        from crewai.utilities.events.llm_events import LLMStreamChunkEvent
+
+        def on_chunk(source, event):
+            stream = current_stream.get()
+            if stream is not None and event.tool_call is None:
+                stream.feed(event.chunk)
+
+        crewai_event_bus.register_handler(LLMStreamChunkEvent, on_chunk)
+        _handler_installed = True
+
+
+def _complete_part(text: str, done: bool) -> str:
+    """The part of a streamed CV whose sections are complete: all of it, or up to the last ``##`` heading."""
+    if done:
+        return text
+    start = text.rfind("\n## ")
+    if start >= 0:
+        return text[:start + 1]
+    return ""
+
+
+class SectionPreview:
+    """Renders the CV sections of streamed task output as soon as each is complete.
+
+    A section is complete once the next ``##`` heading starts. Sections are
+    rendered to HTML once, and the page with the header and the completed
+    sections is replaced atomically at ``path`` for UIs to poll. Called as the
+    scheduler's stream listener, it returns a progress message when new
+    sections are ready.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._sections: Dict[str, List[str]] = {}
+        self._rendered_text: Dict[str, str] = {}
+        self._shown: Optional[str] = None
+        self._lock = threading.Lock()
+
+    def __call__(self, task_name: str, text: str, done: bool) -> Optional[str]:
+        complete = _complete_part(text, done)
+        if not complete.strip():
+            return None
+        with self._lock:
+            previous = self._rendered_text.get(task_name)
+            if complete == previous:
+                return None
+            document = parse_markdown(complete)
+            if previous is not None and not complete.startswith(previous):
+                # A new answer (e.g. a retried LLM call) replaces the sections rendered so far
+                self._sections.pop(task_name, None)
+            self._rendered_text[task_name] = complete
+            rendered = self._sections.setdefault(task_name, [])
+            new = document.sections[len(rendered):]
+            rendered.extend(render_section_html(section) for section in new)
+            # The page switches to a later task's output once that has a complete section
+            if rendered or self._shown in (None, task_name):
+                self._shown = task_name
+                write_text_atomic(self.path, render_html(document, rendered))
+        titles = [section.title for section in new if section.title]
+        if not titles:
+            return None
+        return f"{', '.join(titles)} {'section' if len(titles) == 1 else 'sections'} ready"
@@ -0,0 +1,238 @@
+import functools
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from collections import defaultdict
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+SPANS_FILE = "spans.jsonl"
+
+# Span kinds
+RUN = "run"
+STAGE = "stage"
+TASK = "task"
+LLM_CALL = "llm"
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed unit of work; token counts roll up into the enclosing span."""
+
+    __slots__ = ("tracer", "name", "kind", "trace_id", "span_id", "parent", "attributes",
+                 "prompt_tokens", "completion_tokens", "start", "duration_s", "error", "_token")
+
+    def __init__(self, tracer: "Tracer", name: str, kind: str, attributes: Dict[str, Any],
+                 trace_id: Optional[str] = None):
+        self.tracer = tracer
+        self.name = name
+        self.kind = kind
+        self.parent = _current_span.get()
+        self.trace_id = trace_id or (self.parent.trace_id if self.parent else uuid.uuid4().hex[:12])
+        self.span_id = uuid.uuid4().hex[:16]
+        self.attributes = attributes
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.duration_s = None
+        self.error = None
+
+    def set(self, **attributes) -> None:
+        self.attributes.update(attributes)
+
+    def add_tokens(self, prompt: int = 0, completion: int = 0) -> None:
+        self.prompt_tokens += prompt
+        self.completion_tokens += completion
+
+    def __enter__(self) -> "Span":
+        self.start = time.time()
+        self._token = _current_span.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.duration_s = time.time() - self.start
+        _current_span.reset(self._token)
+        if exc is not None:
+            self.error = f"{exc_type.__name__}: {exc}"
+        self.tracer.record(self)
+
+    def to_dict(self) -> dict:
+        record = {
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent.span_id if self.parent else None,
+            "name": self.name,
+            "kind": self.kind,
+            "start": round(self.start, 6),
+            "duration_s": round(self.duration_s, 6),
+            "status": "error" if self.error else "ok",
+        }
+        if self.prompt_tokens or self.completion_tokens:
+            record["prompt_tokens"] = self.prompt_tokens
+            record["completion_tokens"] = self.completion_tokens
+        if self.error:
+            record["error"] = self.error
+        if self.attributes:
+            record["attributes"] = self.attributes
+        return record
+
+
+class _NoopSpan:
+    """Stand-in returned while tracing is disabled; every operation does nothing."""
+
+    def set(self, **attributes) -> None:
+        pass
+
+    def add_tokens(self, prompt: int = 0, completion: int = 0) -> None:
+        pass
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """Writes finished spans to ``<trace_dir>/spans.jsonl`` and aggregates metrics.
+
+    Metrics are kept in memory and written by ``write_metrics`` as a Prometheus
+    text file (``metrics-<pid>.prom``, one per process, suitable for the
+    node_exporter textfile collector).
+    """
+
+    def __init__(self, trace_dir: Path):
+        self.trace_dir = Path(trace_dir)
+        self.trace_dir.mkdir(parents=True, exist_ok=True)
+        self.spans_path = self.trace_dir / SPANS_FILE
+        self.metrics_path = self.trace_dir / f"metrics-{os.getpid()}.prom"
+        self._lock = threading.Lock()
+        # (name, kind) -> [count, total seconds, errors]
+        self._durations: Dict[Tuple[str, str], list] = defaultdict(lambda: [0, 0.0, 0])
+        # (model, task, cached) -> [calls, prompt tokens, completion tokens]
+        self._llm: Dict[Tuple[str, str, str], list] = defaultdict(lambda: [0, 0, 0])
+
+    def span(self, name: str, kind: str = STAGE, trace_id: Optional[str] = None, **attributes) -> Span:
+        return Span(self, name, kind, attributes, trace_id=trace_id)
+
+    def record(self, span: Span) -> None:
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str) + "\n"
+        with self._lock:
+            # Sibling spans finish on different threads, so roll tokens up under the lock
+            if span.parent is not None:
+                span.parent.add_tokens(span.prompt_tokens, span.completion_tokens)
+            stats = self._durations[(span.name, span.kind)]
+            stats[0] += 1
+            stats[1] += span.duration_s
+            stats[2] += 1 if span.error else 0
+            if span.kind == LLM_CALL:
+                key = (str(span.attributes.get("model")), str(span.attributes.get("task")),
+                       "true" if span.attributes.get("cached") else "false")
+                llm = self._llm[key]
+                llm[0] += 1
+                llm[1] += span.prompt_tokens
+                llm[2] += span.completion_tokens
+            try:
+                # Appends of one short line are atomic enough to share the file between workers
+                with open(self.spans_path, "a", encoding="utf-8") as f:
+                    f.write(line)
+            except OSError as e:
+                logger.warning(f"Could not write span to {self.spans_path}: {str(e)}")
+
+    def render_metrics(self) -> str:
+        pid = os.getpid()
+        lines = [
+            "# HELP rrf_span_duration_seconds Wall time of traced pipeline stages, tasks and LLM calls.",
+            "# TYPE rrf_span_duration_seconds summary",
+        ]
+        with self._lock:
+            durations = sorted(self._durations.items())
+            llm = sorted(self._llm.items())
+        for (name, kind), (count, total, _) in durations:
+            labels = f'name="{name}",kind="{kind}",pid="{pid}"'
+            lines.append(f"rrf_span_duration_seconds_sum{{{labels}}} {total:.6f}")
+            lines.append(f"rrf_span_duration_seconds_count{{{labels}}} {count}")
+        lines += ["# HELP rrf_span_errors_total Traced spans that raised an exception.",
+                  "# TYPE rrf_span_errors_total counter"]
+        for (name, kind), (_, _, errors) in durations:
+            lines.append(f'rrf_span_errors_total{{name="{name}",kind="{kind}",pid="{pid}"}} {errors}')
+        lines += ["# HELP rrf_llm_calls_total LLM calls, including those served from the response cache.",
+                  "# TYPE rrf_llm_calls_total counter"]
+        for (model, task, cached), (calls, _, _) in llm:
+            lines.append(f'rrf_llm_calls_total{{model="{model}",task="{task}",cached="{cached}",pid="{pid}"}} {calls}')
+        lines += ["# HELP rrf_llm_tokens_total Prompt and completion tokens of LLM calls.",
+                  "# TYPE rrf_llm_tokens_total counter"]
+        for (model, task, cached), (_, prompt, completion) in llm:
+            labels = f'model="{model}",task="{task}",cached="{cached}",pid="{pid}"'
+            lines.append(f'rrf_llm_tokens_total{{{labels},type="prompt"}} {prompt}')
+            lines.append(f'rrf_llm_tokens_total{{{labels},type="completion"}} {completion}')
+        return "\n".join(lines) + "\n"
+
+    def write_metrics(self) -> None:
+        """Atomically replace this process's Prometheus metrics file."""
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.trace_dir, prefix=".metrics-", suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                f.write(self.render_metrics())
+            os.replace(tmp_path, self.metrics_path)
+        except OSError as e:
+            logger.warning(f"Could not write metrics to {self.metrics_path}: {str(e)}")
+
+
+_tracer: Optional[Tracer] = None
+_tracer_checked = False
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Process-wide tracer writing to $RRF_TRACE_DIR, or None when tracing is off."""
+    global _tracer, _tracer_checked
+    if not _tracer_checked:
+        trace_dir = os.environ.get("RRF_TRACE_DIR")
+        if trace_dir:
+            _tracer = Tracer(Path(trace_dir))
+            logger.info(f"Tracing spans to {_tracer.spans_path}")
+        _tracer_checked = True
+    return _tracer
+
+
+def span(name: str, kind: str = STAGE, trace_id: Optional[str] = None, **attributes):
+    """Context manager timing a unit of work, or a shared no-op when tracing is off."""
+    tracer = _tracer if _tracer_checked else get_tracer()
+    if tracer is None:
+        return NOOP_SPAN
+    return tracer.span(name, kind, trace_id=trace_id, **attributes)
+
+
+def traced(name: str, kind: str = STAGE):
+    """Decorator wrapping every call of a function in a span."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with span(name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def current_span():
+    """The innermost open span in this context (NOOP_SPAN if there is none)."""
+    return _current_span.get() or NOOP_SPAN
+
+
+def tracing_enabled() -> bool:
+    return (_tracer if _tracer_checked else get_tracer()) is not None
+
+
+def write_metrics() -> None:
+    if tracing_enabled():
+        _tracer.write_metrics()
@@ -0,0 +1,222 @@
+import logging
+import os
+import queue
+import re
+import shutil
+import subprocess
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+DEFAULT_MAX_QUEUE = 32
+DEFAULT_TIMEOUT_SECONDS = 60.0
+# wkhtmltopdf slowly leaks memory, so each process is replaced after this many documents
+MAX_JOBS_PER_PROCESS = 200
+
+_LINE_SPLIT = re.compile(rb"[\r\n]+")
+
+
+class PoolBusy(RuntimeError):
+    """Raised when the conversion queue is full."""
+
+
+class ConversionError(RuntimeError):
+    """Raised when wkhtmltopdf fails or times out on a document."""
+
+
+def _quote(arg: str) -> str:
+    # wkhtmltopdf splits each stdin line on spaces, honouring double quotes and backslashes
+    return '"' + arg.replace("\\", "\\\\").replace('"', '\\"') + '"'
+
+
+def options_to_args(options: Dict[str, Optional[str]]) -> List[str]:
+    """pdfkit-style options ({'page-size': 'A4', 'quiet': None}) to command line arguments."""
+    args = []
+    for name, value in options.items():
+        # Progress output on stderr is how a finished document is detected
+        if name == "quiet":
+            continue
+        args.append(f"--{name}")
+        if value is not None:
+            args.append(str(value))
+    return args
+
+
+class WkhtmltopdfProcess:
+    """One long-running ``wkhtmltopdf --read-args-from-stdin`` process.
+
+    Each document is sent as one line of arguments; wkhtmltopdf reports
+    "Done" (or "Exit with code ...") on stderr when it has finished it.
+    """
+
+    def __init__(self, binary: str):
+        self.process = subprocess.Popen(
+            [binary, "--read-args-from-stdin"],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+        )
+        self.jobs = 0
+        self._lines: "queue.SimpleQueue[Optional[str]]" = queue.SimpleQueue()
+        threading.Thread(target=self._read_stderr, name=f"wkhtmltopdf-{self.process.pid}", daemon=True).start()
+
+    def _read_stderr(self) -> None:
+        buffer = b""
+        stream = self.process.stderr
+        while True:
+            chunk = stream.read1(4096) if hasattr(stream, "read1") else stream.read(1)
+            if not chunk:
+                break
+            *lines, buffer = _LINE_SPLIT.split(buffer + chunk)
+            for line in lines:
+                if line.strip():
+                    self._lines.put(line.decode("utf-8", "replace").strip())
+        self._lines.put(None)
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def convert(self, html_path: Path, pdf_path: Path, args: List[str], timeout: float) -> None:
+        line = " ".join(_quote(arg) for arg in [*args, str(html_path), str(pdf_path)]) + "\n"
+        self.process.stdin.write(line.encode("utf-8"))
+        self.process.stdin.flush()
+        self.jobs += 1
+
+        deadline = time.monotonic() + timeout
+        errors = []
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise ConversionError(f"wkhtmltopdf timed out after {timeout:.0f}s on {html_path}")
+            try:
+                message = self._lines.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if message is None:
+                raise ConversionError(f"wkhtmltopdf exited while converting {html_path}: {'; '.join(errors)}")
+            if message.startswith("Done"):
+                break
+            if message.startswith("Exit with code"):
+                raise ConversionError(f"wkhtmltopdf failed on {html_path}: {message} {'; '.join(errors)}".strip())
+            if message.startswith(("Error", "Warning")):
+                errors.append(message)
+        if not pdf_path.exists() or pdf_path.stat().st_size == 0:
+            raise ConversionError(f"wkhtmltopdf produced no output for {html_path}: {'; '.join(errors)}")
+
+    def close(self) -> None:
+        if self.alive():
+            try:
+                self.process.stdin.close()
+                self.process.wait(timeout=5)
+            except Exception:
+                self.process.kill()
+
+
+class WkhtmltopdfPool:
+    """A few warm wkhtmltopdf processes fed from a bounded job queue.
+
+    ``submit`` returns a Future and raises PoolBusy once ``max_queue`` jobs are
+    waiting; ``convert_many`` converts a batch of documents while paying the
+    process start-up cost only once per worker.
+    """
+
+    def __init__(self, size: int = DEFAULT_POOL_SIZE, max_queue: int = DEFAULT_MAX_QUEUE,
+                 timeout: float = DEFAULT_TIMEOUT_SECONDS, options: Optional[Dict[str, Optional[str]]] = None,
+                 binary: Optional[str] = None):
+        self.binary = binary or shutil.which("wkhtmltopdf")
+        if not self.binary:
+            raise FileNotFoundError("wkhtmltopdf binary not found on PATH")
+        self.timeout = timeout
+        self.args = options_to_args(options or {})
+        self._jobs: "queue.Queue[Optional[Tuple[Path, Path, Future]]]" = queue.Queue(maxsize=max_queue)
+        self._threads = [
+            threading.Thread(target=self._work, name=f"wkhtmltopdf-pool-{index}", daemon=True)
+            for index in range(size)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _work(self) -> None:
+        process = None
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                break
+            html_path, pdf_path, future = job
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                if process is None or not process.alive() or process.jobs >= MAX_JOBS_PER_PROCESS:
+                    if process is not None:
+                        process.close()
+                    process = WkhtmltopdfProcess(self.binary)
+                start = time.perf_counter()
+                process.convert(html_path, pdf_path, self.args, self.timeout)
+                logger.debug(f"wkhtmltopdf rendered {pdf_path.name} in {time.perf_counter() - start:.2f}s")
+                future.set_result(pdf_path)
+            except Exception as e:
+                # The process state is unknown after a failure or timeout, so start a fresh one
+                if process is not None:
+                    process.process.kill()
+                    process = None
+                future.set_exception(e)
+        if process is not None:
+            process.close()
+
+    def submit(self, html_path: Path, pdf_path: Path, block_seconds: float = 0) -> Future:
+        future = Future()
+        Path(pdf_path).parent.mkdir(parents=True, exist_ok=True)
+        try:
+            self._jobs.put((Path(html_path), Path(pdf_path), future), timeout=block_seconds or None,
+                           block=block_seconds > 0)
+        except queue.Full:
+            raise PoolBusy(f"wkhtmltopdf queue is full ({self._jobs.maxsize} jobs waiting)")
+        return future
+
+    def convert(self, html_path: Path, pdf_path: Path) -> Path:
+        # Wait for the worker's own timeout plus the time spent queued behind other jobs
+        return self.submit(html_path, pdf_path, block_seconds=self.timeout).result()
+
+    def convert_many(self, documents: Iterable[Tuple[Path, Path]]) -> List[Tuple[Path, Optional[Exception]]]:
+        """Convert (html_path, pdf_path) pairs; returns (pdf_path, error or None) in order."""
+        futures = [(Path(pdf_path), self.submit(html_path, pdf_path, block_seconds=self.timeout))
+                   for html_path, pdf_path in documents]
+        results = []
+        for pdf_path, future in futures:
+            try:
+                future.result()
+                results.append((pdf_path, None))
+            except Exception as e:
+                results.append((pdf_path, e))
+        return results
+
+    def close(self) -> None:
+        for _ in self._threads:
+            self._jobs.put(None)
+        for thread in self._threads:
+            thread.join(timeout=10)
+
+
+_pool: Optional[WkhtmltopdfPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_wkhtmltopdf_pool(options: Optional[Dict[str, Optional[str]]] = None) -> Optional[WkhtmltopdfPool]:
+    """Process-wide pool sized by $RRF_WKHTMLTOPDF_POOL_SIZE (0 disables pooling)."""
+    global _pool
+    size = int(os.environ.get("RRF_WKHTMLTOPDF_POOL_SIZE", DEFAULT_POOL_SIZE))
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = WkhtmltopdfPool(
+                size=size,
+                max_queue=int(os.environ.get("RRF_WKHTMLTOPDF_QUEUE", DEFAULT_MAX_QUEUE)),
+                timeout=float(os.environ.get("RRF_WKHTMLTOPDF_TIMEOUT", DEFAULT_TIMEOUT_SECONDS)),
+                options=options,
+            )
+            logger.info(f"Started wkhtmltopdf pool with {size} warm processes")
+        return _pool
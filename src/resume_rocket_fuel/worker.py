@@ -0,0 +1,172 @@
+import argparse
+import logging
+import multiprocessing
+import os
+import signal
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from pathlib import Path
+from typing import Optional
+
+from resume_rocket_fuel.compat import use_pysqlite3
+from resume_rocket_fuel.jobqueue import JobQueue, STALE_AFTER_SECONDS
+from resume_rocket_fuel.rate_limit import share_rate_limits
+
+logger = logging.getLogger(__name__)
+
+POLL_INTERVAL_SECONDS = 2.0
+HEARTBEAT_INTERVAL_SECONDS = 15.0
+DEFAULT_EMBEDDED_WORKERS = 2
+
+
+def run_job(queue: JobQueue, job: dict) -> None:
+    """Run one claimed job through pipeline_run, mirroring its progress into the queue."""
+    from resume_rocket_fuel.events import AGENT_STEP, EventBus, describe_event
+    from resume_rocket_fuel.pipeline import pipeline_run
+    from resume_rocket_fuel.workspace import Workspace
+
+    job_id = job["id"]
+    events = EventBus()
+
+    def record_progress(event):
+        # Agent steps are too chatty to persist; the heartbeat covers liveness
+        if event.kind != AGENT_STEP:
+            queue.update_progress(job_id, describe_event(event), event.to_dict())
+
+    events.subscribe(record_progress)
+
+    stop_heartbeat = threading.Event()
+
+    def heartbeat():
+        while not stop_heartbeat.wait(HEARTBEAT_INTERVAL_SECONDS):
+            queue.heartbeat(job_id)
+
+    heartbeat_thread = threading.Thread(target=heartbeat, name=f"heartbeat-{job_id}", daemon=True)
+    heartbeat_thread.start()
+    try:
+        success = pipeline_run(
+            Path(job["cv_path"]),
+            Path(job["jd_path"]),
+            job["company"],
+            job["output_format"],
+            workspace=Workspace(Path(job["workspace"])),
+            events=events,
+            # A retried job picks up after the tasks its previous attempt finished
+            resume=job["attempts"] > 1,
+        )
+        queue.finish(job_id, success, None if success else "Pipeline failed, see worker logs")
+    except Exception as e:
+        logger.error(f"Job {job_id} crashed: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
+        queue.finish(job_id, False, str(e))
+    finally:
+        stop_heartbeat.set()
+
+
+def worker_loop(db_path: Optional[str] = None, max_jobs: Optional[int] = None) -> None:
+    """Claim and run jobs until interrupted (or ``max_jobs`` have been run)."""
+    queue = JobQueue(db_path)
+    name = f"{socket.gethostname()}:{os.getpid()}"
+    stopping = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stopping.set())
+    logger.info(f"Worker {name} polling {queue.db_path}")
+    # Load the agent stack while waiting for the first job rather than during it
+    from resume_rocket_fuel.pipeline import prewarm_in_background
+    prewarm_in_background()
+
+    jobs_run = 0
+    while not stopping.is_set() and (max_jobs is None or jobs_run < max_jobs):
+        queue.requeue_stale(STALE_AFTER_SECONDS)
+        job = queue.claim(name)
+        if job is None:
+            stopping.wait(POLL_INTERVAL_SECONDS)
+            continue
+        logger.info(f"Worker {name} running job {job['id']} (attempt {job['attempts']})")
+        run_job(queue, job)
+        jobs_run += 1
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except (OSError, ValueError):
+        return False
+
+
+def ensure_worker_pool(db_path: Optional[str] = None) -> Optional[int]:
+    """Start a detached worker pool for the UI unless one is already running.
+
+    The pool runs in its own session so it outlives UI restarts; a pid file
+    next to the job database prevents starting a second pool. The pool size
+    comes from RRF_EMBEDDED_WORKERS (0 means workers are managed externally).
+    """
+    workers = int(os.environ.get("RRF_EMBEDDED_WORKERS", DEFAULT_EMBEDDED_WORKERS))
+    if workers <= 0:
+        return None
+    queue = JobQueue(db_path)
+    pid_file = queue.db_path.with_suffix(".workers.pid")
+    try:
+        pid = int(pid_file.read_text().strip())
+        if _pid_alive(pid):
+            return pid
+    except (FileNotFoundError, ValueError):
+        pass
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "resume_rocket_fuel.worker", "--workers", str(workers), "--db", str(queue.db_path)],
+        start_new_session=True,
+    )
+    pid_file.write_text(str(process.pid))
+    logger.info(f"Started {workers} background workers (pid {process.pid})")
+    return process.pid
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Resume Rocket Fuel queue workers")
+    parser.add_argument("--workers", type=int, default=max(1, (os.cpu_count() or 2) // 2),
+                        help="Number of worker processes (maximum concurrent pipeline runs)")
+    parser.add_argument("--db", help="Job database path (default: $RRF_JOB_DB or output/jobs.sqlite3)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    use_pysqlite3()
+    # Create the schema once before the workers race to do it
+    JobQueue(args.db)
+
+    # The workers inherit this and each take an equal share of the provider quotas
+    share_rate_limits(args.workers)
+    processes = [
+        multiprocessing.Process(target=worker_loop, args=(args.db,), name=f"rrf-worker-{index}")
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    logger.info(f"Started {len(processes)} workers")
+    try:
+        while True:
+            for index, process in enumerate(processes):
+                if not process.is_alive():
+                    # Keep the pool at full size if a worker crashes
+                    logger.warning(f"Worker {process.name} exited with {process.exitcode}, restarting")
+                    processes[index] = multiprocessing.Process(
+                        target=worker_loop, args=(args.db,), name=process.name
+                    )
+                    processes[index].start()
+            time.sleep(5)
+    except KeyboardInterrupt:
+        logger.info("Stopping workers...")
+    finally:
+        for process in processes:
+            if process.is_alive():
+                process.terminate()
+        for process in processes:
+            process.join()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKSPACE_ROOT = Path("output") / "runs"
+DEFAULT_TTL_HOURS = 24
+DEFAULT_MAX_RUNS = 200
+# Minimum time between two garbage collection sweeps of the same root
+GC_INTERVAL_SECONDS = 300
+
+
+@dataclass(frozen=True)
+class Workspace:
+    """Directory holding the inputs, intermediates and outputs of one pipeline run."""
+
+    path: Path
+
+    @property
+    def run_id(self) -> str:
+        return self.path.name
+
+    @property
+    def cv_pdf(self) -> Path:
+        return self.path / "cv.pdf"
+
+    @property
+    def jd_pdf(self) -> Path:
+        return self.path / "jd.pdf"
+
+    @property
+    def final_md(self) -> Path:
+        return self.path / "final_cv.md"
+
+    @property
+    def polished_md(self) -> Path:
+        return self.path / "final_polished_cv.md"
+
+    @property
+    def final_html(self) -> Path:
+        return self.path / "final_polished_cv.html"
+
+    @property
+    def final_pdf(self) -> Path:
+        return self.path / "final_cv.pdf"
+
+    @property
+    def materials_json(self) -> Path:
+        return self.path / "materials.json"
+
+    @property
+    def preview_html(self) -> Path:
+        return self.path / "preview.html"
+
+    @property
+    def compaction_report(self) -> Path:
+        return self.path / "prompt_compaction.json"
+
+    @property
+    def checkpoints(self) -> Path:
+        return self.path / "checkpoints"
+
+    @property
+    def run_manifest(self) -> Path:
+        """The inputs of the run (PDFs, company, format), so it can be resumed or replayed."""
+        return self.path / "run.json"
+
+    def file(self, name: str) -> Path:
+        return self.path / name
+
+    def clear(self, keep: Tuple[str, ...] = ()) -> None:
+        """Delete the workspace's contents except the named entries, e.g. its checkpoints."""
+        if not self.path.exists():
+            return
+        for entry in self.path.iterdir():
+            if entry.name in keep:
+                continue
+            if entry.is_dir():
+                shutil.rmtree(entry, ignore_errors=True)
+            else:
+                entry.unlink(missing_ok=True)
+
+    def create(self) -> "Workspace":
+        self.path.mkdir(parents=True, exist_ok=True)
+        return self
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Write a file so readers see either the previous or the complete new content."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(temp_path, path)
+    except BaseException:
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+
+def workspace_root() -> Path:
+    return Path(os.environ.get("RRF_WORKSPACE_ROOT") or DEFAULT_WORKSPACE_ROOT).absolute()
+
+
+def create_workspace(root: Optional[Path] = None) -> Workspace:
+    """Create a fresh, uniquely named workspace and garbage collect old ones."""
+    root = Path(root).absolute() if root else workspace_root()
+    maybe_cleanup_workspaces(root)
+    run_id = f"{time.strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:8]}"
+    workspace = Workspace(root / run_id).create()
+    logger.info(f"Created workspace {workspace.path}")
+    return workspace
+
+
+def workspaces_in_use() -> Set[Path]:
+    """Workspaces of queued or running jobs in the background job queue, if there is one."""
+    from resume_rocket_fuel.jobqueue import JobQueue, default_db_path
+
+    if not default_db_path().exists():
+        return set()
+    return JobQueue().active_workspaces()
+
+
+def cleanup_workspaces(root: Optional[Path] = None, ttl_hours: Optional[float] = None,
+                       max_runs: Optional[int] = None, in_use: Optional[Set[Path]] = None) -> int:
+    """Delete workspaces older than the TTL, then the oldest beyond ``max_runs``.
+
+    Workspaces in ``in_use`` (by default those of queued or running jobs) are
+    never deleted, however old, since their jobs still need the uploaded PDFs
+    and checkpoints. Defaults come from RRF_WORKSPACE_TTL_HOURS and
+    RRF_WORKSPACE_MAX_RUNS. Returns the number of workspaces removed.
+    """
+    root = Path(root) if root else workspace_root()
+    if ttl_hours is None:
+        ttl_hours = float(os.environ.get("RRF_WORKSPACE_TTL_HOURS", DEFAULT_TTL_HOURS))
+    if max_runs is None:
+        max_runs = int(os.environ.get("RRF_WORKSPACE_MAX_RUNS", DEFAULT_MAX_RUNS))
+    if not root.exists():
+        return 0
+    if in_use is None:
+        in_use = workspaces_in_use()
+
+    runs = []
+    for path in root.iterdir():
+        try:
+            if path.is_dir() and path.absolute() not in in_use:
+                runs.append((path.stat().st_mtime, path))
+        except FileNotFoundError:
+            continue
+    runs.sort(reverse=True)
+
+    cutoff = time.time() - ttl_hours * 3600
+    expired = [path for index, (mtime, path) in enumerate(runs) if mtime < cutoff or index >= max_runs]
+    for path in expired:
+        shutil.rmtree(path, ignore_errors=True)
+    if expired:
+        logger.info(f"Removed {len(expired)} old workspaces from {root}")
+    return len(expired)
+
+
+_last_gc = {}
+_gc_lock = threading.Lock()
+
+
+def maybe_cleanup_workspaces(root: Path) -> None:
+    with _gc_lock:
+        now = time.monotonic()
+        if now - _last_gc.get(root, -GC_INTERVAL_SECONDS) < GC_INTERVAL_SECONDS:
+            return
+        _last_gc[root] = now
+    try:
+        cleanup_workspaces(root)
+    except Exception as e:
+        logger.warning(f"Workspace cleanup failed: {str(e)}")